@@ -0,0 +1,76 @@
+"""
+Alembic 迁移环境（异步引擎）
+
+- 命令行运行时按应用配置创建异步引擎，在 run_sync 中执行迁移
+- 应用启动时（DB_INIT_MODE=migrate）由 init_db 通过 config.attributes["connection"] 传入已打开的连接，
+  此时不重新配置日志
+"""
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.db.base import Base
+from app.models import image, news, user  # noqa: F401  注册到元数据
+
+config = context.config
+target_metadata = Base.metadata
+
+# 检索后端在模型之外维护的结构（FTS5 虚拟表、tsvector 列与索引）由 search_backend.setup 创建，自动生成时忽略
+_SEARCH_OBJECTS = {"search_vector", "ix_news_search_vector"}
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    if type_ == "table" and name.startswith("news_fts"):
+        return False
+    return name not in _SEARCH_OBJECTS
+
+
+def do_run_migrations(connection: Connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        # SQLite 不支持大多数 ALTER TABLE，使用批量模式重建表
+        render_as_batch=connection.dialect.name == "sqlite",
+        # 每个迁移单独提交，PostgreSQL 下 CREATE INDEX CONCURRENTLY 需要在事务外执行
+        transaction_per_migration=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations() -> None:
+    engine = create_async_engine(settings.database_url, poolclass=NullPool)
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+def run_migrations_offline() -> None:
+    """生成 SQL 脚本而不连接数据库（alembic upgrade head --sql）"""
+    context.configure(
+        url=settings.database_url,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    connection = config.attributes.get("connection")
+    if connection is None:
+        if config.config_file_name is not None:
+            fileConfig(config.config_file_name)
+        asyncio.run(run_async_migrations())
+    else:
+        do_run_migrations(connection)
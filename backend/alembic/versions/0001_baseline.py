@@ -0,0 +1,61 @@
+"""基线：users、news 表
+
+与最初版本 init_db 中 create_all 创建的结构完全一致；已由 create_all 建表的数据库在 migrate 模式下会被自动标记为此版本，
+之后各版本新增的表与索引都可以重复执行。
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.types import TimestampTZ
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("username", sa.String(length=20), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("hashed_password", sa.String(length=255), nullable=False),
+        sa.Column("is_admin", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "news",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=100), nullable=False),
+        sa.Column("description", sa.String(length=500), nullable=False),
+        sa.Column("image_url", sa.Text(), nullable=True),
+        sa.Column("creator_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", TimestampTZ, server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", TimestampTZ, server_default=sa.func.now(), nullable=True),
+        sa.Column("deleted_at", TimestampTZ, nullable=True),
+        sa.ForeignKeyConstraint(["creator_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_news_id", "news", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_news_id", table_name="news")
+    op.drop_table("news")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_index("ix_users_username", table_name="users")
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_table("users")
@@ -0,0 +1,44 @@
+"""图片资源表与游标分页索引
+
+- image_assets: 按内容哈希去重的上传图片
+- ix_news_created_at_id: (created_at, id) 游标分页
+
+这两者在引入迁移之前已加入模型，由较新版本 create_all 建好的数据库中可能已经存在，
+因此建表前检查是否存在、建索引使用 IF NOT EXISTS。
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.types import TimestampTZ
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 离线生成 SQL 时无法检查，直接建表
+    if op.get_context().as_sql or not sa.inspect(op.get_bind()).has_table("image_assets"):
+        op.create_table(
+            "image_assets",
+            sa.Column("sha256", sa.String(length=64), nullable=False),
+            sa.Column("storage", sa.String(length=20), nullable=False),
+            sa.Column("location", sa.Text(), nullable=False),
+            sa.Column("size", sa.Integer(), nullable=False),
+            sa.Column("content_type", sa.String(length=100), nullable=True),
+            sa.Column("created_at", TimestampTZ, server_default=sa.func.now(), nullable=True),
+            sa.PrimaryKeyConstraint("sha256"),
+        )
+    op.create_index("ix_news_created_at_id", "news", ["created_at", "id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_news_created_at_id", table_name="news", if_exists=True)
+    op.drop_table("image_assets")
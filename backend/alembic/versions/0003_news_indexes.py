@@ -0,0 +1,52 @@
+"""新闻查询索引
+
+- ix_news_updated_at_id: 增量同步按 (updated_at, id) 扫描
+- ix_news_creator_id: 外键列，连接 users 与按创建者筛选
+- ix_news_live_created_at_id: 只包含未删除新闻的部分索引（WHERE deleted_at IS NULL），
+  覆盖公开列表 "deleted_at IS NULL ORDER BY created_at DESC, id DESC" 的过滤与排序；
+  PostgreSQL 与 SQLite 支持部分索引，其他数据库跳过
+
+使用 IF NOT EXISTS，已由 create_all 建好索引的数据库也可以直接升级。
+PostgreSQL 下使用 CREATE INDEX CONCURRENTLY，建索引期间不阻塞写入。
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_LIVE = sa.text("deleted_at IS NULL")
+
+
+def _indexes(dialect: str):
+    yield "ix_news_updated_at_id", ["updated_at", "id"], {}
+    yield "ix_news_creator_id", ["creator_id"], {}
+    if dialect in ("postgresql", "sqlite"):
+        yield "ix_news_live_created_at_id", ["created_at", "id"], {f"{dialect}_where": _LIVE}
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        # CONCURRENTLY 不能在事务中执行
+        with op.get_context().autocommit_block():
+            for name, columns, kw in _indexes(dialect):
+                op.create_index(
+                    name, "news", columns, if_not_exists=True, postgresql_concurrently=True, **kw
+                )
+    else:
+        for name, columns, kw in _indexes(dialect):
+            op.create_index(name, "news", columns, if_not_exists=True, **kw)
+
+
+def downgrade() -> None:
+    for name, _, _ in _indexes(op.get_bind().dialect.name):
+        op.drop_index(name, table_name="news", if_exists=True)
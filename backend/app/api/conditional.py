@@ -0,0 +1,110 @@
+"""
+条件请求（ETag / Last-Modified）支持
+
+列表的 ETag 由全表 max(updated_at)、列表缓存代数与匹配条数（需要返回总数时）计算，详情由 updated_at 计算，
+两者都只需一条聚合/单列查询，命中 If-None-Match 时直接返回 304，不再查询整行，也不做序列化。
+
+列表使用全表（含已删除新闻）而不是匹配行的 max(updated_at)：软删除与恢复都会刷新被操作行的 updated_at，
+而被删除的行已不在匹配结果中，只看匹配行时删除一条非最新的新闻不会改变校验值。
+物理删除不留下任何时间戳，由缓存代数（新增、删除、恢复时递增）覆盖，因此列表不返回 Last-Modified，
+只依赖 ETag；详情同时返回 Last-Modified，支持 If-Modified-Since。
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request, Response, status
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.api.news_cache import news_cache
+from app.core.config import settings
+from app.db.counts import news_counter
+from app.models.news import News
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite 返回不带时区的 UTC 时间
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def make_validators(seed: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    """根据种子生成强 ETag，并附带 Last-Modified 等缓存相关响应头"""
+    etag = hashlib.sha256(seed.encode("utf-8")).hexdigest()[:32]
+    headers = {
+        "ETag": f'"{etag}"',
+        # 允许客户端缓存，但每次使用前都需要重新验证
+        "Cache-Control": "no-cache",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, headers: Dict[str, str]) -> bool:
+    """判断请求携带的条件头是否与当前校验值匹配"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match 使用弱比较，且优先于 If-Modified-Since
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return headers["ETag"] in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    last_modified = headers.get("Last-Modified")
+    if not if_modified_since or not last_modified:
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+async def listing_validators(
+    db: AsyncSession,
+    query: Select,
+    *,
+    params: str,
+    with_total: bool = True,
+    searching: bool = False,
+    include_deleted: bool = False
+) -> Tuple[Dict[str, str], Optional[int]]:
+    """计算列表的校验响应头，同时返回匹配条数（with_total 为 False 时不统计，返回 None）
+
+    exact 策略下全表 max(updated_at)（走 ix_news_updated_at_id）与 COUNT 合并为一条聚合查询，
+    条数可直接作为 total 使用；其他策略下条数来自总数统计策略。
+    """
+    latest = select(func.max(aliased(News).updated_at)).scalar_subquery()
+    count = None
+    if with_total and settings.NEWS_COUNT_STRATEGY == "exact":
+        row = (await db.execute(
+            query.with_only_columns(latest, func.count(News.id)).order_by(None)
+        )).one()
+        last_modified, count = row[0], row[1]
+    else:
+        last_modified = (await db.execute(select(latest))).scalar()
+        if with_total:
+            count = await news_counter.count(
+                db, query, searching=searching, include_deleted=include_deleted
+            )
+    generation = await news_cache.generation()
+    seed = (
+        f"list|{params}|{last_modified.isoformat() if last_modified else ''}|{generation}|"
+        f"{'' if count is None else count}"
+    )
+    return make_validators(seed, None), count
+
+
+def item_validators(id: int, updated_at: Optional[datetime]) -> Dict[str, str]:
+    """计算单条新闻的校验响应头"""
+    seed = f"item|{id}|{updated_at.isoformat() if updated_at else ''}"
+    return make_validators(seed, updated_at)
@@ -5,9 +5,10 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import event, select
 
 from app.core import security
+from app.core.cache import LRUTTLCache
 from app.core.config import settings
 from app.db.session import get_db
 from app.models.user import User
@@ -17,6 +18,19 @@ reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/token"
 )
 
+# 已验证用户的缓存：user_id -> 用户字段快照，命中时鉴权无需查询数据库
+principal_cache = LRUTTLCache(
+    maxsize=settings.AUTH_PRINCIPAL_CACHE_SIZE, ttl=settings.AUTH_PRINCIPAL_CACHE_TTL
+)
+_PRINCIPAL_FIELDS = ("id", "username", "email", "is_admin", "created_at", "updated_at")
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_principal(mapper, connection, target: User) -> None:
+    """用户被修改或删除后移除缓存（其他 worker 的缓存依赖 TTL 过期）"""
+    principal_cache.pop(target.id)
+
 
 async def get_current_user(
     db: AsyncSession = Depends(get_db),
@@ -34,10 +48,20 @@ async def get_current_user(
             detail="无法验证凭据",
         )
     
+    if settings.AUTH_PRINCIPAL_CACHE_TTL > 0:
+        snapshot = principal_cache.get(token_data.sub)
+        if snapshot is not None:
+            # 每次返回新的游离对象，避免请求之间共享可变状态
+            return User(**snapshot)
+    
     result = await db.execute(select(User).where(User.id == token_data.sub))
     user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="用户未找到")
+    if settings.AUTH_PRINCIPAL_CACHE_TTL > 0:
+        principal_cache.set(
+            user.id, {field: getattr(user, field) for field in _PRINCIPAL_FIELDS}
+        )
     return user
 
 
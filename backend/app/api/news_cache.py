@@ -0,0 +1,202 @@
+"""
+公开新闻接口的响应缓存
+
+列表缓存键包含一个"代数"（generation）：新增、删除、恢复会改变分页偏移和总数，直接递增代数使所有列表失效；
+更新只影响包含该新闻的列表页，通过 id -> 列表键 的反向索引精确删除；
+但修改标题或描述可能使新闻进入此前不包含它的检索结果，这种更新同样递增代数。
+缓存的是序列化后的 JSON 字节及其校验响应头（ETag 等），命中时不再访问数据库，也不再构造 Pydantic 对象。
+每次失效都会先递增写版本号；读取方在查询数据库之前记下版本号，写入缓存前后版本号发生变化时放弃（或删除）这次写入，
+避免在并发写操作失效之后又把它提交之前读到的旧数据写回缓存。
+从只读副本读出的响应在最近一次失效后的 DB_REPLICA_STICKY_SECONDS 内不写入缓存，避免把复制延迟期间的旧数据缓存下来。
+"""
+import hashlib
+import json
+import logging
+import math
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.core.cache import CacheBackend, MemoryCacheBackend, RedisCacheBackend
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_GENERATION_KEY = "news:list:gen"
+_VERSION_KEY = "news:version"
+# 最近一次失效的时间，在多个 worker 间共享（Redis）
+_INVALIDATED_AT_KEY = "news:invalidated-at"
+
+
+def _pack(body: bytes, headers: Dict[str, str]) -> bytes:
+    # 第一行存放响应头，其余为响应体
+    return json.dumps(headers, separators=(",", ":")).encode("utf-8") + b"\n" + body
+
+
+def _unpack(value: bytes) -> Tuple[bytes, Dict[str, str]]:
+    headers, _, body = value.partition(b"\n")
+    return body, json.loads(headers)
+
+
+class NewsResponseCache:
+    """新闻列表与详情的响应缓存，后端异常时按未命中处理"""
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: int) -> None:
+        # backend 为 None 表示缓存已关闭，所有操作均为空操作
+        self.backend = backend
+        self.ttl = ttl
+
+    async def list_key(self, **params: object) -> Optional[str]:
+        """生成列表缓存键（包含当前代数），缓存不可用时返回 None"""
+        generation = await self.generation()
+        if generation is None:
+            return None
+        # JSON 编码区分 None 与字符串 "None"，再取摘要避免用户输入的检索词使键过长
+        encoded = json.dumps(params, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        digest = hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+        return f"news:list:{generation}:{digest}"
+
+    async def generation(self) -> Optional[int]:
+        """当前列表代数，用于列表的 ETag；缓存不可用时返回 None"""
+        if self.backend is None:
+            return None
+        try:
+            return await self.backend.get_int(_GENERATION_KEY)
+        except Exception as e:
+            logger.warning("读取新闻缓存代数失败: %s", e)
+            return None
+
+    async def version(self) -> Optional[int]:
+        """当前写版本号，在查询数据库之前读取并传给 set_list / set_item；缓存不可用时返回 None"""
+        if self.backend is None:
+            return None
+        try:
+            return await self.backend.get_int(_VERSION_KEY)
+        except Exception as e:
+            logger.warning("读取新闻缓存版本失败: %s", e)
+            return None
+
+    async def _unchanged(self, version: Optional[int]) -> bool:
+        return version is not None and await self.backend.get_int(_VERSION_KEY) == version
+
+    @staticmethod
+    def item_key(id: int) -> str:
+        return f"news:item:{id}"
+
+    async def get(self, key: Optional[str]) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        """读取缓存的 (响应体, 响应头)"""
+        if key is None or self.backend is None:
+            return None
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            logger.warning("读取新闻缓存失败: %s", e)
+            return None
+        return _unpack(value) if value is not None else None
+
+    async def _replica_settled(self) -> bool:
+        """距最近一次失效是否已超过副本复制延迟窗口"""
+        value = await self.backend.get(_INVALIDATED_AT_KEY)
+        return value is None or time.time() - float(value) >= settings.DB_REPLICA_STICKY_SECONDS
+
+    async def set_list(
+        self, key: Optional[str], body: bytes, headers: Dict[str, str], item_ids: Iterable[int],
+        *, version: Optional[int], from_replica: bool = False
+    ) -> None:
+        """缓存列表响应，并登记其中每条新闻到该列表键的反向索引
+
+        version: 查询数据库之前读取的写版本号，期间发生过写操作时不缓存
+        """
+        if key is None or self.backend is None:
+            return
+        try:
+            if from_replica and not await self._replica_settled():
+                return
+            if not await self._unchanged(version):
+                return
+            await self.backend.set(key, _pack(body, headers), self.ttl)
+            for id in item_ids:
+                await self.backend.add_members(f"news:item-lists:{id}", [key], self.ttl)
+            # 检查之后、写入之前发生的失效可能已经执行完毕，删除刚写入的旧数据
+            if not await self._unchanged(version):
+                await self.backend.delete(key)
+        except Exception as e:
+            logger.warning("写入新闻缓存失败: %s", e)
+
+    async def set_item(
+        self, id: int, body: bytes, headers: Dict[str, str],
+        *, version: Optional[int], from_replica: bool = False
+    ) -> None:
+        """缓存详情响应，version 的含义同 set_list"""
+        if self.backend is None:
+            return
+        key = self.item_key(id)
+        try:
+            if from_replica and not await self._replica_settled():
+                return
+            if not await self._unchanged(version):
+                return
+            await self.backend.set(key, _pack(body, headers), self.ttl)
+            if not await self._unchanged(version):
+                await self.backend.delete(key)
+        except Exception as e:
+            logger.warning("写入新闻缓存失败: %s", e)
+
+    async def invalidate(self, id: Optional[int] = None, *, shift: bool = False) -> None:
+        """新闻写操作后失效缓存
+
+        id: 被修改的新闻，删除其详情缓存以及包含它的列表页
+        shift: 新闻出现或消失（新增/删除/恢复），所有列表的偏移与总数都会变化
+        """
+        if self.backend is None:
+            return
+        try:
+            # 先递增版本号再删除：此后完成写入的读取方都能发现这次失效
+            await self.backend.incr(_VERSION_KEY)
+            if id is not None:
+                list_keys = await self.backend.pop_members(f"news:item-lists:{id}")
+                await self.backend.delete(self.item_key(id), *list_keys)
+            if shift:
+                await self.backend.incr(_GENERATION_KEY)
+            await self._mark_invalidated()
+        except Exception as e:
+            logger.warning("失效新闻缓存失败: %s", e)
+
+    async def invalidate_many(self, ids: Iterable[int], *, shift: bool = False) -> None:
+        """批量写操作后失效缓存，语义同 invalidate"""
+        if self.backend is None:
+            return
+        try:
+            await self.backend.incr(_VERSION_KEY)
+            for id in ids:
+                list_keys = await self.backend.pop_members(f"news:item-lists:{id}")
+                await self.backend.delete(self.item_key(id), *list_keys)
+            if shift:
+                await self.backend.incr(_GENERATION_KEY)
+            await self._mark_invalidated()
+        except Exception as e:
+            logger.warning("失效新闻缓存失败: %s", e)
+
+    async def _mark_invalidated(self) -> None:
+        if not settings.DATABASE_READ_URL:
+            return
+        await self.backend.set(
+            _INVALIDATED_AT_KEY, repr(time.time()).encode("utf-8"),
+            max(self.ttl, math.ceil(settings.DB_REPLICA_STICKY_SECONDS))
+        )
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
+
+
+def _create_news_cache() -> NewsResponseCache:
+    backend: Optional[CacheBackend] = None
+    if settings.NEWS_CACHE_ENABLED:
+        if settings.CACHE_REDIS_URL:
+            backend = RedisCacheBackend(settings.CACHE_REDIS_URL)
+        else:
+            backend = MemoryCacheBackend(maxsize=settings.NEWS_CACHE_MAX_ENTRIES)
+    return NewsResponseCache(backend, ttl=settings.NEWS_CACHE_TTL)
+
+
+news_cache = _create_news_cache()
@@ -0,0 +1,138 @@
+"""
+新闻批量导入
+
+解析器产出的记录逐条用 NewsCreate 校验，通过的行攒够 chunk_size 条后以多行 INSERT ... RETURNING 写入，
+并同步写入检索索引。每块使用独立的会话与事务：提交后即释放连接，出错只影响当前块，
+已提交的块不会因为后面的错误回滚。某块因数据问题写入失败时改为逐条写入，定位并拒绝出错的行。
+"""
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.news_io import ParsedRecord, check_lengths, format_validation_error
+from app.db.search import search_backend
+from app.models.news import News
+from app.schemas.news import NewsCreate
+
+logger = logging.getLogger(__name__)
+
+_INSERT = insert(News).returning(News.id, News.title, News.description)
+
+
+@dataclass
+class ImportReport:
+    """导入进度与结果；errors 最多保留 max_errors 条，rejected 为实际拒绝总数"""
+    max_errors: int = 1000
+    received: int = 0
+    imported: int = 0
+    rejected: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+
+    def reject(self, line: int, error: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "error": error})
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = self.elapsed
+        return {
+            "received": self.received,
+            "imported": self.imported,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.imported / elapsed) if elapsed > 0 else 0,
+        }
+
+
+class NewsImporter:
+    """把解析出的记录分块写入数据库"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        *,
+        creator_id: int,
+        chunk_size: int = 1000,
+        max_errors: int = 1000,
+        progress: Optional[Callable[[ImportReport], None]] = None
+    ) -> None:
+        self.session_factory = session_factory
+        self.creator_id = creator_id
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.report = ImportReport(max_errors=max_errors)
+
+    def _validate(self, line: int, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        try:
+            news_in = NewsCreate.model_validate(record)
+        except ValidationError as e:
+            self.report.reject(line, format_validation_error(e))
+            return None
+        # 避免 PostgreSQL 因单行超长拒绝整块
+        error = check_lengths(news_in.model_dump())
+        if error is not None:
+            self.report.reject(line, error)
+            return None
+        return {
+            "title": news_in.title,
+            "description": news_in.description,
+            "image_url": news_in.image_url,
+            "creator_id": self.creator_id,
+        }
+
+    async def run(self, batches: AsyncIterator[List[ParsedRecord]]) -> ImportReport:
+        pending: List[Tuple[int, Dict[str, Any]]] = []
+        async for records in batches:
+            for line, record in records:
+                self.report.received += 1
+                if isinstance(record, str):
+                    self.report.reject(line, record)
+                    continue
+                row = self._validate(line, record)
+                if row is None:
+                    continue
+                pending.append((line, row))
+                if len(pending) >= self.chunk_size:
+                    await self._write_chunk(pending)
+                    pending = []
+        if pending:
+            await self._write_chunk(pending)
+        return self.report
+
+    async def _write_chunk(self, chunk: List[Tuple[int, Dict[str, Any]]]) -> None:
+        async with self.session_factory() as session:
+            try:
+                result = await session.execute(_INSERT, [row for _, row in chunk])
+                await search_backend.index_many(session, [tuple(row) for row in result])
+                await session.commit()
+                self.report.imported += len(chunk)
+            except (IntegrityError, DataError) as e:
+                await session.rollback()
+                logger.warning("导入块写入失败，改为逐条写入: %s", e.orig)
+                await self._write_rows(chunk)
+        if self.progress is not None:
+            self.progress(self.report)
+
+    async def _write_rows(self, chunk: List[Tuple[int, Dict[str, Any]]]) -> None:
+        for line, row in chunk:
+            async with self.session_factory() as session:
+                try:
+                    result = await session.execute(_INSERT, [row])
+                    await search_backend.index_many(session, [tuple(result.one())])
+                    await session.commit()
+                    self.report.imported += 1
+                except (IntegrityError, DataError) as e:
+                    await session.rollback()
+                    self.report.reject(line, f"写入失败: {e.orig}")
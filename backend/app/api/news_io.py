@@ -0,0 +1,225 @@
+"""
+新闻数据的 NDJSON / CSV 编码与解析
+
+导出接口按批次取行，每批编码为一个响应分块，避免逐行产生大量小分块。
+导入时从字节流（请求体或文件）增量解析记录，不需要把整个文件读入内存。
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy import Select, select
+
+from app.models.news import News
+from app.models.user import User
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 为可选依赖
+    orjson = None
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    # Starlette 会为 text/* 类型补上 charset
+    "csv": "text/csv",
+}
+
+# 导出字段，同时也是 CSV 的表头
+EXPORT_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "image_url",
+    "creator_id",
+    "creator_username",
+    "created_at",
+    "updated_at",
+    "deleted_at",
+)
+
+
+def select_export_columns() -> Select:
+    """导出查询：只投影导出字段，左连接 users 获取创建者用户名"""
+    return select(
+        News.id,
+        News.title,
+        News.description,
+        News.image_url,
+        News.creator_id,
+        User.username.label("creator_username"),
+        News.created_at,
+        News.updated_at,
+        News.deleted_at,
+    ).outerjoin(User, User.id == News.creator_id)
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _record(row: Any) -> Dict[str, Any]:
+    record = row._asdict()
+    for field in ("created_at", "updated_at", "deleted_at"):
+        record[field] = _isoformat(record[field])
+    return record
+
+
+def encode_ndjson(rows: Sequence[Any]) -> bytes:
+    """每行一个 JSON 对象"""
+    if orjson is not None:
+        return b"".join(orjson.dumps(_record(row)) + b"\n" for row in rows)
+    return "".join(
+        json.dumps(_record(row), ensure_ascii=False, separators=(",", ":")) + "\n" for row in rows
+    ).encode("utf-8")
+
+
+def encode_csv(rows: Sequence[Any], *, header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        record = _record(row)
+        writer.writerow(["" if record[field] is None else record[field] for field in EXPORT_FIELDS])
+    return buffer.getvalue().encode("utf-8")
+
+
+# 按列定义检查长度：SQLite 不限制 VARCHAR 长度，PostgreSQL 会因单行超长使整个事务失败
+NEWS_MAX_LENGTHS = {
+    "title": News.__table__.c.title.type.length,
+    "description": News.__table__.c.description.type.length,
+}
+
+
+def check_lengths(values: Dict[str, Any]) -> Optional[str]:
+    """检查字段长度，超长时返回错误说明"""
+    for name, max_length in NEWS_MAX_LENGTHS.items():
+        value = values.get(name)
+        if value is not None and len(value) > max_length:
+            return f"{name}: 长度不能超过 {max_length}"
+    return None
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """把 Pydantic 校验错误压缩为一行说明，用于逐条报告"""
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in e['loc']) or 'item'}: {e['msg']}" for e in error.errors()
+    )
+
+
+# 解析结果: (起始行号, 记录字典或错误信息)
+ParsedRecord = Tuple[int, Union[Dict[str, Any], str]]
+
+
+async def gunzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """流式解压 gzip 数据"""
+    decompressor = zlib.decompressobj(wbits=31)
+    async for chunk in chunks:
+        data = decompressor.decompress(chunk)
+        if data:
+            yield data
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[List[bytes]]:
+    """按分块产出其中完整的行（不含换行符），去掉开头的 UTF-8 BOM"""
+    pending = b""
+    first = True
+    async for chunk in chunks:
+        pending += chunk
+        if first and (len(pending) >= 3 or b"\n" in pending):
+            pending = pending.removeprefix(b"\xef\xbb\xbf")
+            first = False
+        lines = pending.split(b"\n")
+        pending = lines.pop()
+        if lines:
+            yield lines
+    if pending:
+        yield [pending.removeprefix(b"\xef\xbb\xbf") if first else pending]
+
+
+def _loads(line: bytes) -> Any:
+    return orjson.loads(line) if orjson is not None else json.loads(line)
+
+
+async def parse_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[List[ParsedRecord]]:
+    """解析 NDJSON，每个输入分块产出一批记录；空行忽略"""
+    line_no = 0
+    async for lines in _iter_lines(chunks):
+        records: List[ParsedRecord] = []
+        for line in lines:
+            line_no += 1
+            if not line.strip():
+                continue
+            try:
+                value = _loads(line)
+            except ValueError as e:
+                # UnicodeDecodeError 也是 ValueError
+                records.append((line_no, f"JSON 格式错误: {e}"))
+                continue
+            if not isinstance(value, dict):
+                records.append((line_no, "每行必须是一个 JSON 对象"))
+                continue
+            records.append((line_no, value))
+        if records:
+            yield records
+
+
+async def parse_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[List[ParsedRecord]]:
+    """解析带表头的 CSV，空字段视为未提供；每个输入分块产出一批记录
+
+    引号内可以包含换行，按引号个数的奇偶判断一条记录是否结束，只把完整的记录交给 csv 模块解析。
+    """
+    header: Optional[List[str]] = None
+    line_no = 0
+    record_lines: List[str] = []
+    record_start = 1
+    quotes = 0
+    async for lines in _iter_lines(chunks):
+        records: List[ParsedRecord] = []
+        for raw in lines:
+            line_no += 1
+            if not record_lines:
+                record_start = line_no
+            try:
+                line = raw.decode("utf-8")
+            except UnicodeDecodeError:
+                records.append((record_start, "不是 UTF-8 编码"))
+                record_lines, quotes = [], 0
+                continue
+            record_lines.append(line)
+            quotes += line.count('"')
+            if quotes % 2:
+                continue
+            text = "\n".join(record_lines).rstrip("\r")
+            record_lines, quotes = [], 0
+            if not text.strip():
+                continue
+            try:
+                values = next(csv.reader([text]))
+            except csv.Error as e:
+                records.append((record_start, f"CSV 格式错误: {e}"))
+                continue
+            if header is None:
+                header = [name.strip() for name in values]
+                continue
+            if len(values) > len(header):
+                records.append((record_start, f"字段数 {len(values)} 多于表头的 {len(header)} 列"))
+                continue
+            records.append((record_start, {name: value for name, value in zip(header, values) if value != ""}))
+        if records:
+            yield records
+    if record_lines:
+        yield [(record_start, "CSV 引号未闭合")]
+
+
+PARSERS = {
+    "ndjson": parse_ndjson,
+    "csv": parse_csv,
+}
@@ -0,0 +1,89 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.news import News
+from app.models.user import User
+
+# 列表接口需要的列：直接投影为行，避免加载 ORM 实例与 creator 关系
+NEWS_LIST_COLUMNS = (
+    News.id,
+    News.title,
+    News.description,
+    News.image_url,
+    News.creator_id,
+    News.created_at,
+    News.updated_at,
+    User.username.label("creator_username"),
+)
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """将 (created_at, id) 编码为不透明的分页游标"""
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """解析分页游标，格式错误时返回 400"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="无效的分页游标"
+        )
+
+
+def select_list_columns(query: Select) -> Select:
+    """将 select(News) 查询改为只查询列表所需的列，并左连接 users 获取创建者用户名"""
+    return query.with_only_columns(*NEWS_LIST_COLUMNS).outerjoin(User, User.id == News.creator_id)
+
+
+def paginate_news(
+    query: Select,
+    *,
+    page: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    rank: Optional[ColumnElement] = None
+) -> Select:
+    """为新闻查询添加排序与分页：传入游标时使用键集分页，否则沿用页码偏移
+
+    rank 为检索相关度排序子句，仅在页码分页下生效；游标分页需要稳定的 (created_at, id) 顺序。
+    """
+    if rank is not None and not cursor:
+        query = query.order_by(rank)
+    query = query.order_by(News.created_at.desc(), News.id.desc())
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        # tuple_ 不会把列类型（含 SQLite 变体）传给右侧参数，这里显式指定
+        query = query.where(
+            tuple_(News.created_at, News.id) < tuple_(
+                literal(created_at, News.created_at.type), literal(last_id, News.id.type)
+            )
+        )
+    else:
+        query = query.offset((page - 1) * limit)
+    # 多取一条用于判断是否还有下一页
+    return query.limit(limit + 1)
+
+
+def split_page(
+    rows: Sequence[Any], limit: int, *, ranked: bool = False
+) -> Tuple[Sequence[Any], Optional[str]]:
+    """截取当前页数据，并根据多取的一条生成下一页游标（按相关度排序时不生成游标）"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    if ranked:
+        return rows, None
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
@@ -1,89 +1,205 @@
+from datetime import datetime
 from typing import Any, Optional
 from math import ceil
+import logging
+import zlib
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, and_
 
 from app.api import deps
-from app.db.session import get_db
+from app.core import security
+from app.core.images import image_processor
+from app.api.news_cache import news_cache
+from app.api.news_import import ImportReport, NewsImporter
+from app.api.news_io import (
+    EXPORT_FORMATS,
+    PARSERS,
+    encode_csv,
+    encode_ndjson,
+    gunzip_chunks,
+    select_export_columns
+)
+from app.api.pagination import paginate_news, select_list_columns, split_page
+from app.db.counts import news_counter
+from app.db.search import search_backend
+from app.core.config import settings
+from app.core.events import news_events
+from app.db.session import (
+    AsyncReadSessionLocal,
+    AsyncSessionLocal,
+    engine,
+    get_db,
+    get_read_db,
+    pool_stats,
+    replica_router
+)
 from app.models.news import News
 from app.models.user import User
 from app.schemas.news import (
     News as NewsSchema,
     NewsCreate,
+    NewsImportReport,
     NewsUpdate,
     NewsListResponse
 )
 from app.schemas.user import User as UserSchema
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
 @router.get("/news", response_model=NewsListResponse)
 async def admin_read_news(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(deps.get_current_admin_user),
     page: int = Query(default=1, ge=1, description="页码"),
     limit: int = Query(default=10, ge=1, le=100, description="每页数量"),
     q: Optional[str] = Query(default=None, description="搜索关键词"),
-    include_deleted: bool = Query(default=False, description="是否包含已删除的新闻")
+    include_deleted: bool = Query(default=False, description="是否包含已删除的新闻"),
+    cursor: Optional[str] = Query(default=None, description="分页游标（传入后忽略 page）"),
+    with_total: bool = Query(default=True, description="是否统计总数")
 ) -> Any:
     """管理员获取新闻列表（包含已删除的新闻）"""
     # 构建查询条件
     query = select(News)
-    count_query = select(func.count(News.id))
     
     # 是否包含已删除的新闻
     if not include_deleted:
         query = query.where(News.deleted_at.is_(None))
-        count_query = count_query.where(News.deleted_at.is_(None))
     
     # 添加搜索条件
+    rank = None
     if q:
-        search_filter = or_(
-            News.title.ilike(f"%{q}%"),
-            News.description.ilike(f"%{q}%")
-        )
-        query = query.where(search_filter)
-        count_query = count_query.where(search_filter)
+        query, rank = search_backend.apply(query, q)
     
     # 获取总数
-    result = await db.execute(count_query)
-    total = result.scalar()
+    total = None
+    if with_total:
+        total = await news_counter.count(
+            db, query, searching=bool(q), include_deleted=include_deleted
+        )
     
-    # 分页查询
-    offset = (page - 1) * limit
-    query = query.options(selectinload(News.creator)).order_by(News.created_at.desc()).offset(offset).limit(limit)
+    # 分页查询：只投影列表所需的列，并连接 users 获取创建者用户名
+    query = paginate_news(
+        select_list_columns(query), page=page, limit=limit, cursor=cursor, rank=rank
+    )
     
     result = await db.execute(query)
-    news_list = result.scalars().all()
-    
-    # 添加创建者用户名
-    news_with_creator = []
-    for news in news_list:
-        news_dict = {
-            "id": news.id,
-            "title": news.title,
-            "description": news.description,
-            "image_url": news.image_url,
-            "creator_id": news.creator_id,
-            "created_at": news.created_at,
-            "updated_at": news.updated_at,
-            "creator_username": news.creator.username if news.creator else None
-        }
-        news_with_creator.append(NewsSchema(**news_dict))
-    
-    total_pages = ceil(total / limit) if total > 0 else 0
-    
-    return NewsListResponse(
-        items=news_with_creator,
+    rows, next_cursor = split_page(
+        result.all(), limit, ranked=rank is not None and not cursor
+    )
+    
+    total_pages = None
+    if total is not None:
+        total_pages = ceil(total / limit) if total > 0 else 0
+    
+    # 数据来自数据库且类型已确定，使用 model_construct 跳过逐字段校验，
+    # 并直接返回序列化结果，避免 response_model 再校验一遍
+    body = NewsListResponse.model_construct(
+        items=[NewsSchema.model_construct(**row._asdict()) for row in rows],
         total=total,
         page=page,
         limit=limit,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
+    ).model_dump_json().encode("utf-8")
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/news/export")
+async def admin_export_news(
+    current_user: User = Depends(deps.get_current_admin_user),
+    format: str = Query(default="ndjson", pattern="^(ndjson|csv)$", description="导出格式: ndjson | csv"),
+    include_deleted: bool = Query(default=False, description="是否包含已删除的新闻"),
+    created_from: Optional[datetime] = Query(default=None, description="创建时间起（包含）"),
+    created_to: Optional[datetime] = Query(default=None, description="创建时间止（不包含）"),
+    creator_id: Optional[int] = Query(default=None, description="创建者 id")
+) -> StreamingResponse:
+    """管理员流式导出新闻（NDJSON / CSV），使用服务端游标分批读取，内存占用与数据量无关"""
+    query = select_export_columns()
+    if not include_deleted:
+        query = query.where(News.deleted_at.is_(None))
+    if created_from is not None:
+        query = query.where(News.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(News.created_at < created_to)
+    if creator_id is not None:
+        query = query.where(News.creator_id == creator_id)
+    query = query.order_by(News.id).execution_options(yield_per=settings.NEWS_EXPORT_BATCH_SIZE)
+    
+    session_factory = AsyncReadSessionLocal if replica_router.use_replica() else AsyncSessionLocal
+    
+    async def generate():
+        # 依赖注入的会话不覆盖响应流的整个生命周期，导出使用独立会话
+        exported = 0
+        async with session_factory() as session:
+            result = await session.stream(query)
+            if format == "csv":
+                yield encode_csv((), header=True)
+            # 每批数据发送完成后才继续读取下一批，客户端读得慢时不会在内存中堆积
+            async for rows in result.partitions():
+                exported += len(rows)
+                yield encode_csv(rows) if format == "csv" else encode_ndjson(rows)
+        logger.info("导出新闻完成: user=%s format=%s rows=%d", current_user.username, format, exported)
+    
+    filename = f"news-{datetime.now().strftime('%Y%m%d%H%M%S')}.{format}"
+    return StreamingResponse(
+        generate(),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+def _log_import_progress(report: ImportReport) -> None:
+    logger.info(
+        "导入进度: received=%d imported=%d rejected=%d", report.received, report.imported, report.rejected
+    )
+
+
+@router.post("/news/import", response_model=NewsImportReport)
+async def admin_import_news(
+    request: Request,
+    current_user: User = Depends(deps.get_current_admin_user),
+    format: str = Query(default="ndjson", pattern="^(ndjson|csv)$", description="导入格式: ndjson | csv"),
+    chunk_size: Optional[int] = Query(default=None, ge=1, le=10000, description="每个事务写入的行数")
+) -> Any:
+    """管理员流式导入新闻（NDJSON / CSV），请求体可使用 gzip 压缩（Content-Encoding: gzip）
+
+    请求体边接收边解析、分块写入，不会整体读入内存；导入的新闻归属当前管理员。
+    """
+    chunks = request.stream()
+    if request.headers.get("content-encoding", "").lower() == "gzip":
+        chunks = gunzip_chunks(chunks)
+    importer = NewsImporter(
+        AsyncSessionLocal,
+        creator_id=current_user.id,
+        chunk_size=chunk_size or settings.NEWS_IMPORT_CHUNK_SIZE,
+        max_errors=settings.NEWS_IMPORT_MAX_ERRORS,
+        progress=_log_import_progress
     )
+    try:
+        report = await importer.run(PARSERS[format](chunks))
+    except zlib.error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="gzip 数据格式错误"
+        )
+    finally:
+        # 出错时已提交的块仍然有效，同样需要失效缓存
+        if importer.report.imported:
+            news_counter.invalidate()
+            await news_cache.invalidate(shift=True)
+            await news_events.publish("imported", count=importer.report.imported)
+    
+    logger.info(
+        "导入新闻完成: user=%s format=%s imported=%d rejected=%d elapsed=%.1fs",
+        current_user.username, format, report.imported, report.rejected, report.elapsed
+    )
+    return report.to_dict()
 
 
 @router.delete("/news/{id}/force", status_code=status.HTTP_204_NO_CONTENT)
@@ -101,7 +217,11 @@ async def admin_force_delete_news(
         raise HTTPException(status_code=404, detail="新闻未找到")
     
     await db.delete(news)
+    await search_backend.remove(db, id)
     await db.commit()
+    news_counter.invalidate()
+    await news_cache.invalidate(id, shift=True)
+    await news_events.publish("deleted", id)
 
 
 @router.post("/news/{id}/restore", response_model=NewsSchema)
@@ -123,6 +243,9 @@ async def admin_restore_news(
     # 恢复新闻
     news.deleted_at = None
     await db.commit()
+    news_counter.invalidate()
+    await news_cache.invalidate(id, shift=True)
+    await news_events.publish("restored", id)
     await db.refresh(news)
     
     # 加载创建者信息
@@ -142,7 +265,7 @@ async def admin_restore_news(
 
 @router.get("/users", response_model=list[UserSchema])
 async def admin_read_users(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(deps.get_current_admin_user),
     page: int = Query(default=1, ge=1, description="页码"),
     limit: int = Query(default=10, ge=1, le=100, description="每页数量")
@@ -153,4 +276,18 @@ async def admin_read_users(
         select(User).order_by(User.created_at.desc()).offset(offset).limit(limit)
     )
     users = result.scalars().all()
-    return users
\ No newline at end of file
+    return users
+
+
+@router.get("/system/stats")
+async def admin_system_stats(
+    current_user: User = Depends(deps.get_current_admin_user)
+) -> Any:
+    """管理员查看运行时统计信息"""
+    return {
+        "password_hashing": security.password_pool.stats(),
+        "db_pool": pool_stats(engine),
+        "db_replica": replica_router.stats(),
+        "image_processing": image_processor.stats(),
+        "events": news_events.stats(),
+    }
@@ -43,7 +43,7 @@ async def register(
         )
     
     # 创建新用户
-    hashed_password = security.get_password_hash(user_in.password)
+    hashed_password = await security.get_password_hash_async(user_in.password)
     db_user = User(
         username=user_in.username,
         email=user_in.email,
@@ -69,13 +69,23 @@ async def login_access_token(
     )
     user = result.scalar_one_or_none()
     
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+    verified, new_hash = False, None
+    if user:
+        verified, new_hash = await security.verify_and_update_password(
+            form_data.password, user.hashed_password
+        )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="用户名或密码错误",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # 哈希参数变化后透明地升级存储的密码哈希
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
         "access_token": security.create_access_token(
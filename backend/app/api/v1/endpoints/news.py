@@ -1,28 +1,80 @@
-from typing import Any, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
 from math import ceil
+import asyncio
+import json
 import logging
 import os
-import uuid
-import base64
-from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    WebSocket,
+    WebSocketDisconnect,
+    status
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_, insert, literal, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
-import aiohttp
+from pydantic import ValidationError
 
 from app.api import deps
-from app.db.session import get_db
+from app.api.conditional import (
+    is_not_modified,
+    item_validators,
+    listing_validators,
+    not_modified_response
+)
+from app.api.news_cache import news_cache
+from app.api.news_io import check_lengths, format_validation_error
+from app.api.pagination import (
+    NEWS_LIST_COLUMNS,
+    decode_cursor,
+    encode_cursor,
+    paginate_news,
+    select_list_columns,
+    split_page
+)
+from app.db.counts import news_counter
+from app.db.search import search_backend
+from app.db.session import get_db, get_read_db, replica_router
+from app.models.image import ImageAsset
 from app.models.news import News
 from app.models.user import User
 from app.schemas.news import (
+    ImageVariant,
+    ImageVariantSet,
     News as NewsSchema,
+    NewsChange,
+    NewsChangesResponse,
+    NewsBatchCreate,
+    NewsBatchDelete,
+    NewsBatchItemResult,
+    NewsBatchResponse,
+    NewsBatchUpdate,
+    NewsBatchUpdateItem,
     NewsCreate,
     NewsUpdate,
     NewsListResponse
 )
 from app.core.config import settings
+from app.core.events import SubscriberLimitReached, Subscription, news_events
+from app.core.images import image_processor
+from app.core.logging import SAMPLED
+from app.core.storage import StorageError, local_storage, storage_backend
+from app.core.uploads import (
+    UploadTooLarge,
+    discard_staged,
+    stage_upload
+)
 
 # 设置日志
 logger = logging.getLogger(__name__)
@@ -30,139 +82,337 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-async def upload_to_imgbb(file_content: bytes, filename: str) -> Optional[str]:
-    """上传图片到 ImgBB"""
-    if not settings.IMGBB_API_KEY:
-        return None
-    
-    try:
-        # 将文件内容转换为 base64
-        image_base64 = base64.b64encode(file_content).decode('utf-8')
-        
-        # 准备上传数据
-        data = {
-            'key': settings.IMGBB_API_KEY,
-            'image': image_base64,
-            'name': filename
-        }
-        
-        # 发送请求到 ImgBB API
-        async with aiohttp.ClientSession() as session:
-            async with session.post('https://api.imgbb.com/1/upload', data=data) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    if result.get('success'):
-                        return result['data']['url']
-                return None
-    except Exception as e:
-        print(f"ImgBB upload error: {e}")
-        return None
-
 def get_full_image_url(image_url: Optional[str]) -> Optional[str]:
     """获取完整的图片URL"""
     if not image_url:
-        logger.debug("图片URL为空，返回None")
         return None
     
     # 如果已经是完整URL，直接返回
     if image_url.startswith(('http://', 'https://')):
-        logger.debug(f"图片URL已是完整路径: {image_url}")
         return image_url
-    logger.debug(f"settings.SERVER_HOST: {settings.SERVER_HOST}")
     
     # 拼接完整URL
-    full_url = f"{settings.SERVER_HOST}/uploads/{image_url.lstrip('/')}"
-    logger.debug(f"拼接图片URL: {image_url} -> {full_url}")
-    return full_url
+    return f"{settings.SERVER_HOST}/uploads/{image_url.lstrip('/')}"
+
+
+def _local_image(image_url: Optional[str]) -> Optional[str]:
+    """本地存储图片的文件名，外部图片返回 None"""
+    if not image_url or image_url.startswith(('http://', 'https://')):
+        return None
+    return image_url.lstrip('/')
+
+
+def _variant_set(manifest: Optional[Dict[str, Any]]) -> Optional[ImageVariantSet]:
+    if not manifest or not manifest["variants"]:
+        return None
+    
+    variants = [
+        ImageVariant(
+            url=get_full_image_url(variant["filename"]),
+            width=variant["width"],
+            height=variant["height"],
+            format=variant["format"]
+        )
+        for variant in manifest["variants"]
+    ]
+    # srcset 使用兼容性最好的首选格式（配置中的第一个格式）
+    preferred = variants[0].format
+    srcset = ", ".join(f"{v.url} {v.width}w" for v in variants if v.format == preferred)
+    return ImageVariantSet(srcset=srcset, variants=variants)
+
+
+async def get_image_variants(image_url: Optional[str]) -> Optional[ImageVariantSet]:
+    """获取本地图片的缩放版本集合，尚未处理完成时返回 None"""
+    filename = _local_image(image_url)
+    if filename is None:
+        return None
+    return _variant_set(await image_processor.manifest(filename))
+
+
+async def get_image_variants_batch(
+    image_urls: List[Optional[str]]
+) -> Dict[str, Optional[ImageVariantSet]]:
+    """批量获取多张图片的缩放版本集合，按 image_url 索引；未缓存的清单一次性在线程池中读取"""
+    filenames = {}
+    for url in image_urls:
+        filename = _local_image(url)
+        if filename is not None:
+            filenames[url] = filename
+    manifests = await image_processor.manifests(filenames.values())
+    return {url: _variant_set(manifests[filename]) for url, filename in filenames.items()}
 
 
 @router.get("/", response_model=NewsListResponse)
 async def read_news(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     page: int = Query(default=1, ge=1, description="页码"),
     limit: int = Query(default=10, ge=1, le=100, description="每页数量"),
-    q: Optional[str] = Query(default=None, description="搜索关键词")
+    q: Optional[str] = Query(default=None, description="搜索关键词"),
+    cursor: Optional[str] = Query(default=None, description="分页游标（传入后忽略 page）"),
+    with_total: bool = Query(default=True, description="是否统计总数")
 ) -> Any:
     """获取新闻列表（公开接口）"""
-    logger.info(f"=== 新闻列表查询开始 ===")
-    logger.info(f"查询参数: page={page}, limit={limit}, q={q}")
+    logger.debug("新闻列表查询: page=%s limit=%s q=%s cursor=%s", page, limit, q, cursor)
+    
+    # 优先返回缓存的响应
+    cache_key = await news_cache.list_key(
+        page=page, limit=limit, q=q, cursor=cursor, with_total=with_total
+    )
+    cached = await news_cache.get(cache_key)
+    if cached is not None:
+        logger.debug("命中新闻列表缓存: %s", cache_key)
+        body, headers = cached
+        if is_not_modified(request, headers):
+            return not_modified_response(headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+    # 查询之前记下缓存写版本号，查询期间有写操作时不缓存本次结果
+    cache_version = await news_cache.version()
     
     # 构建查询条件
     query = select(News).where(News.deleted_at.is_(None))
     
     # 添加搜索条件
+    rank = None
     if q:
-        search_filter = or_(
-            News.title.ilike(f"%{q}%"),
-            News.description.ilike(f"%{q}%")
-        )
-        query = query.where(search_filter)
-        logger.info(f"添加搜索条件: {q}")
+        query, rank = search_backend.apply(query, q)
+        logger.debug("添加搜索条件: %s, 检索后端: %s", q, search_backend.name)
     
-    # 获取总数
-    count_query = select(func.count(News.id)).where(News.deleted_at.is_(None))
-    if q:
-        count_query = count_query.where(search_filter)
-    
-    result = await db.execute(count_query)
-    total = result.scalar()
-    logger.info(f"数据库总记录数: {total}")
+    # 计算校验值，客户端数据未变化时直接返回 304
+    headers, total = await listing_validators(
+        db, query, params=f"{page}|{limit}|{q}|{cursor}|{with_total}",
+        with_total=with_total, searching=bool(q)
+    )
+    if is_not_modified(request, headers):
+        return not_modified_response(headers)
     
-    # 分页查询
-    offset = (page - 1) * limit
-    query = query.options(selectinload(News.creator)).order_by(News.created_at.desc()).offset(offset).limit(limit)
-    logger.info(f"分页参数: offset={offset}, limit={limit}")
+    # 分页查询：只投影列表所需的列，并连接 users 获取创建者用户名
+    query = paginate_news(
+        select_list_columns(query), page=page, limit=limit, cursor=cursor, rank=rank
+    )
     
     result = await db.execute(query)
-    news_list = result.scalars().all()
-    logger.info(f"查询到的新闻数量: {len(news_list)}")
+    rows, next_cursor = split_page(
+        result.all(), limit, ranked=rank is not None and not cursor
+    )
     
-    # 添加创建者用户名
+    # 数据来自数据库且类型已确定，使用 model_construct 跳过逐字段校验
     news_with_creator = []
-    for i, news in enumerate(news_list):
-        logger.info(f"新闻 {i+1}: id={news.id}, title={news.title[:20]}..., creator_id={news.creator_id}")
-        logger.info(f"  creator对象: {news.creator}")
-        if news.creator:
-            logger.info(f"  creator.username: {news.creator.username}")
-        else:
-            logger.info(f"  creator为None")
-            
-        # 处理图片URL
-        full_image_url = get_full_image_url(news.image_url)
-        logger.info(f"  原始图片URL: {news.image_url}, 完整图片URL: {full_image_url}")
-        
-        news_dict = {
-            "id": news.id,
-            "title": news.title,
-            "description": news.description,
-            "image_url": full_image_url,
-            "creator_id": news.creator_id,
-            "created_at": news.created_at,
-            "updated_at": news.updated_at,
-            "creator_username": news.creator.username if news.creator else None
-        }
-        news_with_creator.append(NewsSchema(**news_dict))
-    
-    total_pages = ceil(total / limit) if total > 0 else 0
-    logger.info(f"返回结果: items={len(news_with_creator)}, total={total}, total_pages={total_pages}")
-    logger.info(f"=== 新闻列表查询结束 ===")
-    
-    return NewsListResponse(
+    variants = await get_image_variants_batch([row.image_url for row in rows])
+    debug = logger.isEnabledFor(logging.DEBUG)
+    for row in rows:
+        if debug:
+            # 逐条日志只按采样比例输出
+            logger.debug(
+                "新闻 id=%s creator=%s image_url=%s", row.id, row.creator_username, row.image_url,
+                extra=SAMPLED
+            )
+        item = row._asdict()
+        item["image_variants"] = variants.get(row.image_url)
+        item["image_url"] = get_full_image_url(row.image_url)
+        news_with_creator.append(NewsSchema.model_construct(**item))
+    
+    total_pages = None
+    if total is not None:
+        total_pages = ceil(total / limit) if total > 0 else 0
+    logger.debug(
+        "新闻列表返回: items=%d total=%s total_pages=%s", len(news_with_creator), total, total_pages
+    )
+    
+    body = NewsListResponse.model_construct(
         items=news_with_creator,
         total=total,
         page=page,
         limit=limit,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
+    ).model_dump_json().encode("utf-8")
+    await news_cache.set_list(
+        cache_key, body, headers, [news.id for news in news_with_creator],
+        version=cache_version, from_replica=replica_router.is_replica(db)
+    )
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _format_sse(batches: List[Optional[List[Dict[str, Any]]]], subscription: Subscription) -> str:
+    lines = []
+    for events in batches:
+        if events is None:
+            # 连接被服务端关闭（消费过慢或服务关闭），客户端应重新获取列表后再订阅
+            lines.append(f"event: reset\ndata: {json.dumps({'reason': subscription.closed_reason})}\n\n")
+            break
+        lines.extend(f"data: {json.dumps(event, separators=(',', ':'))}\n\n" for event in events)
+    return "".join(lines)
+
+
+@router.get("/events")
+async def stream_news_events() -> StreamingResponse:
+    """订阅新闻变更事件（Server-Sent Events，公开接口）
+
+    每条消息为 JSON：{"type": created | updated | deleted | restored | imported, "id": 新闻 id, "ts": 时间戳}，
+    收到 reset 事件表示连接被服务端断开，客户端应重新拉取列表并重新订阅。
+    """
+    if not news_events.enabled:
+        raise HTTPException(status_code=404, detail="事件推送未启用")
+    if news_events.broker.is_full():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="订阅连接数已达上限"
+        )
+    
+    async def stream():
+        try:
+            async with news_events.broker.subscribe() as subscription:
+                yield "retry: 3000\n\n"
+                while True:
+                    try:
+                        events = await asyncio.wait_for(
+                            subscription.get(), settings.EVENTS_HEARTBEAT_SECONDS
+                        )
+                    except asyncio.TimeoutError:
+                        # 心跳注释：保持代理连接，并让服务端及时发现已断开的客户端
+                        yield ": ping\n\n"
+                        continue
+                    # 一次取出队列中已有的全部事件，合并为一个分块发送
+                    batches = [events]
+                    while events is not None and not subscription.queue.empty():
+                        events = subscription.get_nowait()
+                        batches.append(events)
+                    yield _format_sse(batches, subscription)
+                    if events is None:
+                        return
+        except SubscriberLimitReached:
+            yield 'event: reset\ndata: {"reason":"subscriber_limit"}\n\n'
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
+async def _watch_disconnect(websocket: WebSocket, subscription: Subscription) -> None:
+    """读取并丢弃客户端消息，客户端断开时结束订阅"""
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+    finally:
+        subscription.close("disconnected")
+
+
+@router.websocket("/ws")
+async def news_events_websocket(websocket: WebSocket) -> None:
+    """订阅新闻变更事件（WebSocket，公开接口），每条文本消息的格式与 SSE 相同"""
+    if not news_events.enabled:
+        await websocket.close(code=1008)
+        return
+    try:
+        async with news_events.broker.subscribe() as subscription:
+            await websocket.accept()
+            watcher = asyncio.ensure_future(_watch_disconnect(websocket, subscription))
+            try:
+                while True:
+                    events = await subscription.get()
+                    if events is None:
+                        break
+                    for event in events:
+                        await websocket.send_text(json.dumps(event, separators=(',', ':')))
+                if subscription.closed_reason != "disconnected":
+                    # 1013: 稍后重试（消费过慢）；1001: 服务关闭
+                    code = 1001 if subscription.closed_reason == "shutdown" else 1013
+                    await websocket.close(code=code, reason=subscription.closed_reason)
+            except WebSocketDisconnect:
+                pass
+            finally:
+                watcher.cancel()
+    except SubscriberLimitReached:
+        await websocket.close(code=1013)
+
+
+@router.get("/changes", response_model=NewsChangesResponse)
+async def read_news_changes(
+    db: AsyncSession = Depends(get_db),
+    since: Optional[str] = Query(default=None, description="上次返回的 next_token，不传表示从头同步"),
+    limit: int = Query(default=100, ge=1, le=1000, description="每次返回的变更数")
+) -> Any:
+    """增量同步（公开接口）：按 (updated_at, id) 顺序返回 since 之后新增、修改和删除的新闻
+
+    已删除的新闻以 op=delete 的墓碑返回；has_more 为 true 时用 next_token 继续拉取。
+    读取主库：副本的复制延迟可能让同步位置越过尚未复制的修改。
+    管理员物理删除（强制删除）且此前未软删除的新闻不会产生墓碑。
+    """
+    query = select(*NEWS_LIST_COLUMNS, News.deleted_at).outerjoin(User, User.id == News.creator_id)
+    if since:
+        updated_at, last_id = decode_cursor(since)
+        query = query.where(
+            tuple_(News.updated_at, News.id) > tuple_(
+                literal(updated_at, News.updated_at.type), literal(last_id, News.id.type)
+            )
+        )
+    # 不返回最近 NEWS_SYNC_SETTLE_SECONDS 秒内的变更，等待并发事务提交
+    settled = datetime.now(timezone.utc) - timedelta(seconds=settings.NEWS_SYNC_SETTLE_SECONDS)
+    query = query.where(News.updated_at <= literal(settled, News.updated_at.type))
+    query = query.order_by(News.updated_at, News.id).limit(limit + 1)
+    
+    rows = (await db.execute(query)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    changes = []
+    variants = await get_image_variants_batch(
+        [row.image_url for row in rows if row.deleted_at is None]
+    )
+    for row in rows:
+        if row.deleted_at is not None:
+            changes.append(NewsChange.model_construct(
+                op="delete", id=row.id, updated_at=row.updated_at, deleted_at=row.deleted_at, news=None
+            ))
+            continue
+        item = row._asdict()
+        del item["deleted_at"]
+        item["image_variants"] = variants.get(row.image_url)
+        item["image_url"] = get_full_image_url(row.image_url)
+        changes.append(NewsChange.model_construct(
+            op="upsert", id=row.id, updated_at=row.updated_at, deleted_at=None,
+            news=NewsSchema.model_construct(**item)
+        ))
+    
+    next_token = encode_cursor(rows[-1].updated_at, rows[-1].id) if rows else since
+    body = NewsChangesResponse.model_construct(
+        changes=changes, next_token=next_token, has_more=has_more
+    ).model_dump_json().encode("utf-8")
+    return Response(content=body, media_type="application/json", headers={"Cache-Control": "no-store"})
+
+
 @router.get("/{id}", response_model=NewsSchema)
 async def get_news(
     *,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     id: int
 ) -> Any:
     """获取单个新闻详情（公开接口）"""
+    cached = await news_cache.get(news_cache.item_key(id))
+    if cached is not None:
+        body, headers = cached
+        if is_not_modified(request, headers):
+            return not_modified_response(headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+    cache_version = await news_cache.version()
+    
+    # 先只查询 updated_at，客户端数据未变化时无需读取整行
+    result = await db.execute(
+        select(News.updated_at).where(and_(News.id == id, News.deleted_at.is_(None)))
+    )
+    updated_at = result.scalar_one_or_none()
+    if updated_at is None:
+        raise HTTPException(status_code=404, detail="新闻未找到")
+    headers = item_validators(id, updated_at)
+    if is_not_modified(request, headers):
+        return not_modified_response(headers)
+    
     result = await db.execute(
         select(News).options(selectinload(News.creator)).where(
             and_(News.id == id, News.deleted_at.is_(None))
@@ -175,9 +425,8 @@ async def get_news(
     
     # 处理图片URL
     full_image_url = get_full_image_url(news.image_url)
-    logger.info(f"获取新闻详情 - 原始图片URL: {news.image_url}, 完整图片URL: {full_image_url}")
     
-    return NewsSchema(
+    body = NewsSchema(
         id=news.id,
         title=news.title,
         description=news.description,
@@ -185,8 +434,13 @@ async def get_news(
         creator_id=news.creator_id,
         created_at=news.created_at,
         updated_at=news.updated_at,
-        creator_username=news.creator.username if news.creator else None
+        creator_username=news.creator.username if news.creator else None,
+        image_variants=await get_image_variants(news.image_url)
+    ).model_dump_json().encode("utf-8")
+    await news_cache.set_item(
+        id, body, headers, version=cache_version, from_replica=replica_router.is_replica(db)
     )
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.post("/", response_model=NewsSchema, status_code=status.HTTP_201_CREATED)
@@ -204,7 +458,12 @@ async def create_news(
         creator_id=current_user.id
     )
     db.add(db_news)
+    await db.flush()
+    await search_backend.index(db, db_news)
     await db.commit()
+    news_counter.invalidate()
+    await news_cache.invalidate(shift=True)
+    await news_events.publish("created", db_news.id)
     await db.refresh(db_news)
     
     # 加载创建者信息
@@ -212,7 +471,7 @@ async def create_news(
     
     # 处理图片URL
     full_image_url = get_full_image_url(db_news.image_url)
-    logger.info(f"创建新闻 - 原始图片URL: {db_news.image_url}, 完整图片URL: {full_image_url}")
+    logger.info("创建新闻 id=%s user=%s", db_news.id, current_user.username)
     
     return NewsSchema(
         id=db_news.id,
@@ -222,7 +481,8 @@ async def create_news(
         creator_id=db_news.creator_id,
         created_at=db_news.created_at,
         updated_at=db_news.updated_at,
-        creator_username=db_news.creator.username
+        creator_username=db_news.creator.username,
+        image_variants=await get_image_variants(db_news.image_url)
     )
 
 
@@ -255,7 +515,14 @@ async def update_news(
     for field, value in update_data.items():
         setattr(news, field, value)
     
+    text_changed = "title" in update_data or "description" in update_data
+    if text_changed:
+        await search_backend.index(db, news)
     await db.commit()
+    news_counter.invalidate()
+    # 标题或描述变化后可能进入此前未包含它的检索结果列表，这些列表没有登记该 id，只能整体失效
+    await news_cache.invalidate(id, shift=text_changed)
+    await news_events.publish("updated", id)
     await db.refresh(news)
     
     # 加载创建者信息
@@ -263,7 +530,7 @@ async def update_news(
     
     # 处理图片URL
     full_image_url = get_full_image_url(news.image_url)
-    logger.info(f"更新新闻 - 原始图片URL: {news.image_url}, 完整图片URL: {full_image_url}")
+    logger.info("更新新闻 id=%s user=%s fields=%s", news.id, current_user.username, list(update_data))
     
     return NewsSchema(
         id=news.id,
@@ -273,7 +540,8 @@ async def update_news(
         creator_id=news.creator_id,
         created_at=news.created_at,
         updated_at=news.updated_at,
-        creator_username=news.creator.username
+        creator_username=news.creator.username,
+        image_variants=await get_image_variants(news.image_url)
     )
 
 
@@ -303,87 +571,320 @@ async def delete_news(
     # 软删除
     news.deleted_at = func.now()
     await db.commit()
+    news_counter.invalidate()
+    await news_cache.invalidate(id, shift=True)
+    await news_events.publish("deleted", id)
     
     return None
 
 
+def _check_batch_size(count: int) -> None:
+    if count > settings.NEWS_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"单次批量操作最多 {settings.NEWS_BATCH_MAX_ITEMS} 条"
+        )
+
+
+def _batch_error(index: int, status_code: int, error: str, id: Optional[int] = None) -> NewsBatchItemResult:
+    return NewsBatchItemResult(index=index, id=id, status="error", status_code=status_code, error=error)
+
+
+def _batch_response(results: List[NewsBatchItemResult]) -> NewsBatchResponse:
+    failed = sum(1 for result in results if result.status == "error")
+    return NewsBatchResponse(results=results, succeeded=len(results) - failed, failed=failed)
+
+
+@router.post("/batch/create", response_model=NewsBatchResponse)
+async def batch_create_news(
+    *,
+    db: AsyncSession = Depends(get_db),
+    batch_in: NewsBatchCreate,
+    current_user: User = Depends(deps.get_current_active_user)
+) -> Any:
+    """批量创建新闻（需要认证）：校验失败的条目单独报告，其余在同一事务中批量插入"""
+    _check_batch_size(len(batch_in.items))
+    results: Dict[int, NewsBatchItemResult] = {}
+    indexes, rows = [], []
+    for index, raw in enumerate(batch_in.items):
+        try:
+            news_in = NewsCreate.model_validate(raw)
+        except ValidationError as e:
+            results[index] = _batch_error(
+                index, status.HTTP_422_UNPROCESSABLE_ENTITY, format_validation_error(e)
+            )
+            continue
+        error = check_lengths(news_in.model_dump())
+        if error is not None:
+            # 超长的行在 PostgreSQL 上会使整个批次回滚，插入前逐条拒绝
+            results[index] = _batch_error(index, status.HTTP_422_UNPROCESSABLE_ENTITY, error)
+            continue
+        indexes.append(index)
+        rows.append({
+            "title": news_in.title,
+            "description": news_in.description,
+            "image_url": news_in.image_url,
+            "creator_id": current_user.id
+        })
+    
+    if rows:
+        # 多行 INSERT ... RETURNING，按参数顺序返回新 id
+        # （PostgreSQL 下分批插入；SQLite 无法保证顺序时由 SQLAlchemy 逐行执行，但仍在同一事务内）
+        result = await db.execute(
+            insert(News).returning(News.id, sort_by_parameter_order=True), rows
+        )
+        ids = result.scalars().all()
+        await search_backend.index_many(
+            db, [(id, row["title"], row["description"]) for id, row in zip(ids, rows)]
+        )
+        await db.commit()
+        news_counter.invalidate()
+        await news_cache.invalidate(shift=True)
+        await news_events.publish("created", *ids)
+        for index, id in zip(indexes, ids):
+            results[index] = NewsBatchItemResult(
+                index=index, id=id, status="created", status_code=status.HTTP_201_CREATED
+            )
+    
+    logger.info(
+        "批量创建新闻 user=%s created=%d rejected=%d",
+        current_user.username, len(rows), len(batch_in.items) - len(rows)
+    )
+    return _batch_response([results[index] for index in range(len(batch_in.items))])
+
+
+@router.post("/batch/update", response_model=NewsBatchResponse)
+async def batch_update_news(
+    *,
+    db: AsyncSession = Depends(get_db),
+    batch_in: NewsBatchUpdate,
+    current_user: User = Depends(deps.get_current_active_user)
+) -> Any:
+    """批量更新新闻（需要认证和所有权）：一次查询完成权限检查，同一事务中按主键批量更新"""
+    _check_batch_size(len(batch_in.items))
+    results: Dict[int, NewsBatchItemResult] = {}
+    items: Dict[int, NewsBatchUpdateItem] = {}
+    seen = set()
+    for index, raw in enumerate(batch_in.items):
+        try:
+            item = NewsBatchUpdateItem.model_validate(raw)
+        except ValidationError as e:
+            results[index] = _batch_error(
+                index, status.HTTP_422_UNPROCESSABLE_ENTITY, format_validation_error(e)
+            )
+            continue
+        if item.id in seen:
+            results[index] = _batch_error(index, status.HTTP_400_BAD_REQUEST, "重复的新闻 id", item.id)
+            continue
+        seen.add(item.id)
+        items[index] = item
+    
+    existing = {}
+    if items:
+        result = await db.execute(
+            select(News.id, News.creator_id, News.title, News.description).where(
+                and_(News.id.in_([item.id for item in items.values()]), News.deleted_at.is_(None))
+            )
+        )
+        existing = {row.id: row for row in result}
+    
+    params, documents, updated = [], [], []
+    text_changed = False
+    for index, item in items.items():
+        row = existing.get(item.id)
+        if row is None:
+            results[index] = _batch_error(index, status.HTTP_404_NOT_FOUND, "新闻未找到", item.id)
+            continue
+        # 检查权限：只有创建者或管理员可以编辑
+        if row.creator_id != current_user.id and not current_user.is_admin:
+            results[index] = _batch_error(index, status.HTTP_403_FORBIDDEN, "无权限操作此新闻", item.id)
+            continue
+        update_data = item.model_dump(exclude_unset=True, exclude={"id"})
+        if any(update_data.get(field, "") is None for field in ("title", "description")):
+            results[index] = _batch_error(
+                index, status.HTTP_422_UNPROCESSABLE_ENTITY, "标题和描述不能为空", item.id
+            )
+            continue
+        error = check_lengths(update_data)
+        if error is not None:
+            results[index] = _batch_error(index, status.HTTP_422_UNPROCESSABLE_ENTITY, error, item.id)
+            continue
+        if update_data:
+            params.append({"id": item.id, **update_data})
+        if "title" in update_data or "description" in update_data:
+            text_changed = True
+            documents.append((
+                item.id,
+                update_data.get("title", row.title),
+                update_data.get("description", row.description)
+            ))
+        updated.append(item.id)
+        results[index] = NewsBatchItemResult(
+            index=index, id=item.id, status="updated", status_code=status.HTTP_200_OK
+        )
+    
+    if params:
+        # 按主键批量更新，字段组合相同的条目合并为一次 executemany
+        await db.execute(update(News), params)
+        await search_backend.index_many(db, documents)
+        await db.commit()
+        news_counter.invalidate()
+        # 标题或描述变化可能改变检索结果的成员，同 update_news
+        await news_cache.invalidate_many(updated, shift=text_changed)
+        await news_events.publish("updated", *updated)
+    
+    logger.info("批量更新新闻 user=%s updated=%d", current_user.username, len(updated))
+    return _batch_response([results[index] for index in range(len(batch_in.items))])
+
+
+@router.post("/batch/delete", response_model=NewsBatchResponse)
+async def batch_delete_news(
+    *,
+    db: AsyncSession = Depends(get_db),
+    batch_in: NewsBatchDelete,
+    current_user: User = Depends(deps.get_current_active_user)
+) -> Any:
+    """批量删除新闻（软删除，需要认证和所有权）"""
+    _check_batch_size(len(batch_in.ids))
+    result = await db.execute(
+        select(News.id, News.creator_id).where(
+            and_(News.id.in_(batch_in.ids), News.deleted_at.is_(None))
+        )
+    )
+    owners = {row.id: row.creator_id for row in result}
+    
+    results, deleted, seen = [], [], set()
+    for index, id in enumerate(batch_in.ids):
+        if id in seen:
+            results.append(_batch_error(index, status.HTTP_400_BAD_REQUEST, "重复的新闻 id", id))
+        elif id not in owners:
+            results.append(_batch_error(index, status.HTTP_404_NOT_FOUND, "新闻未找到", id))
+        elif owners[id] != current_user.id and not current_user.is_admin:
+            results.append(_batch_error(index, status.HTTP_403_FORBIDDEN, "无权限操作此新闻", id))
+        else:
+            deleted.append(id)
+            results.append(NewsBatchItemResult(
+                index=index, id=id, status="deleted", status_code=status.HTTP_204_NO_CONTENT
+            ))
+        seen.add(id)
+    
+    if deleted:
+        await db.execute(
+            update(News).where(News.id.in_(deleted)).values(deleted_at=func.now()),
+            execution_options={"synchronize_session": False}
+        )
+        await db.commit()
+        news_counter.invalidate()
+        await news_cache.invalidate_many(deleted, shift=True)
+        await news_events.publish("deleted", *deleted)
+    
+    logger.info("批量删除新闻 user=%s deleted=%d", current_user.username, len(deleted))
+    return _batch_response(results)
+
+
 @router.post("/upload", status_code=status.HTTP_201_CREATED)
 async def upload_image(
     *,
+    db: AsyncSession = Depends(get_db),
     image: UploadFile = File(...),
     current_user: User = Depends(deps.get_current_active_user)
 ) -> Any:
     """上传图片（需要认证）"""
-    logger.info(f"=== 图片上传开始 ===")
-    logger.info(f"用户: {current_user.username}, 文件名: {image.filename}, 文件类型: {image.content_type}")
+    logger.debug(
+        "图片上传: user=%s filename=%s content_type=%s",
+        current_user.username, image.filename, image.content_type
+    )
     
     # 检查文件类型
     if not image.content_type or not image.content_type.startswith('image/'):
-        logger.error(f"不支持的文件类型: {image.content_type}")
+        logger.warning("不支持的文件类型: %s", image.content_type)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="只支持图片文件"
         )
     
-    # 检查文件大小（限制为2MB）
-    max_size = 2 * 1024 * 1024  # 2MB
-    content = await image.read()
-    if len(content) > max_size:
-        logger.error(f"文件过大: {len(content)} bytes")
+    # 分块读取并写入临时文件，边读边计算哈希，超出大小限制时立即中止
+    upload_dir = settings.upload_path
+    try:
+        staged = await stage_upload(image, upload_dir, settings.UPLOAD_MAX_SIZE)
+    except UploadTooLarge:
+        logger.warning("文件过大，超出 %d bytes", settings.UPLOAD_MAX_SIZE)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="上传文件不能超出2M"
         )
-    
-    # 生成唯一文件名
-    file_extension = os.path.splitext(image.filename)[1] if image.filename else '.jpg'
-    unique_filename = f"{uuid.uuid4().hex}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{file_extension}"
-    
-    # 优先尝试上传到 ImgBB
-    if hasattr(settings, 'USE_THIRD_PARTY_STORAGE') and settings.USE_THIRD_PARTY_STORAGE and settings.IMGBB_API_KEY:
-        logger.info("尝试上传到 ImgBB")
-        imgbb_url = await upload_to_imgbb(content, unique_filename)
-        if imgbb_url:
-            logger.info(f"ImgBB 上传成功: {imgbb_url}")
+    except OSError as e:
+        logger.error("文件保存失败: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="文件保存失败"
+        )
+    logger.debug("文件已暂存: size=%d sha256=%s", staged.size, staged.sha256)
+    
+    # 相同内容已上传过时直接返回已有地址，不再重复写盘或上传
+    asset = await db.get(ImageAsset, staged.sha256)
+    if asset:
+        backend = storage_backend if asset.storage == storage_backend.name else local_storage
+        if asset.storage == backend.name and await backend.exists(asset.location):
+            discard_staged(staged.path)
+            logger.info("命中已上传图片: %s", asset.location)
             return {
                 "message": "图片上传成功",
-                "filename": imgbb_url,
-                "url": imgbb_url
+                "filename": asset.location,
+                "url": get_full_image_url(asset.location),
+                "sha256": asset.sha256
             }
-        else:
-            logger.warning("ImgBB 上传失败，回退到本地存储")
     
-    # 回退到本地存储
-    # 确保上传目录存在
-    # 使用绝对路径避免Windows路径长度限制
-    upload_dir = r"e:\my_project\feedNews\trae\backend\uploads"
+    # 以内容哈希命名文件
+    file_extension = os.path.splitext(image.filename)[1].lower() if image.filename else '.jpg'
+    content_filename = f"{staged.sha256}{file_extension or '.jpg'}"
     
-    logger.info(f"计算的上传目录路径: {upload_dir}")
-    
-    os.makedirs(upload_dir, exist_ok=True)
-    
-    # 保存文件
-    file_path = os.path.join(upload_dir, unique_filename)
-    logger.info(f"保存文件到: {file_path}")
+    # 保存到配置的存储后端，远程存储失败时回退到本地存储
+    storage, location = None, None
+    if storage_backend is not local_storage:
+        try:
+            location = await storage_backend.save(staged, content_filename, image.content_type)
+            storage = storage_backend.name
+            logger.debug("%s 上传成功: %s", storage, location)
+        except StorageError as e:
+            logger.warning("%s 上传失败，回退到本地存储: %s", storage_backend.name, e)
     
     try:
-        with open(file_path, "wb") as f:
-            f.write(content)
-        
-        # 返回相对路径，用于存储到数据库
-        relative_path = unique_filename
-        logger.info(f"文件上传成功: {relative_path}")
-        logger.info(f"=== 图片上传结束 ===")
-        
-        return {
-            "message": "图片上传成功",
-            "filename": relative_path,
-            "url": get_full_image_url(relative_path)
-        }
-    
-    except Exception as e:
-        logger.error(f"文件保存失败: {str(e)}")
+        if storage is None:
+            location = await local_storage.save(staged, content_filename, image.content_type)
+            storage = local_storage.name
+            # 在后台进程池中生成缩放版本，不等待处理完成
+            image_processor.schedule(location)
+    except StorageError as e:
+        logger.error("文件保存失败: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="文件保存失败"
         )
+    finally:
+        # 远程上传成功或保存失败时清理临时文件（本地保存已将其重命名）
+        discard_staged(staged.path)
+    
+    # 记录哈希索引；并发上传相同内容时以先写入者为准
+    if asset:
+        asset.storage, asset.location = storage, location
+    else:
+        db.add(ImageAsset(
+            sha256=staged.sha256,
+            storage=storage,
+            location=location,
+            size=staged.size,
+            content_type=image.content_type
+        ))
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+    
+    logger.info("图片上传成功: user=%s storage=%s location=%s", current_user.username, storage, location)
+    return {
+        "message": "图片上传成功",
+        "filename": location,
+        "url": get_full_image_url(location),
+        "sha256": staged.sha256
+    }
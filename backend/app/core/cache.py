@@ -0,0 +1,234 @@
+"""
+通用缓存组件
+
+- LRUTTLCache: 进程内 LRU + TTL 缓存（同步接口，只在事件循环线程中使用）
+- MemoryCacheBackend / RedisCacheBackend: 异步缓存后端，接口一致，后者可在多个 worker 之间共享
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, List, Optional, Set
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class LRUTTLCache:
+    """容量有限、条目带过期时间的 LRU 缓存"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend:
+    """异步缓存后端接口，值统一为 bytes"""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        raise NotImplementedError
+
+    async def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    async def get_int(self, key: str) -> int:
+        """读取计数器，不存在时为 0"""
+        raise NotImplementedError
+
+    async def incr(self, key: str) -> int:
+        raise NotImplementedError
+
+    async def add_members(self, key: str, members: Iterable[str], ttl: int) -> None:
+        """向集合添加成员并刷新过期时间"""
+        raise NotImplementedError
+
+    async def pop_members(self, key: str) -> List[str]:
+        """取出集合全部成员并删除该集合"""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """进程内缓存后端"""
+
+    def __init__(self, maxsize: int = 1000) -> None:
+        self._values = LRUTTLCache(maxsize=maxsize)
+        # 集合只用于失效索引，容量放宽一些，淘汰后仍有 TTL 兜底
+        self._sets = LRUTTLCache(maxsize=maxsize * 4)
+        self._counters: dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._values.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._values.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._values.pop(key)
+
+    async def get_int(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def add_members(self, key: str, members: Iterable[str], ttl: int) -> None:
+        current: Set[str] = self._sets.get(key) or set()
+        current.update(members)
+        self._sets.set(key, current, ttl)
+
+    async def pop_members(self, key: str) -> List[str]:
+        return list(self._sets.pop(key) or ())
+
+
+class RedisError(Exception):
+    """Redis 返回的错误应答"""
+
+
+class RedisCacheBackend(CacheBackend):
+    """基于 RESP 协议的最小 Redis 客户端，兼容 Redis / KeyDB / Valkey 等实现
+
+    单连接串行收发，出错时断开并在下次调用时重连；缓存不可用时调用方按未命中处理。
+    """
+
+    def __init__(self, url: str, timeout: float = 1.0) -> None:
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            await self._roundtrip("AUTH", self.password)
+        if self.db:
+            await self._roundtrip("SELECT", self.db)
+
+    async def _disconnect(self) -> None:
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def _roundtrip(self, *args: Any) -> Any:
+        payload = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            payload.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._writer.write(b"".join(payload))
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Redis 连接已关闭")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode("utf-8")
+        if kind == b"-":
+            raise RedisError(body.decode("utf-8"))
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(body)
+            if length < 0:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+        raise RedisError(f"无法解析的应答: {line!r}")
+
+    async def execute(self, *args: Any) -> Any:
+        """执行一条命令，出现任何异常时断开以便下次重连
+
+        收发中途被取消或出错时，连接上可能残留未读完的应答，继续使用会让下一条命令读到上一条的结果。
+        """
+        async with self._lock:
+            try:
+                if self._writer is None:
+                    await asyncio.wait_for(self._connect(), self.timeout)
+                return await asyncio.wait_for(self._roundtrip(*args), self.timeout)
+            except BaseException:
+                # _disconnect 在第一次 await 之前已清空连接，即使再次被取消也不会复用旧连接
+                await self._disconnect()
+                raise
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.execute("GET", key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self.execute("SET", key, value, "EX", ttl)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.execute("DEL", *keys)
+
+    async def get_int(self, key: str) -> int:
+        value = await self.execute("GET", key)
+        return int(value) if value is not None else 0
+
+    async def incr(self, key: str) -> int:
+        return await self.execute("INCR", key)
+
+    async def add_members(self, key: str, members: Iterable[str], ttl: int) -> None:
+        members = list(members)
+        if members:
+            await self.execute("SADD", key, *members)
+            await self.execute("EXPIRE", key, ttl)
+
+    async def pop_members(self, key: str) -> List[str]:
+        members = await self.execute("SMEMBERS", key) or []
+        await self.execute("DEL", key)
+        return [member.decode("utf-8") for member in members]
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._disconnect()
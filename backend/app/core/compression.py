@@ -0,0 +1,159 @@
+"""
+响应压缩中间件
+
+按 Accept-Encoding 协商 brotli（安装了 brotli 包时）或 gzip，只压缩文本类响应，
+小于阈值的响应、已编码的响应以及 304/206 等响应原样返回。
+流式响应逐块压缩，不会把整个响应体读入内存。
+"""
+import zlib
+from typing import Callable, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli 为可选依赖
+    brotli = None
+
+_COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def _parse_accept_encoding(value: str) -> List[Tuple[str, float]]:
+    encodings = []
+    for item in value.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            encodings.append((name.strip().lower(), q))
+    return encodings
+
+
+class _Compressor:
+    """统一 gzip 与 brotli 的流式压缩接口"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int) -> None:
+        self.encoding = encoding
+        if encoding == "br":
+            self._obj = brotli.Compressor(quality=brotli_quality)
+            self._compress: Callable[[bytes], bytes] = self._obj.process
+            self._flush = self._obj.flush
+            self._finish = self._obj.finish
+        else:
+            # wbits=31 生成带 gzip 头的数据流
+            self._obj = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self._compress = self._obj.compress
+            self._flush = lambda: self._obj.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._obj.flush
+
+    def compress(self, data: bytes, *, final: bool) -> bytes:
+        out = self._compress(data)
+        # 流式响应的每个分块都要刷新，保证客户端能及时收到数据
+        return out + (self._finish() if final else self._flush())
+
+
+class CompressionMiddleware:
+    """gzip / brotli 响应压缩"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        enable_brotli: bool = True,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.encodings = (["br"] if enable_brotli and brotli is not None else []) + ["gzip"]
+
+    def select_encoding(self, accept_encoding: str) -> Optional[str]:
+        """按 q 值选择服务端支持的编码，q 值相同时按服务端偏好（br 优先）"""
+        accepted = {name: q for name, q in _parse_accept_encoding(accept_encoding)}
+        best, best_q = None, 0.0
+        for encoding in self.encodings:
+            q = accepted.get(encoding, accepted.get("*", 0.0))
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = self.select_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def compressing_send(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if (
+                    message["status"] in (204, 206, 304)
+                    or "content-encoding" in headers
+                    or not content_type.startswith(_COMPRESSIBLE_TYPES)
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # 等到第一个响应体分块再决定是否压缩
+                    start_message = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None and start_message is not None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                # 强 ETag 对应未压缩的内容，压缩后改为弱 ETag
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = "W/" + etag
+                if more_body:
+                    del headers["Content-Length"]
+                    await send(start_message)
+                else:
+                    compressed = compressor.compress(body, final=True)
+                    headers["Content-Length"] = str(len(compressed))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+            await send({
+                "type": "http.response.body",
+                "body": compressor.compress(body, final=not more_body),
+                "more_body": more_body,
+            })
+
+        await self.app(scope, receive, compressing_send)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 import os
 
 
@@ -10,7 +10,55 @@ class Settings(BaseSettings):
     
     # 服务器配置
     SERVER_HOST: str = "http://localhost:8000"
-    UPLOAD_DIR: str = "uploads"
+    UPLOAD_DIR: str = "uploads"  # 相对路径基于 backend 目录
+    UPLOAD_MAX_SIZE: int = 2 * 1024 * 1024  # 2MB
+    # /uploads 文件发送方式: direct（应用直接发送）| x-accel（nginx）| x-sendfile（Apache/lighttpd）
+    UPLOADS_SERVE_MODE: str = "direct"
+    UPLOADS_ACCEL_PREFIX: str = "/_uploads/"  # x-accel 模式下 nginx 中对应的 internal location
+    UPLOADS_CACHE_MAX_AGE: int = 31536000  # 以内容哈希命名的文件的缓存秒数
+    
+    @property
+    def upload_path(self) -> str:
+        """上传目录的绝对路径"""
+        if os.path.isabs(self.UPLOAD_DIR):
+            return self.UPLOAD_DIR
+        backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+        return os.path.join(backend_dir, self.UPLOAD_DIR)
+    
+    # 生产启动器（serve.py），命令行参数可覆盖
+    SERVE_HOST: str = "0.0.0.0"
+    SERVE_PORT: int = 8000
+    SERVE_WORKERS: Optional[int] = None  # 留空为可用 CPU 核数
+    SERVE_LOOP: str = "auto"  # auto（已安装 uvloop 时使用）| uvloop | asyncio
+    SERVE_HTTP: str = "auto"  # auto（已安装 httptools 时使用）| httptools | h11
+    SERVE_BACKLOG: int = 2048  # 监听队列长度，受内核 net.core.somaxconn 限制
+    SERVE_KEEP_ALIVE: int = 65  # 空闲长连接保持秒数，应大于前端负载均衡的空闲超时（常见为 60 秒）
+    SERVE_GRACEFUL_TIMEOUT: int = 10  # 收到退出信号后等待进行中请求（含 SSE 长连接）结束的秒数
+    SERVE_LIMIT_CONCURRENCY: Optional[int] = None  # 每个 worker 的最大并发连接数，超出返回 503
+    SERVE_PRELOAD: bool = False  # 在主进程中先导入应用，配置或导入错误在启动 worker 之前暴露
+    SERVE_FORWARDED_ALLOW_IPS: str = "127.0.0.1"  # 信任其 X-Forwarded-* 头的代理地址，* 表示全部
+    SERVE_ACCESS_LOG: bool = False  # 每个请求一行访问日志，高负载下开销明显；慢请求日志与 /metrics 不受影响
+    
+    # 日志
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"  # text | json（每行一个 JSON 对象）
+    LOG_SAMPLE_RATE: float = 0.01  # 逐条数据调试日志的输出比例
+    
+    # 性能指标（/metrics，Prometheus 文本格式）与慢日志阈值，阈值为 0 表示不记录
+    METRICS_ENABLED: bool = True
+    # /metrics 访问控制：允许的客户端地址（逗号分隔，支持 CIDR，* 表示全部），
+    # 或者抓取方携带 Authorization: Bearer <METRICS_TOKEN>；经代理时按 SERVE_FORWARDED_ALLOW_IPS 解析的真实地址判断
+    METRICS_ALLOW_IPS: str = "127.0.0.1,::1"
+    METRICS_TOKEN: Optional[str] = None
+    SLOW_REQUEST_MS: int = 1000
+    SLOW_QUERY_MS: int = 200
+    
+    # 就绪检查
+    HEALTH_CACHE_SECONDS: float = 2.0  # 检查结果缓存秒数
+    HEALTH_DB_TIMEOUT: float = 2.0
+    HEALTH_POOL_SATURATION: float = 0.9  # 已签出连接占比达到该值时视为不就绪
+    HEALTH_MIN_FREE_MB: int = 100  # 上传目录最低剩余空间
+    HEALTH_STORAGE_TIMEOUT: float = 3.0
     
     # 数据库配置
     POSTGRES_SERVER: Optional[str] = None
@@ -29,15 +77,115 @@ class Settings(BaseSettings):
             return f"sqlite+aiosqlite:///{db_path}"
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:5432/{self.POSTGRES_DB}"
     
+    # 只读副本：公开与管理后台的列表/详情读取走副本
+    DATABASE_READ_URL: Optional[str] = None
+    DB_REPLICA_CONNECT_TIMEOUT: float = 2.0
+    DB_REPLICA_RETRY_SECONDS: int = 30  # 副本故障后回退主库的时长
+    DB_REPLICA_STICKY_SECONDS: float = 5.0  # 主库提交后继续读主库的时长，应大于复制延迟
+    # 读主库窗口的范围: client（通过 Cookie 按客户端计算，多 worker 下同样有效）| process（整个进程共享）
+    DB_REPLICA_STICKY_SCOPE: str = "client"
+    DB_REPLICA_STICKY_COOKIE: str = "db_primary_until"
+    
+    # 启动时的数据库初始化: migrate（执行 alembic 迁移到最新版本）| skip（不执行任何 DDL，由部署流程负责迁移）
+    DB_INIT_MODE: str = "migrate"
+    DB_SEED: bool = True  # migrate 模式下创建默认管理员与示例新闻
+    
+    # 数据库引擎与连接池（未设置的项使用按数据库类型区分的默认值）
+    DB_ECHO: bool = False  # 输出 SQL 语句，仅建议在本地调试时开启
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: int = 30  # 等待空闲连接的秒数
+    DB_POOL_RECYCLE: Optional[int] = None  # 连接最长存活秒数，-1 表示不回收
+    DB_POOL_PRE_PING: Optional[bool] = None
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg 语句缓存，使用 pgbouncer 事务模式时设为 0
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    
+    # 全文检索后端: auto（按数据库自动选择）| like | sqlite_fts | postgres
+    SEARCH_BACKEND: str = "auto"
+    
+    # 新闻列表总数统计策略: exact | cached | estimated
+    NEWS_COUNT_STRATEGY: str = "exact"
+    NEWS_COUNT_CACHE_TTL: int = 30  # cached 策略的缓存秒数，配置 CACHE_REDIS_URL 时各 worker 共享
+    NEWS_COUNT_ESTIMATE_MIN: int = 10000  # 估算值低于该阈值时改为精确统计
+    
+    # 批量写入与导出
+    NEWS_BATCH_MAX_ITEMS: int = 1000  # 批量接口单次请求的条目上限
+    NEWS_EXPORT_BATCH_SIZE: int = 500  # 导出时每次从游标读取的行数
+    NEWS_IMPORT_CHUNK_SIZE: int = 1000  # 导入时每个事务写入的行数
+    NEWS_IMPORT_MAX_ERRORS: int = 1000  # 导入结果中最多列出的被拒绝行
+    
+    # 增量同步（/news/changes）：只返回至少这么多秒之前的变更，
+    # 给仍在进行中的写事务留出提交时间，避免客户端的同步位置越过尚未可见的修改
+    NEWS_SYNC_SETTLE_SECONDS: int = 2
+    
+    # 新闻变更实时推送（SSE / WebSocket）
+    EVENTS_ENABLED: bool = True
+    # 跨 worker 事件总线: auto（PostgreSQL 时使用 LISTEN/NOTIFY）| local | postgres
+    # 进程内总线（local，或未使用 PostgreSQL）只支持单 worker，serve.py 会据此限制 worker 数
+    EVENTS_BUS: str = "auto"
+    EVENTS_CHANNEL: str = "news_events"
+    EVENTS_QUEUE_SIZE: int = 100  # 每个订阅者的待发送事件上限，写满时断开该订阅者
+    EVENTS_MAX_SUBSCRIBERS: int = 1000  # 每个 worker 的推送连接上限
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0  # 心跳间隔，保持代理连接并及时发现断开的客户端
+    
+    # 公开新闻接口响应缓存
+    NEWS_CACHE_ENABLED: bool = True
+    NEWS_CACHE_TTL: int = 30  # 秒
+    NEWS_CACHE_MAX_ENTRIES: int = 1000  # 进程内缓存条目上限
+    CACHE_REDIS_URL: Optional[str] = None  # 配置后使用共享的 Redis 协议缓存，例如 redis://localhost:6379/0
+    
+    # 密码哈希（bcrypt）线程池
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32  # 排队（含计算中）任务上限，超出返回 503
+    
     # JWT 配置
     SECRET_KEY: str = "default_secret_key_change_in_production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
+    AUTH_PRINCIPAL_CACHE_TTL: int = 60  # 已验证用户缓存秒数，0 表示每次请求都查询数据库
+    AUTH_PRINCIPAL_CACHE_SIZE: int = 10000
     
     # 第三方图片存储配置
     IMGBB_API_KEY: str = ""
+    IMGBB_API_URL: str = "https://api.imgbb.com/1/upload"
     USE_THIRD_PARTY_STORAGE: bool = True
-    
+
+    # 图片存储后端: auto（配置了 ImgBB 时使用 imgbb，否则 local）| local | imgbb | s3
+    STORAGE_BACKEND: str = "auto"
+    S3_ENDPOINT_URL: str = "https://s3.amazonaws.com"
+    S3_BUCKET: str = ""
+    S3_ACCESS_KEY: str = ""
+    S3_SECRET_KEY: str = ""
+    S3_REGION: str = "us-east-1"
+    S3_PUBLIC_URL: Optional[str] = None  # 对外访问地址（CDN 等），默认为 endpoint/bucket
+    S3_PREFIX: str = ""  # 对象键前缀，例如 images/
+
+    # 上传图片后台处理（需要安装 Pillow）
+    IMAGE_PROCESSING_ENABLED: bool = True
+    IMAGE_PROCESS_WORKERS: int = 1  # 处理进程数
+    IMAGE_VARIANT_WIDTHS: List[int] = [400, 800, 1200]
+    IMAGE_VARIANT_FORMATS: List[str] = ["webp", "avif"]  # 当前 Pillow 不支持的格式会被跳过
+    IMAGE_VARIANT_QUALITY: int = 80
+    IMAGE_MANIFEST_CACHE_SIZE: int = 4096
+
+    # 响应压缩（brotli 需要安装 brotli 包）
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # 小于该字节数的响应不压缩
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_ENABLED: bool = True
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0-11，动态响应不宜过高
+
+    # 出站 HTTP 客户端（第三方存储等）
+    HTTP_POOL_SIZE: int = 100  # 连接池上限
+    HTTP_MAX_CONCURRENCY: int = 10  # 同时进行的出站请求数
+    HTTP_TIMEOUT: float = 30.0  # 单次请求总超时秒数
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_RETRIES: int = 2  # 网络错误、超时、429/5xx 的重试次数
+    HTTP_RETRY_BACKOFF: float = 0.5  # 首次重试等待秒数，之后指数增长
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,268 @@
+"""
+新闻变更事件推送
+
+- EventBroker: 进程内扇出，每个订阅者一个有界队列；队列写满的慢消费者会被断开（客户端重连后重新拉取列表），
+  发布方永远不会因为某个客户端读得慢而阻塞
+- LocalEventBus: 只在本进程内投递，只能用于单 worker（serve.py 在使用它时不会启动多个 worker）
+- PostgresEventBus: 通过 PostgreSQL LISTEN/NOTIFY 在多个 worker（以及多台机器）之间转发事件，
+  发布的事件经 NOTIFY 回送到包括自己在内的所有 worker，再由各自的 broker 扇出
+
+事件只在数据库提交之后发布，内容只包含类型与新闻 id，客户端按需重新获取数据。
+"""
+import asyncio
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Event = Dict[str, Any]
+
+# NOTIFY 负载上限为 8000 字节，留出余量
+_NOTIFY_MAX_PAYLOAD = 7000
+
+
+class SubscriberLimitReached(Exception):
+    """订阅连接数已达上限"""
+
+
+class Subscription:
+    """单个客户端的事件队列，队列中每一项是一次发布的一批事件"""
+
+    def __init__(self, maxsize: int) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.closed_reason: Optional[str] = None
+
+    def close(self, reason: str) -> None:
+        """清空队列并放入结束标记，让消费方立即退出"""
+        self.closed_reason = reason
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def get(self) -> Optional[List[Event]]:
+        """取下一批事件，订阅被关闭时返回 None"""
+        return await self.queue.get()
+
+    def get_nowait(self) -> Optional[List[Event]]:
+        return self.queue.get_nowait()
+
+
+class EventBroker:
+    """进程内的事件扇出"""
+
+    def __init__(self, queue_size: int, max_subscribers: int) -> None:
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: Set[Subscription] = set()
+        self.published = 0
+        self.dropped = 0
+
+    def is_full(self) -> bool:
+        return len(self._subscribers) >= self.max_subscribers
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[Subscription]:
+        if self.is_full():
+            raise SubscriberLimitReached()
+        subscription = Subscription(self.queue_size)
+        self._subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscribers.discard(subscription)
+
+    def dispatch(self, events: List[Event]) -> None:
+        """把一批事件放入每个订阅者的队列；放不下的订阅者被断开"""
+        self.published += len(events)
+        for subscription in list(self._subscribers):
+            if subscription.closed_reason is not None:
+                continue
+            try:
+                subscription.queue.put_nowait(events)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                self._subscribers.discard(subscription)
+                subscription.close("slow_consumer")
+                logger.info("断开过慢的事件订阅者，当前订阅数 %d", len(self._subscribers))
+
+    def close_all(self, reason: str) -> None:
+        for subscription in list(self._subscribers):
+            subscription.close(reason)
+        self._subscribers.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped_subscribers": self.dropped,
+        }
+
+
+class LocalEventBus:
+    """进程内事件总线，直接交给本进程的 broker"""
+
+    name = "local"
+
+    def __init__(self, broker: EventBroker) -> None:
+        self.broker = broker
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish(self, events: List[Event]) -> None:
+        self.broker.dispatch(events)
+
+
+class PostgresEventBus(LocalEventBus):
+    """基于 LISTEN/NOTIFY 的跨 worker 事件总线，使用一条独立的 asyncpg 连接"""
+
+    name = "postgres"
+
+    def __init__(self, broker: EventBroker, dsn: str, channel: str) -> None:
+        super().__init__(broker)
+        self.dsn = dsn
+        self.channel = channel
+        self._conn = None
+        self._lock = asyncio.Lock()
+        self._supervisor: Optional[asyncio.Task] = None
+        self._connected = asyncio.Event()
+
+    async def start(self) -> None:
+        self._supervisor = asyncio.ensure_future(self._supervise())
+
+    async def stop(self) -> None:
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            try:
+                await self._supervisor
+            except asyncio.CancelledError:
+                pass
+        if self._conn is not None and not self._conn.is_closed():
+            await self._conn.close()
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            events = json.loads(payload)
+        except ValueError:
+            logger.warning("忽略无法解析的事件通知: %.200s", payload)
+            return
+        self.broker.dispatch(events)
+
+    async def _supervise(self) -> None:
+        """保持 LISTEN 连接，断开后按指数退避重连"""
+        delay = 1.0
+        while True:
+            try:
+                self._conn = await asyncpg.connect(self.dsn)
+                await self._conn.add_listener(self.channel, self._on_notify)
+                self._connected.set()
+                delay = 1.0
+                logger.info("事件总线已连接，监听频道 %s", self.channel)
+                while not self._conn.is_closed():
+                    await asyncio.sleep(5)
+                logger.warning("事件总线连接已断开，重新连接")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("事件总线连接失败，%.0f 秒后重试: %s", delay, e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+            finally:
+                self._connected.clear()
+
+    async def publish(self, events: List[Event]) -> None:
+        if not self._connected.is_set():
+            # 总线不可用时至少保证本 worker 的订阅者收到事件
+            logger.warning("事件总线未连接，事件只在本进程内投递")
+            self.broker.dispatch(events)
+            return
+        # 按负载上限拆分为多条 NOTIFY
+        payloads, batch, size = [], [], 2
+        for event in events:
+            encoded = json.dumps(event, separators=(",", ":"))
+            if batch and size + len(encoded) + 1 > _NOTIFY_MAX_PAYLOAD:
+                payloads.append("[" + ",".join(batch) + "]")
+                batch, size = [], 2
+            batch.append(encoded)
+            size += len(encoded) + 1
+        if batch:
+            payloads.append("[" + ",".join(batch) + "]")
+        try:
+            async with self._lock:
+                for payload in payloads:
+                    await self._conn.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+        except Exception as e:
+            logger.warning("发送事件通知失败，事件只在本进程内投递: %s", e)
+            self.broker.dispatch(events)
+
+
+class NewsEvents:
+    """新闻事件的发布入口"""
+
+    def __init__(self, broker: EventBroker, bus: LocalEventBus, enabled: bool = True) -> None:
+        self.broker = broker
+        self.bus = bus
+        self.enabled = enabled
+
+    async def start(self) -> None:
+        if self.enabled:
+            await self.bus.start()
+
+    async def stop(self) -> None:
+        # uvicorn 在连接排空（或优雅退出超时取消）之后才执行 lifespan 关闭，这里只做兜底清理；
+        # 需要在收到退出信号时立即结束推送连接，见 serve.py 中的 Server.handle_exit
+        self.broker.close_all("shutdown")
+        if self.enabled:
+            await self.bus.stop()
+
+    async def publish(self, type: str, *ids: int, **extra: Any) -> None:
+        """发布事件：每个 id 一个事件；没有 id 时发布一个不带 id 的事件（如批量导入）"""
+        if not self.enabled:
+            return
+        ts = time.time()
+        events = [{"type": type, "id": id, "ts": ts, **extra} for id in ids]
+        if not events:
+            events = [{"type": type, "ts": ts, **extra}]
+        try:
+            await self.bus.publish(events)
+        except Exception as e:
+            # 事件推送失败不影响已完成的写操作
+            logger.warning("发布新闻事件失败: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, "bus": self.bus.name, **self.broker.stats()}
+
+
+def resolve_event_bus() -> str:
+    """按配置与数据库类型确定实际使用的事件总线: postgres | local"""
+    postgres = make_url(settings.database_url).get_backend_name() == "postgresql"
+    if settings.EVENTS_BUS in ("auto", "postgres") and postgres:
+        return "postgres"
+    return "local"
+
+
+def _create_news_events() -> NewsEvents:
+    broker = EventBroker(settings.EVENTS_QUEUE_SIZE, settings.EVENTS_MAX_SUBSCRIBERS)
+    if resolve_event_bus() == "postgres":
+        url = make_url(settings.database_url)
+        dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        bus: LocalEventBus = PostgresEventBus(broker, dsn, settings.EVENTS_CHANNEL)
+    else:
+        if settings.EVENTS_BUS not in ("auto", "local"):
+            logger.warning("事件总线 %s 需要 PostgreSQL，使用进程内总线", settings.EVENTS_BUS)
+        bus = LocalEventBus(broker)
+    return NewsEvents(broker, bus, enabled=settings.EVENTS_ENABLED)
+
+
+news_events = _create_news_events()
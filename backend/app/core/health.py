@@ -0,0 +1,142 @@
+"""
+健康检查
+
+- 存活检查（liveness）：只确认进程与事件循环可以响应，不访问任何依赖
+- 就绪检查（readiness）：检查数据库连通性（带超时的 SELECT 1）、连接池饱和度、
+  上传目录可写与剩余空间、存储后端可达性；结果短时间缓存，并发的探测共享同一次检查
+
+每项检查的状态为 ok / degraded / fail，任一项 fail 时整体不就绪（503）。
+存储后端与只读副本有回退路径（本地存储、主库），不可用时只标记为 degraded。
+探测接口无需认证，响应只包含每项检查的名称与状态；错误原因、延迟等细节只写入日志。
+"""
+import asyncio
+import logging
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.storage import StorageBackend, local_storage, storage_backend
+from app.db.session import engine, pool_stats, read_engine
+
+logger = logging.getLogger(__name__)
+
+_SEVERITY = {"ok": 0, "degraded": 1, "fail": 2}
+
+
+async def check_database(target: AsyncEngine, timeout: float) -> Dict[str, Any]:
+    """执行 SELECT 1，并检查连接池是否接近耗尽"""
+    result: Dict[str, Any] = {"status": "ok"}
+    stats = pool_stats(target)
+    # max_overflow 为 -1 表示不限制溢出连接，不存在饱和
+    capacity = stats.get("size", 0) + stats.get("max_overflow", 0)
+    if capacity > 0 and stats.get("max_overflow", 0) >= 0:
+        saturation = stats["checked_out"] / capacity
+        result["pool_saturation"] = round(saturation, 3)
+        if saturation >= settings.HEALTH_POOL_SATURATION:
+            # 连接池已接近耗尽，不应继续接收流量；也不再占用连接做探测
+            result.update(status="fail", error="连接池接近耗尽")
+            return result
+
+    started = time.perf_counter()
+    try:
+        async def ping() -> None:
+            async with target.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        await asyncio.wait_for(ping(), timeout)
+    except asyncio.TimeoutError:
+        result.update(status="fail", error=f"查询超时（{timeout}s）")
+    except Exception:
+        logger.warning("就绪检查：数据库查询失败", exc_info=True)
+        result.update(status="fail", error="数据库查询失败")
+    result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+def _check_upload_dir(directory: str, min_free_bytes: int) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"status": "ok"}
+    try:
+        # 实际创建文件，只读挂载等情况 os.access 无法发现
+        with tempfile.NamedTemporaryFile(dir=directory, prefix=".health-"):
+            pass
+        free = shutil.disk_usage(directory).free
+    except OSError:
+        logger.warning("就绪检查：上传目录 %s 不可写", directory, exc_info=True)
+        return {"status": "fail", "error": "上传目录不可写"}
+    result["free_mb"] = free // (1024 * 1024)
+    if free < min_free_bytes:
+        result.update(status="fail", error="上传目录剩余空间不足")
+    return result
+
+
+async def check_upload_dir() -> Dict[str, Any]:
+    return await run_in_threadpool(
+        _check_upload_dir, settings.upload_path, settings.HEALTH_MIN_FREE_MB * 1024 * 1024
+    )
+
+
+async def check_storage(backend: StorageBackend, timeout: float) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"status": "ok", "backend": backend.name}
+    try:
+        reachable = await asyncio.wait_for(backend.check(), timeout)
+    except asyncio.TimeoutError:
+        reachable = False
+    if not reachable:
+        result.update(status="degraded", error="存储后端不可达，上传将回退到本地存储")
+    return result
+
+
+class ReadinessChecker:
+    """就绪检查，结果缓存 ttl 秒"""
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._result: Optional[Dict[str, Any]] = None
+        self._expires_at = 0.0
+        self._inflight: Optional[asyncio.Task] = None
+
+    async def _run(self) -> Dict[str, Any]:
+        names = ["database", "uploads"]
+        checks = [check_database(engine, settings.HEALTH_DB_TIMEOUT), check_upload_dir()]
+        if read_engine is not None:
+            names.append("database_replica")
+            checks.append(check_database(read_engine, settings.HEALTH_DB_TIMEOUT))
+        if storage_backend is not local_storage:
+            names.append("storage")
+            checks.append(check_storage(storage_backend, settings.HEALTH_STORAGE_TIMEOUT))
+        results = dict(zip(names, await asyncio.gather(*checks)))
+        if "database_replica" in results and results["database_replica"]["status"] == "fail":
+            # 副本不可用时读请求回退主库
+            results["database_replica"]["status"] = "degraded"
+        for name, result in results.items():
+            if result["status"] != "ok":
+                logger.warning("就绪检查 %s: %s %s", name, result["status"], result)
+        status = max((r["status"] for r in results.values()), key=_SEVERITY.__getitem__)
+        return {
+            "status": status,
+            "checks": {name: {"status": result["status"]} for name, result in results.items()},
+            "checked_at": time.time(),
+        }
+
+    async def check(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        if self._result is not None and now < self._expires_at:
+            return self._result
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._run())
+        task = self._inflight
+        try:
+            result = await asyncio.shield(task)
+        finally:
+            if self._inflight is task and task.done():
+                self._inflight = None
+        self._result, self._expires_at = result, time.monotonic() + self.ttl
+        return result
+
+
+readiness_checker = ReadinessChecker(ttl=settings.HEALTH_CACHE_SECONDS)
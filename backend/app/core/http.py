@@ -0,0 +1,95 @@
+"""
+应用级共享的出站 HTTP 客户端
+
+整个进程复用一个 aiohttp 会话（连接池、DNS 缓存、TLS 会话），由应用 lifespan 负责启动和关闭；
+同时限制并发请求数，并对网络错误、超时以及 429/5xx 响应做指数退避重试。
+"""
+import asyncio
+import logging
+import random
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+import aiohttp
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class HTTPResult:
+    status: int
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class HTTPClient:
+    """共享的 aiohttp 会话"""
+
+    def __init__(self) -> None:
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def start(self) -> None:
+        if self._session is not None:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=settings.HTTP_POOL_SIZE, ttl_dns_cache=300, keepalive_timeout=30
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                total=settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(settings.HTTP_MAX_CONCURRENCY)
+
+    async def close(self) -> None:
+        session, self._session = self._session, None
+        if session is not None:
+            await session.close()
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        data_factory: Optional[Callable[[], Any]] = None,
+        retries: Optional[int] = None,
+        **kwargs: Any
+    ) -> HTTPResult:
+        """发送请求并读取完整响应体
+
+        data_factory 每次尝试都会被调用以生成新的请求体（文件流、FormData 等不能重复发送）。
+        """
+        # 未经 lifespan 启动时（例如命令行脚本）按需创建会话
+        await self.start()
+        retries = settings.HTTP_RETRIES if retries is None else retries
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    if data_factory is not None:
+                        kwargs["data"] = data_factory()
+                    async with self._session.request(method, url, **kwargs) as response:
+                        result = HTTPResult(
+                            status=response.status,
+                            body=await response.read(),
+                            headers=dict(response.headers),
+                        )
+                if result.status not in _RETRY_STATUSES or attempt >= retries:
+                    return result
+                logger.warning("%s %s 返回 %s，准备重试", method, url, result.status)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= retries:
+                    raise
+                logger.warning("%s %s 请求失败，准备重试: %r", method, url, e)
+            attempt += 1
+            backoff = settings.HTTP_RETRY_BACKOFF * (2 ** (attempt - 1))
+            await asyncio.sleep(backoff + random.uniform(0, backoff / 2))
+
+
+http_client = HTTPClient()
@@ -0,0 +1,200 @@
+"""
+上传图片的后台处理
+
+图片保存到本地后，在独立的进程池中生成多种宽度的缩放版本（WebP，Pillow 支持时另生成 AVIF），
+缩放版本不包含 EXIF 等元数据。生成结果写入与原图同名的 .variants.json 清单，
+接口据此返回 srcset 风格的响应式图片集合。Pillow 为可选依赖，未安装时跳过处理。
+"""
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import LRUTTLCache
+from app.core.config import settings
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - Pillow 为可选依赖
+    Image = None
+    ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_SUFFIX = ".variants.json"
+
+_FORMAT_EXTENSIONS = {"WEBP": "webp", "AVIF": "avif"}
+
+
+def _supported_formats() -> List[str]:
+    if Image is None:
+        return []
+    Image.init()
+    return [fmt for fmt in settings.IMAGE_VARIANT_FORMATS if fmt.upper() in Image.SAVE]
+
+
+def manifest_path(directory: str, filename: str) -> str:
+    return os.path.join(directory, os.path.splitext(filename)[0] + MANIFEST_SUFFIX)
+
+
+def generate_variants(
+    source: str, directory: str, widths: List[int], formats: List[str], quality: int
+) -> Dict[str, Any]:
+    """生成缩放版本并写入清单（在子进程中执行）"""
+    stem = os.path.splitext(os.path.basename(source))[0]
+    with Image.open(source) as original:
+        # 按 EXIF 方向旋转后再丢弃元数据
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+        source_width, source_height = image.size
+
+        # 不放大：只保留小于原图的宽度，并补充一个不超过最大宽度的原尺寸版本
+        targets = sorted({w for w in widths if w < source_width} | {min(source_width, max(widths))})
+        variants = []
+        for width in targets:
+            height = max(1, round(source_height * width / source_width))
+            resized = image if width == source_width else image.resize((width, height), Image.LANCZOS)
+            for fmt in formats:
+                ext = _FORMAT_EXTENSIONS.get(fmt.upper(), fmt.lower())
+                filename = f"{stem}-{width}.{ext}"
+                tmp_path = os.path.join(directory, f".{filename}.part")
+                resized.save(tmp_path, format=fmt.upper(), quality=quality)
+                os.replace(tmp_path, os.path.join(directory, filename))
+                variants.append({
+                    "filename": filename,
+                    "width": width,
+                    "height": height,
+                    "format": ext,
+                    "size": os.path.getsize(os.path.join(directory, filename)),
+                })
+
+    manifest = {"source": os.path.basename(source), "width": source_width, "height": source_height,
+                "variants": variants}
+    path = manifest_path(directory, os.path.basename(source))
+    with open(path + ".part", "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(path + ".part", path)
+    return manifest
+
+
+class ImageProcessor:
+    """图片处理进程池，任务在后台执行，上传接口无需等待"""
+
+    def __init__(self, max_workers: int, directory: str) -> None:
+        self.max_workers = max_workers
+        self.directory = directory
+        self.formats = _supported_formats()
+        self.enabled = settings.IMAGE_PROCESSING_ENABLED and bool(self.formats)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        # 清单查询缓存；尚未生成的清单只短暂缓存，处理完成后很快可见
+        self._manifests = LRUTTLCache(maxsize=settings.IMAGE_MANIFEST_CACHE_SIZE, ttl=300)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # 服务进程中存在其他线程，使用 spawn 避免 fork 继承锁状态
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def schedule(self, filename: str) -> None:
+        """为本地存储的图片安排后台处理"""
+        if not self.enabled:
+            return
+        self.submitted += 1
+        task = asyncio.get_running_loop().create_task(self._process(filename))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, filename: str) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            manifest = await loop.run_in_executor(
+                self._get_executor(),
+                generate_variants,
+                os.path.join(self.directory, filename),
+                self.directory,
+                settings.IMAGE_VARIANT_WIDTHS,
+                self.formats,
+                settings.IMAGE_VARIANT_QUALITY,
+            )
+        except Exception as e:
+            self.failed += 1
+            logger.warning("图片处理失败 %s: %r", filename, e)
+            return
+        self.completed += 1
+        self._manifests.pop(filename)
+        logger.info("图片处理完成 %s: %d 个版本", filename, len(manifest["variants"]))
+
+    def _read_manifests(self, filenames: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        # 在线程池中执行，只读文件；缓存由事件循环线程更新
+        manifests: Dict[str, Optional[Dict[str, Any]]] = {}
+        for filename in filenames:
+            try:
+                with open(manifest_path(self.directory, filename), encoding="utf-8") as f:
+                    manifests[filename] = json.load(f)
+            except (OSError, ValueError):
+                manifests[filename] = None
+        return manifests
+
+    async def manifests(self, filenames: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """批量读取图片的处理清单，尚未处理或处理失败的图片对应 None
+
+        未缓存的清单在一次线程池调用中读取，列表接口不会为每一行在事件循环上打开文件。
+        """
+        result: Dict[str, Optional[Dict[str, Any]]] = {}
+        missing: List[str] = []
+        for filename in dict.fromkeys(filenames):
+            cached = self._manifests.get(filename)
+            if cached is None:
+                missing.append(filename)
+            else:
+                result[filename] = cached or None
+        if missing:
+            loaded = await run_in_threadpool(self._read_manifests, missing)
+            for filename, manifest in loaded.items():
+                if manifest is None:
+                    self._manifests.set(filename, {}, ttl=5)
+                else:
+                    self._manifests.set(filename, manifest)
+                result[filename] = manifest
+        return result
+
+    async def manifest(self, filename: str) -> Optional[Dict[str, Any]]:
+        """读取单张图片的处理清单，尚未处理或处理失败时返回 None"""
+        return (await self.manifests([filename]))[filename]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "formats": self.formats,
+            "workers": self.max_workers,
+            "pending": len(self._tasks),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    async def shutdown(self) -> None:
+        # 等待进行中的任务完成，避免留下半成品文件
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+image_processor = ImageProcessor(
+    max_workers=settings.IMAGE_PROCESS_WORKERS, directory=settings.upload_path
+)
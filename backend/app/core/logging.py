@@ -0,0 +1,130 @@
+"""
+日志配置
+
+- 由 Settings 配置级别与格式：text（便于本地阅读）或 json（每行一个 JSON 对象，便于日志系统采集）
+- 每个请求分配请求 ID（沿用合法的 X-Request-ID 请求头或新生成），写入该请求期间的所有日志并回传给客户端
+- 逐条数据的调试日志带上 extra=SAMPLED，只按 LOG_SAMPLE_RATE 比例输出
+
+业务代码统一使用 logger.info("... %s", value) 的惰性格式化，级别未开启时不产生格式化开销。
+"""
+import json
+import logging
+import random
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# 逐条数据的调试日志使用 logger.debug(..., extra=SAMPLED)
+SAMPLED = {"sampled": True}
+
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+# LogRecord 自带的属性，其余属性视为 extra 字段输出
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class RequestContextFilter(logging.Filter):
+    """为日志记录附加当前请求 ID"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get() or "-"
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """按比例丢弃标记为 sampled 的日志记录"""
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "sampled", False):
+            return random.random() < self.rate
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """每条日志输出为一行 JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key not in entry and key != "sampled":
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging(level: str = "INFO", fmt: str = "text", sample_rate: float = 0.01) -> None:
+    """配置根日志器；uvicorn 的日志统一交给根日志器输出"""
+    handler = logging.StreamHandler(sys.stdout)
+    if fmt == "json":
+        handler.setFormatter(JSONFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(
+            "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
+        ))
+    handler.addFilter(RequestContextFilter())
+    handler.addFilter(SamplingFilter(sample_rate))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level.upper())
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        if name == "uvicorn.access" and not uvicorn_logger.handlers and not uvicorn_logger.propagate:
+            # uvicorn 以 access_log=False 启动时会清空处理器并关闭传播，保持关闭
+            continue
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
+
+
+class RequestIDMiddleware:
+    """为每个请求设置请求 ID，并通过 X-Request-ID 响应头返回"""
+
+    def __init__(self, app: ASGIApp, header_name: str = "X-Request-ID") -> None:
+        self.app = app
+        self.header_name = header_name
+        self._raw_header = header_name.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == self._raw_header:
+                candidate = value.decode("latin-1")
+                if _REQUEST_ID_PATTERN.match(candidate):
+                    request_id = candidate
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[self.header_name] = request_id
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
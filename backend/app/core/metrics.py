@@ -0,0 +1,359 @@
+"""
+请求级性能指标
+
+- MetricsMiddleware: 按路由统计请求数与延迟直方图，并记录每个请求内的数据库查询次数与耗时
+- instrument_engine: 通过 SQLAlchemy 事件统计查询耗时、连接池签出次数，超过阈值的查询记录慢查询日志
+- 连接池、密码哈希线程池等运行时状态在抓取时通过 collector 回调读取
+- render() 输出 Prometheus 文本格式（/metrics）
+
+指标保存在进程内，多 worker 部署时每个 worker 各自暴露。
+/metrics 只允许 METRICS_ALLOW_IPS 中的地址或携带 METRICS_TOKEN 的请求访问。
+"""
+import hmac
+import ipaddress
+import logging
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def set(self, *labels: str, value: float) -> None:
+        """直接写入当前值（用于由其他组件累计、抓取时同步的数据）"""
+        self._values[labels] = value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.type}"
+        for labels, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # 每组标签: [各桶计数..., 总和, 总数]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, *labels: str, value: float) -> None:
+        series = self._values.get(labels)
+        if series is None:
+            series = self._values[labels] = [0] * len(self.buckets) + [0.0, 0]
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[index] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, series in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = _format_labels(self.labelnames, labels, f'le="{_format_value(float(bound))}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+            le = _format_labels(self.labelnames, labels, 'le="+Inf"')
+            yield f"{self.name}_bucket{le} {series[-1]}"
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(float(series[-2]))}"
+            yield f"{self.name}_count{label_text} {series[-1]}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List[Any] = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: Any) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """抓取前调用的回调，用于把运行时状态写入 Gauge"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.warning("指标收集失败: %r", e)
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP 请求数", ("method", "route", "status")
+))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP 请求处理耗时", ("method", "route")
+))
+http_requests_in_progress = registry.register(Gauge(
+    "http_requests_in_progress", "正在处理的 HTTP 请求数"
+))
+db_queries_per_request = registry.register(Histogram(
+    "http_request_db_queries", "每个请求执行的数据库查询数", ("route",), COUNT_BUCKETS
+))
+db_time_per_request = registry.register(Histogram(
+    "http_request_db_seconds", "每个请求的数据库查询总耗时", ("route",), LATENCY_BUCKETS
+))
+db_query_duration = registry.register(Histogram(
+    "db_query_duration_seconds", "数据库查询耗时", ("engine", "operation"), QUERY_BUCKETS
+))
+db_slow_queries_total = registry.register(Counter(
+    "db_slow_queries_total", "超过慢查询阈值的查询数", ("engine",)
+))
+db_pool_checkouts_total = registry.register(Counter(
+    "db_pool_checkouts_total", "连接池签出次数", ("engine",)
+))
+db_pool_connections = registry.register(Gauge(
+    "db_pool_connections", "连接池连接数", ("engine", "state")
+))
+password_hash_tasks_total = registry.register(Counter(
+    "password_hash_tasks_total", "密码哈希线程池任务数", ("state",)
+))
+password_hash_pending = registry.register(Gauge(
+    "password_hash_pending", "密码哈希线程池排队（含计算中）的任务数"
+))
+password_hash_seconds_total = registry.register(Counter(
+    "password_hash_seconds_total", "密码哈希任务累计排队/计算耗时", ("phase",)
+))
+password_hash_wait_max = registry.register(Gauge(
+    "password_hash_wait_max_seconds", "密码哈希任务最长排队耗时"
+))
+
+
+@dataclass
+class RequestStats:
+    """单个请求内的数据库统计"""
+    db_queries: int = 0
+    db_seconds: float = 0.0
+
+
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def instrument_engine(target: AsyncEngine, name: str, slow_query_ms: float) -> None:
+    """为引擎注册查询计时与连接池签出事件"""
+    sync_engine = target.sync_engine
+    threshold = slow_query_ms / 1000
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+        db_query_duration.observe(name, operation, value=elapsed)
+        stats = request_stats.get()
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_seconds += elapsed
+        if threshold and elapsed >= threshold:
+            db_slow_queries_total.inc(name)
+            logger.warning(
+                "慢查询 %.1fms [%s]: %s", elapsed * 1000, name, " ".join(statement.split())[:500],
+                extra={"duration_ms": round(elapsed * 1000, 1), "engine": name}
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context):
+        # 出错的查询不会触发 after_cursor_execute，这里清理计时栈
+        if context.connection is not None and context.connection.info.get("query_start"):
+            context.connection.info["query_start"].pop()
+
+    @event.listens_for(sync_engine.pool, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        db_pool_checkouts_total.inc(name)
+
+
+def _route_label(scope: Scope) -> str:
+    """用路由模板（如 /api/v1/news/{id}）作为标签，避免路径参数导致标签数量无限增长"""
+    app = scope.get("app")
+    for route in getattr(app, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "<unmatched>"
+
+
+class MetricsMiddleware:
+    """记录请求延迟、状态码与请求内的数据库统计，并输出慢请求日志"""
+
+    def __init__(self, app: ASGIApp, slow_request_ms: float = 0) -> None:
+        self.app = app
+        self.slow_request = slow_request_ms / 1000
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        streaming = False
+        stats = RequestStats()
+        # Mount 会改写 scope 中的 path，路由匹配使用请求进入时的副本
+        route_scope = dict(scope)
+        token = request_stats.set(stats)
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                streaming = any(
+                    name == b"content-type" and value.startswith(b"text/event-stream")
+                    for name, value in message["headers"]
+                )
+            await send(message)
+
+        started = time.perf_counter()
+        http_requests_in_progress.inc(amount=1)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_progress.inc(amount=-1)
+            request_stats.reset(token)
+            method = scope["method"]
+            route = _route_label(route_scope)
+            http_requests_total.inc(method, route, str(status_code))
+            http_request_duration.observe(method, route, value=elapsed)
+            db_queries_per_request.observe(route, value=stats.db_queries)
+            db_time_per_request.observe(route, value=stats.db_seconds)
+            # 事件推送等长连接的耗时取决于客户端在线时长，不记录慢请求
+            if self.slow_request and elapsed >= self.slow_request and not streaming:
+                logger.warning(
+                    "慢请求 %.1fms %s %s -> %s (数据库查询 %d 次, %.1fms)",
+                    elapsed * 1000, method, scope["path"], status_code,
+                    stats.db_queries, stats.db_seconds * 1000,
+                    extra={
+                        "duration_ms": round(elapsed * 1000, 1),
+                        "route": route,
+                        "status": status_code,
+                        "db_queries": stats.db_queries,
+                        "db_ms": round(stats.db_seconds * 1000, 1),
+                    }
+                )
+
+
+def collect_pool(name: str, stats: Callable[[], Dict[str, Any]]) -> Callable[[], None]:
+    """生成读取连接池状态的 collector"""
+    def collector() -> None:
+        values = stats()
+        for state in ("size", "checked_in", "checked_out", "overflow"):
+            if state in values:
+                db_pool_connections.set(name, state, value=values[state])
+    return collector
+
+
+def collect_password_pool(stats: Callable[[], Dict[str, Any]]) -> Callable[[], None]:
+    """生成读取密码哈希线程池状态的 collector"""
+    def collector() -> None:
+        values = stats()
+        for state in ("submitted", "completed", "rejected"):
+            password_hash_tasks_total.set(state, value=values[state])
+        password_hash_pending.set(value=values["pending"])
+        password_hash_seconds_total.set("wait", value=values["wait_seconds_total"])
+        password_hash_seconds_total.set("run", value=values["run_seconds_total"])
+        password_hash_wait_max.set(value=values["wait_seconds_max"])
+    return collector
+
+
+@lru_cache(maxsize=8)
+def _parse_networks(allow_ips: str) -> Tuple[Any, ...]:
+    networks = []
+    for item in allow_ips.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            networks.append(ipaddress.ip_network(item, strict=False))
+        except ValueError:
+            logger.warning("METRICS_ALLOW_IPS 中的地址无效，已忽略: %s", item)
+    return tuple(networks)
+
+
+def metrics_access_allowed(
+    client_host: Optional[str], authorization: Optional[str], allow_ips: str, token: Optional[str]
+) -> bool:
+    """判断请求能否读取 /metrics：携带正确的 Bearer 令牌，或客户端地址在允许列表中（* 表示全部）"""
+    if token and authorization:
+        scheme, _, credentials = authorization.partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(credentials.strip(), token):
+            return True
+    if allow_ips.strip() == "*":
+        return True
+    if not client_host:
+        return False
+    try:
+        address = ipaddress.ip_address(client_host)
+    except ValueError:
+        return False
+    return any(address in network for network in _parse_networks(allow_ips))
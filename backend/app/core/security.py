@@ -1,12 +1,112 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 修改 BCRYPT_ROUNDS 后，旧哈希会在用户下次登录时自动重新计算
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+
+class PasswordHasherBusy(Exception):
+    """密码计算排队已满"""
+
+
+def _timed(func: Callable[..., Any], *args: Any) -> Tuple[Any, float, float]:
+    started = time.perf_counter()
+    result = func(*args)
+    return result, started, time.perf_counter()
+
+
+class PasswordWorkerPool:
+    """bcrypt 计算专用线程池
+
+    bcrypt 在计算时会释放 GIL，放到独立线程池中既不阻塞事件循环，也不占用默认线程池；
+    排队（含正在计算）的任务数超过上限时直接拒绝，避免登录洪峰无限堆积。
+    """
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.run_seconds_total = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password"
+            )
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """在线程池中执行 func，并记录排队与计算耗时
+
+        调用方被取消时已开始的计算仍会执行完，名额在线程池任务结束（或排队中被取消）时才释放。
+        """
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusy()
+            self.pending += 1
+            self.submitted += 1
+        queued = time.perf_counter()
+        try:
+            future = self._get_executor().submit(_timed, func, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        result, started, finished = await asyncio.wrap_future(future)
+        wait = started - queued
+        self.completed += 1
+        self.wait_seconds_total += wait
+        self.wait_seconds_max = max(self.wait_seconds_max, wait)
+        self.run_seconds_total += finished - started
+        return result
+
+    def _release(self, future: Optional[Future] = None) -> None:
+        # 完成回调在线程池线程中执行
+        with self._lock:
+            self.pending -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+            "run_seconds_total": round(self.run_seconds_total, 6),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_pool = PasswordWorkerPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
 
 
 def create_access_token(
@@ -31,4 +131,16 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """获取密码哈希"""
-    return pwd_context.hash(password)
\ No newline at end of file
+    return pwd_context.hash(password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """在密码线程池中验证密码；哈希参数已变化时同时返回新的哈希，否则为 None"""
+    return await password_pool.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """在密码线程池中计算密码哈希"""
+    return await password_pool.run(pwd_context.hash, password)
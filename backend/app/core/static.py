@@ -0,0 +1,199 @@
+"""
+/uploads 静态文件服务
+
+- 以内容哈希命名的文件（上传原图及其缩放版本）内容永不改变，返回 immutable 长期缓存头
+- 支持 ETag / Last-Modified 条件请求（304）与单区间 Range 请求（206）
+- 存在预压缩的 .br / .gz 文件且客户端支持时直接返回压缩版本
+- UPLOADS_SERVE_MODE 为 x-accel / x-sendfile 时只返回响应头，由前置的 nginx 等服务器发送文件内容
+"""
+import os
+import re
+from mimetypes import guess_type
+from email.utils import formatdate
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from fastapi import Request
+from fastapi.staticfiles import StaticFiles
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from app.api.conditional import is_not_modified, not_modified_response
+
+IMMUTABLE_NAME = re.compile(r"^[0-9a-f]{64}(-\d+)?\.[0-9A-Za-z]+$")
+
+_PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+class RangeFileResponse(FileResponse):
+    """只发送文件中指定区间的 FileResponse"""
+
+    def __init__(self, path: str, start: int, end: int, **kwargs) -> None:
+        super().__init__(path, status_code=206, **kwargs)
+        self.start = start
+        self.end = end
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if self.send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        remaining = self.end - self.start + 1
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            # 文件在发送过程中被截断
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def parse_range(value: str, size: int) -> Optional[Tuple[int, int]]:
+    """解析单区间 Range 头，返回 (start, end)；多区间或格式错误时返回 None（按完整响应处理）
+
+    区间无法满足时抛出 ValueError。
+    """
+    unit, _, spec = value.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # bytes=-N 表示最后 N 个字节
+            suffix = int(last)
+            if suffix <= 0:
+                raise ValueError("empty suffix range")
+            start, end = max(size - suffix, 0), size - 1
+    except ValueError:
+        if first.isdigit() or last.isdigit():
+            raise
+        return None
+    if start >= size:
+        raise ValueError("range not satisfiable")
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+class UploadsStaticFiles(StaticFiles):
+    """上传目录的静态文件服务"""
+
+    def __init__(
+        self,
+        *,
+        directory: str,
+        mode: str = "direct",
+        accel_prefix: str = "/_uploads/",
+        max_age: int = 31536000
+    ) -> None:
+        super().__init__(directory=directory)
+        self.root = os.path.realpath(directory)
+        self.mode = mode
+        self.accel_prefix = accel_prefix.rstrip("/") + "/"
+        self.max_age = max_age
+
+    def _cache_headers(self, name: str, stat_result: os.stat_result) -> Dict[str, str]:
+        stem = os.path.splitext(name)[0]
+        if IMMUTABLE_NAME.match(name):
+            # 文件名即内容哈希，ETag 直接使用哈希
+            etag = stem
+            cache_control = f"public, max-age={self.max_age}, immutable"
+        else:
+            etag = f"{int(stat_result.st_mtime_ns):x}-{stat_result.st_size:x}"
+            cache_control = "public, no-cache"
+        return {
+            "ETag": f'"{etag}"',
+            "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+            "Cache-Control": cache_control,
+            "Accept-Ranges": "bytes",
+        }
+
+    def file_response(
+        self,
+        full_path: str,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        name = os.path.basename(full_path)
+        # 不对外提供上传中的临时文件等隐藏文件
+        if name.startswith("."):
+            raise HTTPException(status_code=404)
+
+        request = Request(scope)
+        headers = self._cache_headers(name, stat_result)
+        media_type = guess_type(name)[0] or "application/octet-stream"
+        method = scope["method"]
+
+        # x-accel 只对经过 nginx 代理（带 X-Sendfile-Type 请求头）的请求生效，直接访问后端时仍正常发送文件
+        offload = self.mode == "x-sendfile" or (
+            self.mode == "x-accel"
+            and request.headers.get("x-sendfile-type", "").lower() == "x-accel-redirect"
+        )
+
+        # 预压缩版本（例如 .svg.br、.json.gz）；由前置服务器发送时交给其 gzip_static 等机制处理
+        encoded_path = None
+        if not offload:
+            accept_encoding = request.headers.get("accept-encoding", "")
+            for encoding, suffix in _PRECOMPRESSED:
+                if encoding in accept_encoding and os.path.isfile(full_path + suffix):
+                    encoded_path = full_path + suffix
+                    headers.update({
+                        "ETag": headers["ETag"][:-1] + f'-{encoding}"',
+                        "Content-Encoding": encoding,
+                        "Vary": "Accept-Encoding",
+                    })
+                    del headers["Accept-Ranges"]
+                    break
+
+        if is_not_modified(request, headers):
+            return not_modified_response(headers)
+
+        if offload and self.mode == "x-accel":
+            relative = os.path.relpath(os.path.realpath(full_path), self.root)
+            headers["X-Accel-Redirect"] = quote(self.accel_prefix + relative.replace(os.sep, "/"))
+            return Response(status_code=200, headers=headers, media_type=media_type)
+        if offload:
+            headers["X-Sendfile"] = os.path.realpath(full_path)
+            return Response(status_code=200, headers=headers, media_type=media_type)
+
+        if encoded_path is not None:
+            return FileResponse(encoded_path, headers=headers, media_type=media_type, method=method)
+
+        range_header = request.headers.get("range")
+        if_range = request.headers.get("if-range")
+        if range_header and (if_range is None or if_range in (headers["ETag"], headers["Last-Modified"])):
+            size = stat_result.st_size
+            try:
+                byte_range = parse_range(range_header, size)
+            except ValueError:
+                return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+            if byte_range is not None:
+                start, end = byte_range
+                headers.update({
+                    "Content-Range": f"bytes {start}-{end}/{size}",
+                    "Content-Length": str(end - start + 1),
+                })
+                return RangeFileResponse(
+                    full_path, start, end, headers=headers, media_type=media_type, method=method
+                )
+
+        return FileResponse(
+            full_path,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            stat_result=stat_result,
+            method=method,
+        )
@@ -0,0 +1,247 @@
+"""
+图片存储后端
+
+- local: 保存到上传目录，由 /uploads 提供访问
+- imgbb: 上传到 ImgBB 图床
+- s3: 上传到 S3 兼容的对象存储（AWS S3、MinIO、R2 等），使用 SigV4 签名
+
+远程后端都通过共享的 http_client 发送请求，文件内容直接从暂存文件流式发送，不在内存中整体编码。
+"""
+import hashlib
+import hmac
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Optional
+from urllib.parse import quote, urlparse
+
+import aiohttp
+
+from app.core.config import settings
+from app.core.http import http_client
+from app.core.uploads import StagedUpload, commit_upload
+
+logger = logging.getLogger(__name__)
+
+
+class StorageError(Exception):
+    """存储后端保存失败"""
+
+
+class StorageBackend:
+    """存储后端接口"""
+
+    name = ""
+
+    async def save(self, staged: StagedUpload, filename: str, content_type: Optional[str]) -> str:
+        """保存暂存文件，返回写入 image_url 的位置（本地为相对文件名，远程为完整 URL）"""
+        raise NotImplementedError
+
+    async def exists(self, location: str) -> bool:
+        """已索引的内容是否仍然可用"""
+        return True
+
+    async def check(self) -> bool:
+        """后端是否可达，用于健康检查"""
+        return True
+
+
+class LocalStorage(StorageBackend):
+    """本地文件系统存储"""
+
+    name = "local"
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    async def save(self, staged: StagedUpload, filename: str, content_type: Optional[str]) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            await commit_upload(staged, os.path.join(self.directory, filename))
+        except OSError as e:
+            raise StorageError(f"本地保存失败: {e}") from e
+        return filename
+
+    async def exists(self, location: str) -> bool:
+        return os.path.exists(os.path.join(self.directory, location))
+
+    async def check(self) -> bool:
+        return os.path.isdir(self.directory) and os.access(self.directory, os.W_OK)
+
+
+class ImgBBStorage(StorageBackend):
+    """ImgBB 图床"""
+
+    name = "imgbb"
+
+    def __init__(self, api_key: str, api_url: str) -> None:
+        self.api_key = api_key
+        self.api_url = api_url
+
+    async def save(self, staged: StagedUpload, filename: str, content_type: Optional[str]) -> str:
+        files = []
+
+        def form() -> aiohttp.FormData:
+            # 以文件方式发送二进制内容，避免 base64 编码整张图片
+            f = open(staged.path, "rb")
+            files.append(f)
+            data = aiohttp.FormData()
+            data.add_field("name", os.path.splitext(filename)[0])
+            data.add_field(
+                "image", f, filename=filename, content_type=content_type or "application/octet-stream"
+            )
+            return data
+
+        try:
+            result = await http_client.request(
+                "POST", self.api_url, params={"key": self.api_key}, data_factory=form
+            )
+        except (aiohttp.ClientError, TimeoutError) as e:
+            raise StorageError(f"ImgBB 请求失败: {e!r}") from e
+        finally:
+            for f in files:
+                f.close()
+
+        if result.status != 200:
+            raise StorageError(f"ImgBB 返回 {result.status}: {result.body[:200]!r}")
+        try:
+            payload = json.loads(result.body)
+        except ValueError as e:
+            raise StorageError("ImgBB 返回了无法解析的响应") from e
+        if not payload.get("success"):
+            raise StorageError(f"ImgBB 上传失败: {payload.get('error')}")
+        return payload["data"]["url"]
+
+    async def check(self) -> bool:
+        try:
+            result = await http_client.request("HEAD", self.api_url, retries=0)
+        except (aiohttp.ClientError, TimeoutError):
+            return False
+        return result.status < 500
+
+
+def _sign(key: bytes, message: str) -> bytes:
+    return hmac.new(key, message.encode("utf-8"), hashlib.sha256).digest()
+
+
+class S3Storage(StorageBackend):
+    """S3 兼容对象存储（路径风格地址）"""
+
+    name = "s3"
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        bucket: str,
+        access_key: str,
+        secret_key: str,
+        region: str,
+        public_url: Optional[str] = None,
+        prefix: str = "",
+    ) -> None:
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.public_url = (public_url or f"{self.endpoint_url}/{bucket}").rstrip("/")
+        self.prefix = prefix
+
+    def _signed_headers(self, method: str, path: str, payload_hash: str, headers: dict) -> dict:
+        """生成 AWS Signature Version 4 请求头"""
+        now = datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        date_stamp = now.strftime("%Y%m%d")
+        headers = {
+            **{k.lower(): v for k, v in headers.items()},
+            "host": urlparse(self.endpoint_url).netloc,
+            "x-amz-date": amz_date,
+            "x-amz-content-sha256": payload_hash,
+        }
+        signed_names = ";".join(sorted(headers))
+        canonical_headers = "".join(f"{name}:{str(headers[name]).strip()}\n" for name in sorted(headers))
+        canonical_request = "\n".join([method, path, "", canonical_headers, signed_names, payload_hash])
+        scope = f"{date_stamp}/{self.region}/s3/aws4_request"
+        string_to_sign = "\n".join([
+            "AWS4-HMAC-SHA256",
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+        ])
+        key = _sign(f"AWS4{self.secret_key}".encode("utf-8"), date_stamp)
+        for part in (self.region, "s3", "aws4_request"):
+            key = _sign(key, part)
+        signature = hmac.new(key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+        headers["authorization"] = (
+            f"AWS4-HMAC-SHA256 Credential={self.access_key}/{scope}, "
+            f"SignedHeaders={signed_names}, Signature={signature}"
+        )
+        return headers
+
+    async def save(self, staged: StagedUpload, filename: str, content_type: Optional[str]) -> str:
+        key = f"{self.prefix}{filename}"
+        path = quote(f"/{self.bucket}/{key}")
+        files = []
+
+        def body():
+            f = open(staged.path, "rb")
+            files.append(f)
+            return f
+
+        # 暂存时已计算的 SHA-256 直接作为签名中的负载哈希
+        headers = self._signed_headers("PUT", path, staged.sha256, {
+            "content-type": content_type or "application/octet-stream",
+            "content-length": str(staged.size),
+            # 文件名即内容哈希，可以永久缓存
+            "cache-control": "public, max-age=31536000, immutable",
+        })
+        try:
+            result = await http_client.request(
+                "PUT", f"{self.endpoint_url}{path}", headers=headers, data_factory=body
+            )
+        except (aiohttp.ClientError, TimeoutError) as e:
+            raise StorageError(f"S3 请求失败: {e!r}") from e
+        finally:
+            for f in files:
+                f.close()
+        if result.status not in (200, 201):
+            raise StorageError(f"S3 返回 {result.status}: {result.body[:200]!r}")
+        return f"{self.public_url}/{quote(key)}"
+
+    async def check(self) -> bool:
+        path = quote(f"/{self.bucket}")
+        headers = self._signed_headers("HEAD", path, hashlib.sha256(b"").hexdigest(), {})
+        try:
+            result = await http_client.request(
+                "HEAD", f"{self.endpoint_url}{path}", headers=headers, retries=0
+            )
+        except (aiohttp.ClientError, TimeoutError):
+            return False
+        return result.status < 400
+
+
+def _create_storage_backend() -> StorageBackend:
+    """根据配置选择图片存储后端"""
+    name = settings.STORAGE_BACKEND
+    if name == "auto":
+        name = "imgbb" if settings.USE_THIRD_PARTY_STORAGE and settings.IMGBB_API_KEY else "local"
+    if name == "imgbb" and settings.IMGBB_API_KEY:
+        return ImgBBStorage(settings.IMGBB_API_KEY, settings.IMGBB_API_URL)
+    if name == "s3" and settings.S3_BUCKET:
+        return S3Storage(
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            bucket=settings.S3_BUCKET,
+            access_key=settings.S3_ACCESS_KEY,
+            secret_key=settings.S3_SECRET_KEY,
+            region=settings.S3_REGION,
+            public_url=settings.S3_PUBLIC_URL,
+            prefix=settings.S3_PREFIX,
+        )
+    if name != "local":
+        logger.warning("存储后端 %s 未正确配置，使用本地存储", name)
+    return local_storage
+
+
+local_storage = LocalStorage(settings.upload_path)
+storage_backend = _create_storage_backend()
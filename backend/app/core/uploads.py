@@ -0,0 +1,156 @@
+"""
+图片上传的流式处理
+
+上传内容按块读取并写入上传目录下的临时文件，同时计算 SHA-256 并检查大小，
+全部写完后再原子地重命名为最终文件名；任何时刻内存中只保留一个分块。
+"""
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CHUNK_SIZE = 64 * 1024
+
+# multipart 边界与表单头的额外开销
+_MULTIPART_OVERHEAD = 16 * 1024
+
+
+def _default_file_mode() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# mkstemp 创建的文件权限为 0600，提交后由 nginx（x-accel）等其他用户读取时会 403，
+# 改为与普通 open() 创建文件相同的权限
+_FILE_MODE = _default_file_mode()
+
+
+class UploadTooLarge(Exception):
+    """上传内容超出大小限制"""
+
+
+@dataclass
+class StagedUpload:
+    """已写入临时文件、尚未提交的上传内容"""
+    path: str
+    size: int
+    sha256: str
+
+
+async def stage_upload(upload: UploadFile, directory: str, max_size: int) -> StagedUpload:
+    """分块读取上传内容写入临时文件，边读边计算哈希；超出 max_size 时立即中止"""
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+    os.fchmod(fd, _FILE_MODE)
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            while True:
+                chunk = await upload.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLarge()
+                hasher.update(chunk)
+                # 磁盘写入放到线程池，不阻塞事件循环
+                await run_in_threadpool(f.write, chunk)
+    except BaseException:
+        discard_staged(tmp_path)
+        raise
+    return StagedUpload(path=tmp_path, size=size, sha256=hasher.hexdigest())
+
+
+async def commit_upload(staged: StagedUpload, final_path: str) -> None:
+    """将临时文件原子地重命名为最终文件"""
+    await run_in_threadpool(os.replace, staged.path, final_path)
+
+
+async def read_staged(staged: StagedUpload) -> bytes:
+    """读取临时文件内容（大小已受限）"""
+    def _read() -> bytes:
+        with open(staged.path, "rb") as f:
+            return f.read()
+    return await run_in_threadpool(_read)
+
+
+def discard_staged(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class UploadSizeLimitMiddleware:
+    """在解析 multipart 之前限制上传请求体大小
+
+    Starlette 会先把整个表单读入临时文件再调用接口，这里按 Content-Length 提前拒绝，
+    对分块传输的请求则在接收过程中计数，超出后立即返回 413。
+    """
+
+    def __init__(self, app: ASGIApp, path_suffix: str, max_size: int) -> None:
+        self.app = app
+        self.path_suffix = path_suffix
+        self.max_body = max_size + _MULTIPART_OVERHEAD
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].endswith(self.path_suffix):
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length" and value.isdigit() and int(value) > self.max_body:
+                await self._reject(send)
+                return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body:
+                    exceeded = True
+                    raise UploadTooLarge()
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            # 超限后框架会把解析异常转换成 400 等响应，这里统一替换为 413
+            if exceeded:
+                if message["type"] == "http.response.start" and not response_started:
+                    response_started = True
+                    await self._reject(send)
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except UploadTooLarge:
+            if not response_started:
+                await self._reject(send)
+
+    @staticmethod
+    async def _reject(send: Send) -> None:
+        body = '{"detail":"上传文件过大"}'.encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
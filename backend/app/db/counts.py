@@ -0,0 +1,118 @@
+"""
+新闻列表总数统计策略
+
+- exact: 每次执行 COUNT
+- cached: COUNT 结果按查询缓存 NEWS_COUNT_CACHE_TTL 秒。缓存放在新闻响应缓存的后端中，键包含列表代数，
+  新增、删除、恢复以及修改标题/描述（会改变总数的写操作）都会递增代数，配置 CACHE_REDIS_URL 时所有 worker 共享；
+  未配置时每个 worker 各自缓存，其他 worker 的写入要等 TTL 过期后才反映到总数上。响应缓存关闭时使用进程内缓存
+- estimated: PostgreSQL 下使用规划器统计信息（pg_class.reltuples 与 deleted_at 的 null_frac）估算；
+  带检索条件、估算值过小或非 PostgreSQL 时退回 cached
+"""
+import hashlib
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import Select, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.news_cache import NewsResponseCache, news_cache
+from app.core.config import settings
+from app.models.news import News
+
+logger = logging.getLogger(__name__)
+
+# 缓存的不同查询（主要是不同检索词）数量上限
+_CACHE_MAX_ENTRIES = 1024
+
+
+class NewsCounter:
+    """新闻总数统计，策略由 NEWS_COUNT_STRATEGY 决定"""
+
+    def __init__(self, shared: NewsResponseCache) -> None:
+        self.shared = shared
+        # 响应缓存关闭时使用的进程内缓存
+        self._cache: Dict[Tuple[str, str], Tuple[float, int]] = {}
+
+    def invalidate(self) -> None:
+        """新闻发生写操作后清空进程内缓存的总数（共享缓存随列表代数失效）"""
+        self._cache.clear()
+
+    async def count(
+        self,
+        db: AsyncSession,
+        query: Select,
+        *,
+        searching: bool = False,
+        include_deleted: bool = False
+    ) -> int:
+        """统计查询（未分页、未排序）匹配的新闻数量"""
+        strategy = settings.NEWS_COUNT_STRATEGY
+        if strategy == "estimated" and not searching:
+            estimate = await self._estimate(db, include_deleted)
+            if estimate is not None and estimate >= settings.NEWS_COUNT_ESTIMATE_MIN:
+                return estimate
+            strategy = "cached"
+
+        count_query = query.with_only_columns(func.count(News.id)).order_by(None)
+        if strategy != "cached":
+            return (await db.execute(count_query)).scalar()
+
+        compiled = count_query.compile()
+        key = (str(compiled), repr(sorted(compiled.params.items())))
+        # 先读代数再统计：统计期间发生的写操作会递增代数，旧结果写在旧代数下，不会被读到
+        generation = await self.shared.generation()
+        if generation is not None:
+            digest = hashlib.sha256("|".join(key).encode("utf-8")).hexdigest()[:32]
+            return await self._shared_count(db, count_query, f"news:count:{generation}:{digest}")
+
+        now = time.monotonic()
+        cached = self._cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+        total = (await db.execute(count_query)).scalar()
+        if len(self._cache) >= _CACHE_MAX_ENTRIES:
+            # 淘汰最早写入的条目
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[key] = (now + settings.NEWS_COUNT_CACHE_TTL, total)
+        return total
+
+    async def _shared_count(self, db: AsyncSession, count_query: Select, key: str) -> int:
+        backend = self.shared.backend
+        try:
+            cached = await backend.get(key)
+        except Exception as e:
+            logger.warning("读取总数缓存失败: %s", e)
+            cached = None
+        if cached is not None:
+            return int(cached)
+        total = (await db.execute(count_query)).scalar()
+        try:
+            await backend.set(key, str(total).encode("ascii"), settings.NEWS_COUNT_CACHE_TTL)
+        except Exception as e:
+            logger.warning("写入总数缓存失败: %s", e)
+        return total
+
+    async def _estimate(self, db: AsyncSession, include_deleted: bool) -> Optional[int]:
+        """根据 PostgreSQL 统计信息估算行数，无可用统计时返回 None"""
+        if db.bind.dialect.name != "postgresql":
+            return None
+        result = await db.execute(text(
+            "SELECT c.reltuples, s.null_frac "
+            "FROM pg_class c "
+            "LEFT JOIN pg_stats s ON s.tablename = c.relname AND s.attname = 'deleted_at' "
+            "AND s.schemaname = current_schema() "
+            "WHERE c.oid = to_regclass('news')"
+        ))
+        row = result.first()
+        # reltuples < 0 表示表从未被 ANALYZE
+        if not row or row.reltuples is None or row.reltuples < 0:
+            return None
+        if include_deleted:
+            return int(row.reltuples)
+        if row.null_frac is None:
+            return None
+        return int(row.reltuples * row.null_frac)
+
+
+news_counter = NewsCounter(news_cache)
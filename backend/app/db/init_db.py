@@ -1,22 +1,76 @@
+import logging
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
-from app.core.security import get_password_hash
+from app.core.config import settings
+from app.core.security import get_password_hash_async
 from app.models.user import User
 from app.models.news import News
-from app.db.base import Base
+from app.db.search import search_backend
 from app.db.session import engine
 
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "alembic.ini")
+
+# 最初版本由 create_all 建好的结构；之后的迁移可以在任意版本 create_all 建好的数据库上重复执行
+BASELINE_REVISION = "0001"
+
+# 多个进程同时启动时，PostgreSQL 上用会话级咨询锁保证迁移串行执行
+_MIGRATION_LOCK_ID = 0x6E657773
+
+
+def _run_migrations(conn) -> None:
+    """在已打开的连接上执行 alembic 迁移到最新版本"""
+    cfg = Config(ALEMBIC_INI)
+    cfg.attributes["connection"] = conn
+    tables = set(inspect(conn).get_table_names())
+    if "alembic_version" not in tables and "news" in tables:
+        logger.info("数据库由 create_all 创建，标记为基线版本 %s", BASELINE_REVISION)
+        command.stamp(cfg, BASELINE_REVISION)
+    # inspect 触发了自动开启的事务，交给 alembic 之前先结束
+    conn.commit()
+    command.upgrade(cfg, "head")
+
+
+async def migrate() -> None:
+    """执行迁移并创建全文检索结构"""
+    async with engine.connect() as conn:
+        locked = conn.dialect.name == "postgresql"
+        if locked:
+            await conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": _MIGRATION_LOCK_ID})
+            await conn.commit()
+        try:
+            await conn.run_sync(_run_migrations)
+            # 全文检索结构不在模型中，由检索后端创建并回填
+            await search_backend.setup(conn)
+            await conn.commit()
+        finally:
+            if locked:
+                await conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": _MIGRATION_LOCK_ID})
+                await conn.commit()
+
 
 async def init_db() -> None:
     """初始化数据库"""
-    # 创建所有表
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    
-    # 预先计算密码哈希（在异步上下文外）
-    admin_password_hash = get_password_hash("admin123")
-    
+    if settings.DB_INIT_MODE == "skip":
+        # 不执行 DDL，只确认检索后端需要的结构是否存在
+        async with engine.connect() as conn:
+            await search_backend.detect(conn)
+        logger.info("跳过数据库初始化（DB_INIT_MODE=skip）")
+        return
+
+    await migrate()
+    if settings.DB_SEED:
+        await seed()
+
+
+async def seed() -> None:
+    """创建默认管理员用户与示例新闻"""
     # 创建默认管理员用户
     async with AsyncSession(engine) as session:
         # 检查是否已存在管理员用户
@@ -29,15 +83,15 @@ async def init_db() -> None:
             admin_user = User(
                 username="admin",
                 email="admin@feednews.com",
-                hashed_password=admin_password_hash,
+                hashed_password=await get_password_hash_async("admin123"),
                 is_admin=True
             )
             session.add(admin_user)
             await session.commit()
             await session.refresh(admin_user)
-            print("默认管理员用户已创建: admin / admin123")
+            logger.info("默认管理员用户已创建: admin / admin123")
         else:
-            print("管理员用户已存在")
+            logger.info("管理员用户已存在")
         
         # 创建一些示例新闻
         result = await session.execute(select(News))
@@ -86,7 +140,10 @@ async def init_db() -> None:
             for news in sample_news:
                 session.add(news)
             
+            await session.flush()
+            for news in sample_news:
+                await search_backend.index(session, news)
             await session.commit()
-            print(f"已创建 {len(sample_news)} 条示例新闻")
+            logger.info("已创建 %d 条示例新闻", len(sample_news))
         else:
-            print("示例新闻已存在")
\ No newline at end of file
+            logger.info("示例新闻已存在")
\ No newline at end of file
@@ -0,0 +1,233 @@
+"""
+新闻全文检索后端
+
+- like: 双通配符 ILIKE，无需额外索引（兜底实现）
+- sqlite_fts: SQLite FTS5 虚拟表，用于本地开发
+- postgres: tsvector 列 + GIN 索引，按 ts_rank 排序
+
+中文没有空格分词，两种索引后端都在应用层把 CJK 文本切成单字 + 二元组（bigram）再写入索引，
+查询词切成二元组后按 AND 匹配，这样不依赖 zhparser 等数据库扩展。
+"""
+import logging
+import re
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, column, func, literal_column, or_, table, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+from app.db.session import engine
+from app.models.news import News
+
+logger = logging.getLogger(__name__)
+
+_CJK = "\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+_TOKEN_RE = re.compile(rf"[{_CJK}]+|[^\W{_CJK}]+")
+_CJK_RE = re.compile(rf"[{_CJK}]")
+
+# 回填索引时每批处理的行数
+_BACKFILL_BATCH = 500
+
+
+def tokenize(value: Optional[str], *, for_query: bool = False) -> List[str]:
+    """切分文本：拉丁词按单词，CJK 连续片段切成单字和二元组（查询时只用二元组）"""
+    tokens: List[str] = []
+    for match in _TOKEN_RE.finditer((value or "").lower()):
+        word = match.group()
+        if not _CJK_RE.match(word) or len(word) == 1:
+            tokens.append(word)
+            continue
+        if not for_query:
+            tokens.extend(word)
+        tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    if for_query:
+        # 查询词去重并保持顺序
+        tokens = list(dict.fromkeys(tokens))
+    return tokens
+
+
+def _document(value: Optional[str]) -> str:
+    return " ".join(tokenize(value))
+
+
+class SearchBackend:
+    """检索后端基类，默认实现为 ILIKE 模糊匹配"""
+
+    name = "like"
+
+    async def setup(self, conn: AsyncConnection) -> None:
+        """创建索引结构并回填已有数据"""
+
+    async def detect(self, conn: AsyncConnection) -> None:
+        """不执行 DDL 的启动模式下，检查索引结构是否已由迁移创建"""
+
+    async def index(self, db: AsyncSession, news: News) -> None:
+        """写入或刷新单条新闻的索引（需在 flush 之后、commit 之前调用）"""
+        await self.index_many(db, [(news.id, news.title, news.description)])
+
+    async def index_many(self, db: AsyncSession, documents: Sequence[Tuple[int, str, str]]) -> None:
+        """批量写入或刷新索引，documents 为 (id, title, description)"""
+
+    async def remove(self, db: AsyncSession, news_id: int) -> None:
+        """物理删除新闻时移除索引"""
+
+    def apply(self, query: Select, q: str) -> Tuple[Select, Optional[ColumnElement]]:
+        """为查询添加检索条件，返回 (查询, 相关度排序子句)；不支持排序时后者为 None"""
+        search_filter = or_(
+            News.title.ilike(f"%{q}%"),
+            News.description.ilike(f"%{q}%")
+        )
+        return query.where(search_filter), None
+
+
+class SQLiteFTSSearchBackend(SearchBackend):
+    """基于 SQLite FTS5 的检索后端"""
+
+    name = "sqlite_fts"
+    _table = table("news_fts", column("rowid"))
+
+    def __init__(self) -> None:
+        self.available = True
+
+    async def setup(self, conn: AsyncConnection) -> None:
+        try:
+            await conn.execute(text(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS news_fts "
+                "USING fts5(title, description, tokenize='unicode61')"
+            ))
+        except OperationalError as e:
+            # 编译时未启用 FTS5 的 SQLite，退回 ILIKE
+            self.available = False
+            logger.warning("SQLite FTS5 不可用，检索退回 ILIKE: %s", e)
+            return
+
+        indexed = (await conn.execute(text("SELECT count(*) FROM news_fts"))).scalar()
+        if indexed:
+            return
+        last_id = 0
+        while True:
+            rows = (await conn.execute(
+                text(
+                    "SELECT id, title, description FROM news "
+                    "WHERE id > :last_id ORDER BY id LIMIT :batch"
+                ),
+                {"last_id": last_id, "batch": _BACKFILL_BATCH}
+            )).all()
+            if not rows:
+                break
+            await conn.execute(
+                text("INSERT INTO news_fts(rowid, title, description) VALUES (:id, :title, :description)"),
+                [
+                    {"id": row.id, "title": _document(row.title), "description": _document(row.description)}
+                    for row in rows
+                ]
+            )
+            last_id = rows[-1].id
+        if last_id:
+            logger.info("FTS5 索引回填完成，最大新闻 id=%s", last_id)
+
+    async def detect(self, conn: AsyncConnection) -> None:
+        exists = (await conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'news_fts'"
+        ))).first()
+        self.available = exists is not None
+        if not self.available:
+            logger.warning("未找到 FTS5 索引表 news_fts，检索退回 ILIKE")
+
+    async def index_many(self, db: AsyncSession, documents: Sequence[Tuple[int, str, str]]) -> None:
+        if not self.available or not documents:
+            return
+        await db.execute(
+            text("DELETE FROM news_fts WHERE rowid = :id"), [{"id": id} for id, _, _ in documents]
+        )
+        await db.execute(
+            text("INSERT INTO news_fts(rowid, title, description) VALUES (:id, :title, :description)"),
+            [
+                {"id": id, "title": _document(title), "description": _document(description)}
+                for id, title, description in documents
+            ]
+        )
+
+    async def remove(self, db: AsyncSession, news_id: int) -> None:
+        if not self.available:
+            return
+        await db.execute(text("DELETE FROM news_fts WHERE rowid = :id"), {"id": news_id})
+
+    def apply(self, query: Select, q: str) -> Tuple[Select, Optional[ColumnElement]]:
+        tokens = tokenize(q, for_query=True)
+        if not self.available or not tokens:
+            return super().apply(query, q)
+        match = " ".join(f'"{token}"' for token in tokens)
+        fts = literal_column("news_fts")
+        query = query.join(self._table, self._table.c.rowid == News.id).where(fts.op("MATCH")(match))
+        # bm25 分值越小越相关
+        return query, func.bm25(fts).asc()
+
+
+class PostgresSearchBackend(SearchBackend):
+    """基于 PostgreSQL tsvector + GIN 索引的检索后端"""
+
+    name = "postgres"
+    _vector = literal_column("news.search_vector")
+    _update_sql = text(
+        "UPDATE news SET search_vector = "
+        "setweight(to_tsvector('simple', :title), 'A') || "
+        "setweight(to_tsvector('simple', :description), 'B') "
+        "WHERE id = :id"
+    )
+
+    async def setup(self, conn: AsyncConnection) -> None:
+        await conn.execute(text("ALTER TABLE news ADD COLUMN IF NOT EXISTS search_vector tsvector"))
+        await conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_news_search_vector ON news USING GIN (search_vector)"
+        ))
+        while True:
+            rows = (await conn.execute(
+                text(
+                    "SELECT id, title, description FROM news "
+                    "WHERE search_vector IS NULL ORDER BY id LIMIT :batch"
+                ),
+                {"batch": _BACKFILL_BATCH}
+            )).all()
+            if not rows:
+                break
+            await conn.execute(self._update_sql, [
+                {"id": row.id, "title": _document(row.title), "description": _document(row.description)}
+                for row in rows
+            ])
+
+    async def index_many(self, db: AsyncSession, documents: Sequence[Tuple[int, str, str]]) -> None:
+        if not documents:
+            return
+        await db.execute(self._update_sql, [
+            {"id": id, "title": _document(title), "description": _document(description)}
+            for id, title, description in documents
+        ])
+
+    def apply(self, query: Select, q: str) -> Tuple[Select, Optional[ColumnElement]]:
+        tokens = tokenize(q, for_query=True)
+        if not tokens:
+            return super().apply(query, q)
+        # 分词结果只含单词字符，可以安全拼接为 tsquery
+        tsquery = func.to_tsquery("simple", " & ".join(tokens))
+        query = query.where(self._vector.op("@@")(tsquery))
+        return query, func.ts_rank(self._vector, tsquery).desc()
+
+
+def _create_search_backend(dialect_name: str) -> SearchBackend:
+    """根据配置与数据库方言选择检索后端"""
+    name = settings.SEARCH_BACKEND
+    if name == "auto":
+        name = {"postgresql": "postgres", "sqlite": "sqlite_fts"}.get(dialect_name, "like")
+    if name == "postgres" and dialect_name == "postgresql":
+        return PostgresSearchBackend()
+    if name == "sqlite_fts" and dialect_name == "sqlite":
+        return SQLiteFTSSearchBackend()
+    if name != "like":
+        logger.warning("检索后端 %s 与数据库 %s 不匹配，使用 ILIKE", name, dialect_name)
+    return SearchBackend()
+
+
+search_backend = _create_search_backend(engine.dialect.name)
@@ -1,14 +1,103 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import asyncio
+import logging
+import math
+import time
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from typing import Any, Dict, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# 各数据库的连接池默认值，可通过 DB_* 配置覆盖
+_POOL_DEFAULTS = {
+    "postgresql": {"pool_size": 10, "max_overflow": 20, "pool_pre_ping": True, "pool_recycle": 1800},
+    # SQLite 同一时刻只允许一个写事务，连接数多了只会增加 busy 等待
+    "sqlite": {"pool_size": 5, "max_overflow": 0, "pool_pre_ping": False, "pool_recycle": -1},
+}
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """为每个新建的 SQLite 连接设置 WAL 模式与忙等待超时"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def build_engine(database_url: str) -> AsyncEngine:
+    """按数据库类型创建调优后的异步引擎"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    defaults = _POOL_DEFAULTS.get(backend, _POOL_DEFAULTS["postgresql"])
+    options: Dict[str, Any] = {"echo": settings.DB_ECHO, "future": True}
+    connect_args: Dict[str, Any] = {}
+
+    in_memory = backend == "sqlite" and url.database in (None, "", ":memory:")
+    if not in_memory:
+        # aiosqlite 文件库默认使用 NullPool（每次请求重新建连并执行 PRAGMA），这里统一改为队列池
+        if backend == "sqlite":
+            options["poolclass"] = AsyncAdaptedQueuePool
+        options.update(
+            pool_size=settings.DB_POOL_SIZE if settings.DB_POOL_SIZE is not None else defaults["pool_size"],
+            max_overflow=(
+                settings.DB_MAX_OVERFLOW if settings.DB_MAX_OVERFLOW is not None else defaults["max_overflow"]
+            ),
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=(
+                settings.DB_POOL_RECYCLE if settings.DB_POOL_RECYCLE is not None else defaults["pool_recycle"]
+            ),
+            pool_pre_ping=(
+                settings.DB_POOL_PRE_PING if settings.DB_POOL_PRE_PING is not None else defaults["pool_pre_ping"]
+            ),
+        )
+
+    if url.get_driver_name() == "asyncpg":
+        # asyncpg 自身的语句缓存与 SQLAlchemy 的预编译语句缓存；使用 pgbouncer 事务模式时需设为 0
+        connect_args["statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+        url = url.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)}
+        )
+    if backend == "sqlite":
+        connect_args["timeout"] = settings.SQLITE_BUSY_TIMEOUT_MS / 1000
+
+    new_engine = create_async_engine(url, connect_args=connect_args, **options)
+    if backend == "sqlite":
+        event.listen(new_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return new_engine
+
+
+def pool_stats(target: AsyncEngine) -> Dict[str, Any]:
+    """返回连接池的实时状态"""
+    pool = target.pool
+    stats: Dict[str, Any] = {"class": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    return stats
+
+
 # 创建异步数据库引擎
-engine = create_async_engine(
-    settings.database_url,
-    echo=True,  # 开发环境下显示SQL语句
-    future=True
-)
+engine = build_engine(settings.database_url)
 
 # 创建异步会话工厂
 AsyncSessionLocal = sessionmaker(
@@ -16,10 +105,153 @@ AsyncSessionLocal = sessionmaker(
 )
 
 
+# 可选的只读副本
+read_engine: Optional[AsyncEngine] = (
+    build_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else None
+)
+AsyncReadSessionLocal = (
+    sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+    if read_engine is not None else None
+)
+
+
+class _PrimaryWindow:
+    """当前请求的读主库窗口：客户端带来的截止时间，以及本请求中主库提交的时间"""
+
+    __slots__ = ("until", "committed_at")
+
+    def __init__(self, until: float) -> None:
+        self.until = until
+        self.committed_at: Optional[float] = None
+
+
+_primary_window: ContextVar[Optional[_PrimaryWindow]] = ContextVar("primary_window", default=None)
+
+
+class ReplicaRouter:
+    """决定只读请求是否走副本
+
+    - 副本连接失败后在 DB_REPLICA_RETRY_SECONDS 内回退主库
+    - 主库提交后的 DB_REPLICA_STICKY_SECONDS 内读取主库，保证读到自己的写入。
+      DB_REPLICA_STICKY_SCOPE=client（默认）时窗口按客户端计算：写请求的响应通过 Cookie 带回截止时间，
+      客户端之后的请求无论落到哪个 worker 都读主库，其他客户端不受影响；
+      process 时窗口为整个进程共享，只对同一 worker 上的请求有效，持续写入时副本会一直闲置
+    """
+
+    def __init__(self) -> None:
+        self.unhealthy_until = 0.0
+        self.last_primary_commit = 0.0
+
+    def use_replica(self) -> bool:
+        if read_engine is None:
+            return False
+        if time.monotonic() < self.unhealthy_until:
+            return False
+        if settings.DB_REPLICA_STICKY_SCOPE == "process":
+            return time.monotonic() - self.last_primary_commit >= settings.DB_REPLICA_STICKY_SECONDS
+        window = _primary_window.get()
+        return window is None or time.time() >= window.until
+
+    @staticmethod
+    def is_replica(session: AsyncSession) -> bool:
+        """会话是否连接到副本"""
+        return read_engine is not None and session.bind is read_engine
+
+    def mark_unhealthy(self, error: Exception) -> None:
+        logger.warning("只读副本不可用，%s 秒内回退主库: %s", settings.DB_REPLICA_RETRY_SECONDS, error)
+        self.unhealthy_until = time.monotonic() + settings.DB_REPLICA_RETRY_SECONDS
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "configured": read_engine is not None,
+            "healthy": time.monotonic() >= self.unhealthy_until,
+            "sticky_scope": settings.DB_REPLICA_STICKY_SCOPE,
+            "pool": pool_stats(read_engine) if read_engine is not None else None,
+        }
+
+
+replica_router = ReplicaRouter()
+
+
+@event.listens_for(engine.sync_engine, "commit")
+def _record_primary_commit(conn) -> None:
+    replica_router.last_primary_commit = time.monotonic()
+    window = _primary_window.get()
+    if window is not None:
+        window.committed_at = time.time()
+
+
+class ReplicaStickyMiddleware:
+    """按客户端保持读主库窗口：读取请求 Cookie 中的截止时间，本请求有主库提交时在响应中更新"""
+
+    def __init__(self, app: ASGIApp, cookie_name: str, sticky_seconds: float) -> None:
+        self.app = app
+        self.cookie_name = cookie_name
+        self.sticky_seconds = sticky_seconds
+
+    def _read_until(self, scope: Scope) -> float:
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                morsel = SimpleCookie(value.decode("latin-1")).get(self.cookie_name)
+                if morsel is not None:
+                    try:
+                        return float(morsel.value)
+                    except ValueError:
+                        return 0.0
+        return 0.0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        window = _PrimaryWindow(self._read_until(scope))
+
+        async def send_with_cookie(message: Message) -> None:
+            # 事务在返回响应之前提交，响应头发出时已能确定本请求是否写过主库
+            if message["type"] == "http.response.start" and window.committed_at is not None:
+                until = window.committed_at + self.sticky_seconds
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{self.cookie_name}={until:.3f}; Max-Age={math.ceil(self.sticky_seconds)}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+            await send(message)
+
+        token = _primary_window.set(window)
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _primary_window.reset(token)
+
+
 async def get_db() -> AsyncSession:
     """获取数据库会话的依赖注入函数"""
     async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+
+async def get_read_db() -> AsyncSession:
+    """只读数据库会话：副本可用时使用副本，否则回退主库"""
+    if replica_router.use_replica():
+        async with AsyncReadSessionLocal() as session:
+            try:
+                # 提前获取连接，副本不可达时可以在进入接口前回退
+                await asyncio.wait_for(
+                    session.connection(), timeout=settings.DB_REPLICA_CONNECT_TIMEOUT
+                )
+            except (OSError, DBAPIError, asyncio.TimeoutError) as e:
+                replica_router.mark_unhealthy(e)
+            else:
+                try:
+                    yield session
+                except DBAPIError as e:
+                    if e.connection_invalidated:
+                        replica_router.mark_unhealthy(e)
+                    raise
+                return
+    async with AsyncSessionLocal() as session:
+        yield session
@@ -0,0 +1,12 @@
+from sqlalchemy import DateTime
+from sqlalchemy.dialects import sqlite
+
+# SQLite 的 CURRENT_TIMESTAMP 只精确到秒且不带微秒，而 SQLAlchemy 默认绑定参数格式带 ".ffffff"，
+# 两者按字符串比较时会出现 "同一时刻不相等" 的问题，影响基于时间戳的游标比较。
+# 这里让 SQLite 下的存储/绑定格式与 CURRENT_TIMESTAMP 保持一致。
+TimestampTZ = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
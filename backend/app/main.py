@@ -1,12 +1,41 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
+import logging
 import os
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 为可选依赖
+    orjson = None
+
+from app.api.news_cache import news_cache
 from app.api.v1.api import api_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.events import news_events
+from app.core.health import readiness_checker
+from app.core.http import http_client
+from app.core.images import image_processor
+from app.core.logging import RequestIDMiddleware, setup_logging
+from app.core.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    MetricsMiddleware,
+    collect_password_pool,
+    collect_pool,
+    instrument_engine,
+    metrics_access_allowed,
+    registry as metrics_registry
+)
+from app.core.security import PasswordHasherBusy, password_pool
+from app.core.static import UploadsStaticFiles
+from app.core.uploads import UploadSizeLimitMiddleware
 from app.db.init_db import init_db
+from app.db.session import ReplicaStickyMiddleware, engine, pool_stats, read_engine
+
+setup_logging(settings.LOG_LEVEL, settings.LOG_FORMAT, settings.LOG_SAMPLE_RATE)
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
@@ -14,16 +43,63 @@ async def lifespan(app: FastAPI):
     """应用生命周期管理"""
     # 启动时初始化数据库
     await init_db()
+    await http_client.start()
+    await news_events.start()
     yield
-    # 关闭时的清理工作（如果需要）
+    # 关闭时的清理工作（此时连接已排空，推送连接由 serve.py 在收到退出信号时提前结束）
+    await news_events.stop()
+    await http_client.close()
+    await image_processor.shutdown()
+    await news_cache.close()
+    password_pool.shutdown()
 
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # 安装了 orjson 时使用更快的 JSON 序列化
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse
+)
+
+# 压缩文本类响应（JSON 等），小于阈值的响应不压缩
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        enable_brotli=settings.COMPRESSION_BROTLI_ENABLED,
+    )
+
+# 在解析表单之前拒绝超出大小限制的图片上传请求
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    path_suffix="/news/upload",
+    max_size=settings.UPLOAD_MAX_SIZE,
 )
 
+# 配置了只读副本时，按客户端保持写入后读主库的窗口
+if read_engine is not None and settings.DB_REPLICA_STICKY_SCOPE == "client":
+    app.add_middleware(
+        ReplicaStickyMiddleware,
+        cookie_name=settings.DB_REPLICA_STICKY_COOKIE,
+        sticky_seconds=settings.DB_REPLICA_STICKY_SECONDS,
+    )
+
+# 请求延迟、数据库查询等性能指标
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, slow_request_ms=settings.SLOW_REQUEST_MS)
+    instrument_engine(engine, "primary", settings.SLOW_QUERY_MS)
+    metrics_registry.add_collector(collect_pool("primary", lambda: pool_stats(engine)))
+    if read_engine is not None:
+        instrument_engine(read_engine, "replica", settings.SLOW_QUERY_MS)
+        metrics_registry.add_collector(collect_pool("replica", lambda: pool_stats(read_engine)))
+    metrics_registry.add_collector(collect_password_pool(password_pool.stats))
+
+# 为每个请求分配请求 ID，写入日志并通过 X-Request-ID 响应头返回
+app.add_middleware(RequestIDMiddleware)
+
 # 设置CORS
 app.add_middleware(
     CORSMiddleware,
@@ -33,20 +109,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    """密码计算排队已满时返回 503，提示客户端稍后重试"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "服务繁忙，请稍后重试"},
+        headers={"Retry-After": "1"},
+    )
+
+
 # 包含API路由
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 # 挂载静态文件服务
 # 使用相对路径，适配Docker容器环境
-upload_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads")
+upload_dir = settings.upload_path
 
-print(f"静态文件服务 - 计算的上传目录路径: {upload_dir}")
+logger.info("静态文件服务 - 上传目录: %s", upload_dir)
 
 # 确保上传目录存在
 os.makedirs(upload_dir, exist_ok=True)
 
-# 挂载静态文件
-app.mount("/uploads", StaticFiles(directory=upload_dir), name="uploads")
+# 挂载静态文件（以内容哈希命名的文件长期缓存；x-accel / x-sendfile 模式下由前置服务器发送文件）
+app.mount(
+    "/uploads",
+    UploadsStaticFiles(
+        directory=upload_dir,
+        mode=settings.UPLOADS_SERVE_MODE,
+        accel_prefix=settings.UPLOADS_ACCEL_PREFIX,
+        max_age=settings.UPLOADS_CACHE_MAX_AGE,
+    ),
+    name="uploads"
+)
 
 
 @app.get("/")
@@ -55,7 +151,36 @@ async def root():
     return {"message": "Welcome to FeedNews API"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus 文本格式的性能指标，只对允许的地址或携带令牌的抓取方开放"""
+    if not settings.METRICS_ENABLED:
+        return PlainTextResponse("metrics disabled\n", status_code=status.HTTP_404_NOT_FOUND)
+    if not metrics_access_allowed(
+        request.client.host if request.client else None,
+        request.headers.get("Authorization"),
+        settings.METRICS_ALLOW_IPS,
+        settings.METRICS_TOKEN,
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="无权访问性能指标")
+    return PlainTextResponse(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.get("/health")
 async def health_check():
     """健康检查"""
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/health/live")
+async def liveness_check():
+    """存活检查：不访问数据库等依赖"""
+    return {"status": "ok"}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """就绪检查：数据库、连接池、上传目录与存储后端，结果短时间缓存"""
+    result = await readiness_checker.check()
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE if result["status"] == "fail" else status.HTTP_200_OK
+    return JSONResponse(status_code=status_code, content=result)
\ No newline at end of file
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+from app.db.types import TimestampTZ
+
+
+class ImageAsset(Base):
+    """按内容哈希索引的已上传图片，用于重复上传去重"""
+    __tablename__ = "image_assets"
+    
+    sha256 = Column(String(64), primary_key=True)
+    storage = Column(String(20), nullable=False)  # local | imgbb
+    location = Column(Text, nullable=False)  # 本地为相对文件名，远程为完整URL
+    size = Column(Integer, nullable=False)
+    content_type = Column(String(100), nullable=True)
+    created_at = Column(TimestampTZ, server_default=func.now())
@@ -1,21 +1,35 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
+from app.db.types import TimestampTZ
 
 
 class News(Base):
     __tablename__ = "news"
+    __table_args__ = (
+        # 支撑 (created_at, id) 游标分页的复合索引
+        Index("ix_news_created_at_id", "created_at", "id"),
+        # 支撑按 (updated_at, id) 增量同步的复合索引
+        Index("ix_news_updated_at_id", "updated_at", "id"),
+        Index("ix_news_creator_id", "creator_id"),
+        # 只包含未删除新闻的部分索引，覆盖公开列表的过滤与排序（PostgreSQL / SQLite）
+        Index(
+            "ix_news_live_created_at_id", "created_at", "id",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(100), nullable=False)
     description = Column(String(500), nullable=False)
     image_url = Column(Text, nullable=True)
     creator_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
-    deleted_at = Column(DateTime(timezone=True), nullable=True)  # 软删除
+    created_at = Column(TimestampTZ, server_default=func.now())
+    updated_at = Column(TimestampTZ, server_default=func.now(), onupdate=func.now())
+    deleted_at = Column(TimestampTZ, nullable=True)  # 软删除
     
     # 关系
-    creator = relationship("User", back_populates="news")
\ No newline at end of file
+    creator = relationship("User", back_populates="news")
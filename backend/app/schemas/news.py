@@ -1,5 +1,5 @@
 from pydantic import BaseModel, HttpUrl
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 
@@ -29,8 +29,35 @@ class NewsInDBBase(NewsBase):
         from_attributes = True
 
 
+class ImageVariant(BaseModel):
+    url: str
+    width: int
+    height: int
+    format: str
+
+
+class ImageVariantSet(BaseModel):
+    srcset: str  # 首选格式（WebP）的 srcset，可直接用于 <img srcset>
+    variants: List[ImageVariant]
+
+
 class News(NewsInDBBase):
     creator_username: Optional[str] = None
+    image_variants: Optional[ImageVariantSet] = None  # 图片处理完成后提供的缩放版本
+
+
+class NewsChange(BaseModel):
+    op: str  # upsert | delete
+    id: int
+    updated_at: datetime
+    deleted_at: Optional[datetime] = None
+    news: Optional[News] = None  # op 为 upsert 时提供完整数据
+
+
+class NewsChangesResponse(BaseModel):
+    changes: List[NewsChange]
+    next_token: Optional[str] = None  # 下次请求的 since；没有任何数据时为空
+    has_more: bool  # 为 true 时应立即用 next_token 继续拉取
 
 
 class NewsInDB(NewsInDBBase):
@@ -39,7 +66,52 @@ class NewsInDB(NewsInDBBase):
 
 class NewsListResponse(BaseModel):
     items: list[News]
-    total: int
+    total: Optional[int] = None  # 请求 with_total=false 时不统计总数
     page: int
     limit: int
-    total_pages: int
\ No newline at end of file
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # 键集分页的下一页游标，没有更多数据时为空
+
+class NewsBatchCreate(BaseModel):
+    # 每条数据单独校验，格式错误的条目在结果中报告，不影响其他条目
+    items: List[Dict[str, Any]]
+
+
+class NewsBatchUpdateItem(NewsUpdate):
+    id: int
+
+
+class NewsBatchUpdate(BaseModel):
+    items: List[Dict[str, Any]]
+
+
+class NewsBatchDelete(BaseModel):
+    ids: List[int]
+
+
+class NewsBatchItemResult(BaseModel):
+    index: int  # 条目在请求中的位置
+    id: Optional[int] = None
+    status: str  # created | updated | deleted | error
+    status_code: int  # 按单条接口的语义给出的状态码
+    error: Optional[str] = None
+
+
+class NewsBatchResponse(BaseModel):
+    results: List[NewsBatchItemResult]
+    succeeded: int
+    failed: int
+
+
+class NewsImportError(BaseModel):
+    line: int  # 记录在文件中的起始行号
+    error: str
+
+
+class NewsImportReport(BaseModel):
+    received: int
+    imported: int
+    rejected: int
+    errors: List[NewsImportError]  # 最多返回 NEWS_IMPORT_MAX_ERRORS 条
+    elapsed_seconds: float
+    rows_per_second: int
@@ -0,0 +1,81 @@
+"""
+新闻列表响应的序列化耗时与传输字节数基准
+
+构造 limit=100 的 NewsListResponse，比较:
+- 序列化: FastAPI 默认 JSONResponse、ORJSONResponse、Pydantic model_dump_json
+- 传输字节数: 未压缩、gzip、brotli（与 CompressionMiddleware 使用相同的压缩参数）
+
+用法（在 backend 目录下）:
+    python benchmarks/bench_news_list.py [--limit 100] [--rounds 200]
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+
+from app.core.compression import _Compressor, brotli  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.schemas.news import News, NewsListResponse  # noqa: E402
+
+
+def build_response(limit: int) -> NewsListResponse:
+    now = datetime.now(timezone.utc)
+    items = [
+        News(
+            id=i,
+            title=f"示例新闻标题 {i}：城市交通改造工程进入新阶段",
+            description=f"第 {i} 条用于基准测试的新闻描述，包含若干中文与 English words，"
+                        + "长度接近真实数据。" * (3 + i % 5),
+            image_url=f"{settings.SERVER_HOST}/uploads/{i:064x}.jpg",
+            creator_id=1,
+            created_at=now - timedelta(minutes=i),
+            updated_at=now - timedelta(minutes=i),
+            creator_username="admin",
+        )
+        for i in range(limit)
+    ]
+    return NewsListResponse(items=items, total=1000, page=1, limit=limit, total_pages=10)
+
+
+def bench(label: str, func, rounds: int) -> bytes:
+    body = func()
+    seconds = min(timeit.repeat(func, number=rounds, repeat=5)) / rounds
+    print(f"  {label:<28} {seconds * 1e6:10.1f} us/次  {len(body):8d} bytes")
+    return body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    response = build_response(args.limit)
+    print(f"序列化（limit={args.limit}）:")
+    body = bench("JSONResponse (默认)", lambda: JSONResponse(jsonable_encoder(response)).body, args.rounds)
+    bench("ORJSONResponse", lambda: ORJSONResponse(jsonable_encoder(response)).body, args.rounds)
+    bench("model_dump_json", lambda: response.model_dump_json().encode("utf-8"), args.rounds)
+
+    print("传输字节数:")
+    print(f"  {'identity':<28} {'':>10}         {len(body):8d} bytes")
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+    for encoding in encodings:
+        bench(
+            f"{encoding}",
+            lambda: _Compressor(
+                encoding, settings.COMPRESSION_GZIP_LEVEL, settings.COMPRESSION_BROTLI_QUALITY
+            ).compress(body, final=True),
+            args.rounds,
+        )
+    if brotli is None:
+        print("  （未安装 brotli，跳过 br）")
+
+
+if __name__ == "__main__":
+    main()
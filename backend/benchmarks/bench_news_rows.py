@@ -0,0 +1,108 @@
+"""
+新闻列表逐条构造响应的开销基准
+
+在内存 SQLite 中写入示例数据，比较 limit 条新闻的两种构造方式:
+- orm: select(News) + selectinload(News.creator)，逐条 NewsSchema(**dict) 校验，
+       再由 response_model 对整个 NewsListResponse 校验一次后序列化（原实现）
+- projection: 只投影所需列并左连接 users，model_construct 后直接 model_dump_json（现实现）
+
+用法（在 backend 目录下）:
+    python benchmarks/bench_news_rows.py [--limit 100] [--rounds 50]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app.api.pagination import paginate_news, select_list_columns  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.models.news import News  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.news import News as NewsSchema, NewsListResponse  # noqa: E402
+
+
+async def orm_path(session, limit: int) -> bytes:
+    query = paginate_news(
+        select(News).where(News.deleted_at.is_(None)).options(selectinload(News.creator)),
+        page=1, limit=limit
+    )
+    rows = (await session.execute(query)).scalars().all()[:limit]
+    items = [
+        NewsSchema(**{
+            "id": news.id,
+            "title": news.title,
+            "description": news.description,
+            "image_url": news.image_url,
+            "creator_id": news.creator_id,
+            "created_at": news.created_at,
+            "updated_at": news.updated_at,
+            "creator_username": news.creator.username if news.creator else None,
+        })
+        for news in rows
+    ]
+    response = NewsListResponse(items=items, total=None, page=1, limit=limit)
+    # FastAPI 按 response_model 再次校验后用 jsonable_encoder + JSONResponse 输出
+    validated = NewsListResponse.model_validate(response.model_dump())
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+async def projection_path(session, limit: int) -> bytes:
+    query = paginate_news(
+        select_list_columns(select(News).where(News.deleted_at.is_(None))), page=1, limit=limit
+    )
+    rows = (await session.execute(query)).all()[:limit]
+    return NewsListResponse.model_construct(
+        items=[NewsSchema.model_construct(**row._asdict()) for row in rows],
+        total=None, page=1, limit=limit, total_pages=None, next_cursor=None
+    ).model_dump_json().encode("utf-8")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    async with Session() as session:
+        users = [User(username=f"user{i}", email=f"user{i}@example.com", hashed_password="x")
+                 for i in range(10)]
+        session.add_all(users)
+        await session.flush()
+        session.add_all(
+            News(title=f"新闻标题 {i}", description="新闻描述内容 " * 20, creator_id=users[i % 10].id,
+                 image_url=f"{i:064x}.jpg")
+            for i in range(args.limit * 2)
+        )
+        await session.commit()
+
+    print(f"limit={args.limit}, rounds={args.rounds}")
+    results = {}
+    for name, func in (("orm", orm_path), ("projection", projection_path)):
+        async with Session() as session:
+            await func(session, args.limit)  # 预热
+            started = time.perf_counter()
+            for _ in range(args.rounds):
+                session.expunge_all()
+                await func(session, args.limit)
+            elapsed = (time.perf_counter() - started) / args.rounds
+        results[name] = elapsed
+        print(f"  {name:<12} {elapsed * 1e3:8.2f} ms/请求  {elapsed / args.limit * 1e6:8.1f} us/条")
+    print(f"  每条耗时降低 {(1 - results['projection'] / results['orm']) * 100:.0f}%")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
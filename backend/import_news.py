@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+新闻批量导入命令行工具
+
+从 NDJSON / CSV 文件（可为 .gz 压缩）流式导入新闻，进度输出到 stderr，结果报告（JSON）输出到 stdout。
+导入的新闻归属 --creator 指定的用户；数据库需已初始化（应用至少启动过一次）。
+
+用法（在 backend 目录下）:
+    python import_news.py news.ndjson
+    python import_news.py news.csv.gz --creator admin --chunk-size 2000
+    cat news.ndjson | python import_news.py - --format ndjson
+
+运行中的服务进程内的列表缓存与总数缓存会在各自的 TTL 后过期。
+"""
+import argparse
+import asyncio
+import json
+import sys
+from typing import AsyncIterator, BinaryIO
+
+from sqlalchemy import select
+
+from app.api.news_import import ImportReport, NewsImporter
+from app.api.news_io import PARSERS, gunzip_chunks
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.db.session import AsyncSessionLocal, engine
+from app.models.user import User
+
+_READ_SIZE = 1024 * 1024
+
+
+async def read_chunks(stream: BinaryIO) -> AsyncIterator[bytes]:
+    while True:
+        chunk = stream.read(_READ_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+
+def guess_format(path: str) -> str:
+    name = path.lower().removesuffix(".gz")
+    return "csv" if name.endswith(".csv") else "ndjson"
+
+
+def print_progress(report: ImportReport) -> None:
+    elapsed = report.elapsed
+    rate = report.imported / elapsed if elapsed > 0 else 0
+    print(
+        f"\r已读取 {report.received} 行，导入 {report.imported}，拒绝 {report.rejected}（{rate:.0f} 行/秒）",
+        end="", file=sys.stderr, flush=True
+    )
+
+
+async def run_import(args: argparse.Namespace) -> int:
+    async with AsyncSessionLocal() as session:
+        creator_id = (await session.execute(
+            select(User.id).where(User.username == args.creator)
+        )).scalar_one_or_none()
+    if creator_id is None:
+        print(f"用户不存在: {args.creator}", file=sys.stderr)
+        return 2
+
+    stream = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+    try:
+        chunks = read_chunks(stream)
+        if args.path.endswith(".gz"):
+            chunks = gunzip_chunks(chunks)
+        importer = NewsImporter(
+            AsyncSessionLocal,
+            creator_id=creator_id,
+            chunk_size=args.chunk_size,
+            max_errors=settings.NEWS_IMPORT_MAX_ERRORS,
+            progress=None if args.quiet else print_progress
+        )
+        report = await importer.run(PARSERS[args.format or guess_format(args.path)](chunks))
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+    return 0 if not report.rejected else 1
+
+
+async def main(args: argparse.Namespace) -> int:
+    try:
+        return await run_import(args)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="从 NDJSON / CSV 文件导入新闻")
+    parser.add_argument("path", help="文件路径，- 表示标准输入；以 .gz 结尾时按 gzip 解压")
+    parser.add_argument("--format", choices=sorted(PARSERS), help="文件格式，默认按扩展名判断")
+    parser.add_argument("--creator", default="admin", help="导入新闻的创建者用户名")
+    parser.add_argument("--chunk-size", type=int, default=settings.NEWS_IMPORT_CHUNK_SIZE, help="每个事务写入的行数")
+    parser.add_argument("--quiet", action="store_true", help="不输出进度")
+    setup_logging(settings.LOG_LEVEL, settings.LOG_FORMAT, settings.LOG_SAMPLE_RATE)
+    sys.exit(asyncio.run(main(parser.parse_args())))
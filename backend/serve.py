@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+生产环境启动脚本
+
+- 多 worker：默认按可用 CPU 核数启动，共享同一个监听 socket
+- 新闻变更事件使用进程内总线（未使用 PostgreSQL 或 EVENTS_BUS=local）时只能单 worker 运行：
+  未指定 worker 数时按单 worker 启动，显式指定多个 worker 时拒绝启动
+- 数据库初始化（迁移、检索结构、示例数据）只在主进程中执行一次，
+  worker 以 DB_INIT_MODE=skip 启动，避免多个进程同时执行 DDL
+- 默认使用 uvloop 与 httptools（uvicorn[standard] 已包含）
+- 收到 SIGTERM 后停止接收新连接并立即结束 SSE / WebSocket 推送连接（客户端会重连到其他实例），
+  最多等待 --graceful-timeout 秒让进行中的请求结束，超时后取消
+
+用法（在 backend 目录下）:
+    python serve.py
+    python serve.py --workers 4 --port 8000
+    DB_INIT_MODE=skip python serve.py   # 迁移已由部署流程执行
+
+本地开发请使用 start.py（单进程、自动重载）。
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from typing import Optional
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+
+logger = logging.getLogger("serve")
+
+
+def available_cpus() -> int:
+    """可用 CPU 核数，容器中按 CPU 亲和性计算"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class Server(uvicorn.Server):
+    """收到退出信号时先结束推送长连接，否则它们会一直占用到优雅退出超时"""
+
+    def handle_exit(self, sig, frame) -> None:
+        if not self.should_exit:
+            from app.core.events import news_events
+            news_events.broker.close_all("shutdown")
+        super().handle_exit(sig, frame)
+
+
+def resolve_workers(requested: Optional[int]) -> Optional[int]:
+    """确定 worker 数，返回 None 表示配置冲突、不能启动
+
+    进程内事件总线不会把事件转发给其他 worker，订阅者只能收到同一 worker 上的写入产生的事件。
+    """
+    from app.core.events import resolve_event_bus
+
+    workers = requested or available_cpus()
+    if workers > 1 and settings.EVENTS_ENABLED and resolve_event_bus() == "local":
+        if requested:
+            logger.error(
+                "新闻变更事件使用进程内总线，无法在 %d 个 worker 之间转发；"
+                "请使用 PostgreSQL（EVENTS_BUS=auto 或 postgres）、设置 EVENTS_ENABLED=false 或只启动 1 个 worker",
+                workers
+            )
+            return None
+        logger.warning("新闻变更事件使用进程内总线，以单 worker 启动")
+        return 1
+    return workers
+
+
+async def prepare_database() -> None:
+    """在启动 worker 之前执行一次数据库初始化"""
+    from app.core.security import password_pool
+    from app.db.init_db import init_db
+    from app.db.session import engine
+
+    try:
+        await init_db()
+    finally:
+        # worker 是新启动的进程，不会继承这里的连接，但主进程也不应一直占用
+        await engine.dispose()
+        password_pool.shutdown()
+
+
+def main(args: argparse.Namespace) -> int:
+    setup_logging(settings.LOG_LEVEL, settings.LOG_FORMAT, settings.LOG_SAMPLE_RATE)
+
+    if args.preload:
+        # 导入失败时直接退出，而不是每个 worker 各自报错
+        import app.main  # noqa: F401
+
+    workers = resolve_workers(args.workers)
+    if workers is None:
+        return 2
+
+    if settings.DB_INIT_MODE != "skip":
+        asyncio.run(prepare_database())
+    # 单 worker 时应用在本进程内运行，多 worker 时通过环境变量传给 worker 进程
+    settings.DB_INIT_MODE = "skip"
+    os.environ["DB_INIT_MODE"] = "skip"
+
+    logger.info(
+        "启动 %d 个 worker，监听 %s:%d（loop=%s, http=%s）",
+        workers, args.host, args.port, args.loop, args.http
+    )
+
+    config = uvicorn.Config(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop=args.loop,
+        http=args.http,
+        backlog=args.backlog,
+        timeout_keep_alive=args.keep_alive,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        limit_concurrency=args.limit_concurrency,
+        proxy_headers=True,
+        forwarded_allow_ips=args.forwarded_allow_ips,
+        # 日志由 setup_logging 配置（worker 导入应用时同样会配置）
+        log_config=None,
+        log_level=settings.LOG_LEVEL.lower(),
+        access_log=args.access_log,
+        server_header=False,
+    )
+    server = Server(config)
+    if workers > 1:
+        # 与 uvicorn.run 相同：主进程绑定 socket，worker 进程共享
+        Multiprocess(config, target=server.run, sockets=[config.bind_socket()]).run()
+    else:
+        server.run()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="以多 worker 方式启动 FeedNews 后端")
+    parser.add_argument("--host", default=settings.SERVE_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVE_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVE_WORKERS, help="默认为可用 CPU 核数（进程内事件总线时为 1）")
+    parser.add_argument("--loop", choices=["auto", "uvloop", "asyncio"], default=settings.SERVE_LOOP)
+    parser.add_argument("--http", choices=["auto", "httptools", "h11"], default=settings.SERVE_HTTP)
+    parser.add_argument("--backlog", type=int, default=settings.SERVE_BACKLOG)
+    parser.add_argument("--keep-alive", type=int, default=settings.SERVE_KEEP_ALIVE, help="空闲长连接保持秒数")
+    parser.add_argument(
+        "--graceful-timeout", type=int, default=settings.SERVE_GRACEFUL_TIMEOUT,
+        help="退出时等待进行中请求结束的秒数"
+    )
+    parser.add_argument(
+        "--limit-concurrency", type=int, default=settings.SERVE_LIMIT_CONCURRENCY,
+        help="每个 worker 的最大并发连接数"
+    )
+    parser.add_argument(
+        "--preload", action=argparse.BooleanOptionalAction, default=settings.SERVE_PRELOAD,
+        help="启动 worker 之前在主进程中导入应用"
+    )
+    parser.add_argument("--forwarded-allow-ips", default=settings.SERVE_FORWARDED_ALLOW_IPS)
+    parser.add_argument("--access-log", action=argparse.BooleanOptionalAction, default=settings.SERVE_ACCESS_LOG)
+    sys.exit(main(parser.parse_args()))
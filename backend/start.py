@@ -1,13 +1,14 @@
 #!/usr/bin/env python3
 """
-启动脚本 - 用于本地开发
+启动脚本 - 用于本地开发（单进程、自动重载）；生产环境使用 serve.py
 """
 
 import uvicorn
 import logging
 
-# 设置详细的日志记录
-logging.basicConfig(level=logging.DEBUG)
+from app.core.config import settings
+
+# 日志级别与格式由 Settings（LOG_LEVEL / LOG_FORMAT）控制，应用导入时完成配置
 logger = logging.getLogger(__name__)
 
 if __name__ == "__main__":
@@ -17,8 +18,8 @@ if __name__ == "__main__":
             host="127.0.0.1",
             port=8000,
             reload=True,
-            log_level="info"
+            log_level=settings.LOG_LEVEL.lower()
         )
     except Exception as e:
-        logger.error(f"服务器启动失败: {e}")
+        logger.error("服务器启动失败: %s", e)
         raise
\ No newline at end of file
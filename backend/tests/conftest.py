@@ -0,0 +1,48 @@
+"""
+测试环境：使用临时目录中的 SQLite 数据库
+
+配置在导入时读取，必须在导入 app 之前设置环境变量。
+"""
+import os
+import sys
+import tempfile
+
+_TMP_DIR = tempfile.mkdtemp(prefix="feednews-test-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_TMP_DIR, 'test.db')}"
+os.environ["UPLOAD_DIR"] = os.path.join(_TMP_DIR, "uploads")
+os.environ["DATABASE_READ_URL"] = ""
+os.environ["CACHE_REDIS_URL"] = ""
+os.makedirs(os.environ["UPLOAD_DIR"], exist_ok=True)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.main import app  # noqa: E402
+
+API = settings.API_V1_STR
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    response = client.post(f"{API}/auth/token", data={"username": "admin", "password": "admin123"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def create_news(client, admin_headers):
+    def create(title: str = "测试新闻", description: str = "测试描述") -> int:
+        response = client.post(
+            f"{API}/news/", json={"title": title, "description": description}, headers=admin_headers
+        )
+        assert response.status_code == 201, response.text
+        return response.json()["id"]
+    return create
@@ -0,0 +1,80 @@
+from tests.conftest import API
+
+
+def _statuses(response):
+    assert response.status_code == 200, response.text
+    return [(result["status"], result["status_code"]) for result in response.json()["results"]]
+
+
+def test_batch_create_reports_each_item(client, admin_headers):
+    response = client.post(f"{API}/news/batch/create", json={"items": [
+        {"title": "批量 1", "description": "d"},
+        {"title": "缺少描述"},
+        {"title": "x" * 101, "description": "超长标题"},
+        {"title": "批量 2", "description": "d"},
+    ]}, headers=admin_headers)
+    assert _statuses(response) == [("created", 201), ("error", 422), ("error", 422), ("created", 201)]
+    data = response.json()
+    assert (data["succeeded"], data["failed"]) == (2, 2)
+    assert "description" in data["results"][1]["error"]
+    assert "title" in data["results"][2]["error"]
+    for result in (data["results"][0], data["results"][3]):
+        assert client.get(f"{API}/news/{result['id']}").status_code == 200
+
+
+def test_batch_update_reports_each_item(client, admin_headers, create_news):
+    first, second, third = create_news("批量更新 1"), create_news("批量更新 2"), create_news("批量更新 3")
+    response = client.post(f"{API}/news/batch/update", json={"items": [
+        {"id": first, "title": "批量已更新"},
+        {"id": 999999, "title": "不存在"},
+        {"id": second, "description": None},
+        {"id": third, "description": "y" * 501},
+        {"id": first, "title": "重复"},
+    ]}, headers=admin_headers)
+    assert _statuses(response) == [
+        ("updated", 200), ("error", 404), ("error", 422), ("error", 422), ("error", 400)
+    ]
+    assert client.get(f"{API}/news/{first}").json()["title"] == "批量已更新"
+    assert client.get(f"{API}/news/{second}").json()["description"] == "测试描述"
+    assert client.get(f"{API}/news/{third}").json()["description"] == "测试描述"
+
+
+def test_batch_update_requires_ownership(client, admin_headers, create_news):
+    id = create_news("他人的新闻")
+    client.post(f"{API}/auth/register", json={
+        "username": "batchuser", "email": "batch@example.com", "password": "secret123"
+    })
+    token = client.post(
+        f"{API}/auth/token", data={"username": "batchuser", "password": "secret123"}
+    ).json()["access_token"]
+    response = client.post(
+        f"{API}/news/batch/update", json={"items": [{"id": id, "title": "篡改"}]},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert _statuses(response) == [("error", 403)]
+
+
+def test_batch_delete_reports_each_item(client, admin_headers, create_news):
+    id = create_news("批量删除")
+    response = client.post(
+        f"{API}/news/batch/delete", json={"ids": [id, 999999]}, headers=admin_headers
+    )
+    assert [result["status_code"] for result in response.json()["results"]] == [204, 404]
+    assert client.get(f"{API}/news/{id}").status_code == 404
+
+
+def test_batch_size_limit(client, admin_headers, monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "NEWS_BATCH_MAX_ITEMS", 2)
+    response = client.post(f"{API}/news/batch/delete", json={"ids": [1, 2, 3]}, headers=admin_headers)
+    assert response.status_code == 400
+
+
+def test_batch_title_edit_invalidates_search_results(client, admin_headers, create_news):
+    id = create_news("批量检索原标题")
+    assert client.get(f"{API}/news/", params={"q": "batchzq"}).json()["total"] == 0
+    client.post(
+        f"{API}/news/batch/update", json={"items": [{"id": id, "title": "batchzq 新标题"}]},
+        headers=admin_headers
+    )
+    assert client.get(f"{API}/news/", params={"q": "batchzq"}).json()["total"] == 1
@@ -0,0 +1,49 @@
+import time
+
+from app.core.config import settings
+from tests.conftest import API
+
+
+def _drain(client, since=None):
+    changes = []
+    while True:
+        params = {"limit": 5}
+        if since:
+            params["since"] = since
+        data = client.get(f"{API}/news/changes", params=params).json()
+        changes.extend(data["changes"])
+        since = data["next_token"]
+        if not data["has_more"]:
+            return changes, since
+
+
+def _settle():
+    # 等待变更越过 settle 窗口；SQLite 的时间戳精确到秒，窗口至少 1 秒才能保证后续修改排在同步位置之后
+    time.sleep(settings.NEWS_SYNC_SETTLE_SECONDS + 0.1)
+
+
+def test_changes_return_upserts_and_tombstones(client, admin_headers, create_news, monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_SYNC_SETTLE_SECONDS", 1)
+    _, since = _drain(client)
+    kept, deleted = create_news("同步保留"), create_news("同步删除")
+    _settle()
+
+    changes, since = _drain(client, since)
+    assert {(change["op"], change["id"]) for change in changes} >= {("upsert", kept), ("upsert", deleted)}
+    assert next(c for c in changes if c["id"] == kept)["news"]["title"] == "同步保留"
+
+    assert client.delete(f"{API}/news/{deleted}", headers=admin_headers).status_code == 204
+    _settle()
+    changes, since = _drain(client, since)
+    tombstone = next(c for c in changes if c["id"] == deleted)
+    assert tombstone["op"] == "delete"
+    assert tombstone["news"] is None and tombstone["deleted_at"] is not None
+    assert kept not in [c["id"] for c in changes]
+
+    # 没有新变更时返回空列表，并保持同步位置
+    changes, next_token = _drain(client, since)
+    assert changes == [] and next_token == since
+
+
+def test_changes_response_not_cacheable(client):
+    assert client.get(f"{API}/news/changes").headers["cache-control"] == "no-store"
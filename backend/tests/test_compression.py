@@ -0,0 +1,80 @@
+import gzip
+
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.core.compression import CompressionMiddleware
+from tests.conftest import API
+
+BODY = "新闻内容 " * 500
+
+
+def _app(**options) -> TestClient:
+    async def text(request):
+        return PlainTextResponse(BODY, headers={"ETag": '"abc"'})
+
+    async def small(request):
+        return PlainTextResponse("short")
+
+    async def stream(request):
+        async def chunks():
+            for _ in range(3):
+                yield BODY
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    async def binary(request):
+        return PlainTextResponse(BODY, media_type="image/png")
+
+    app = Starlette(routes=[
+        Route("/text", text), Route("/small", small), Route("/stream", stream), Route("/binary", binary)
+    ])
+    return TestClient(CompressionMiddleware(app, minimum_size=1024, enable_brotli=False, **options))
+
+
+def test_gzip_with_weak_etag():
+    client = _app()
+    response = client.get("/text", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"abc"'
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == BODY
+
+    response = client.get("/text", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"abc"'
+
+
+def test_small_and_binary_responses_not_compressed():
+    client = _app()
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/binary", headers={"Accept-Encoding": "gzip"}).headers
+
+
+def test_streaming_response_compressed_per_chunk():
+    client = _app()
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw).decode("utf-8") == BODY * 3
+
+
+def test_select_encoding_honours_q_values():
+    middleware = CompressionMiddleware(None, enable_brotli=True)
+    middleware.encodings = ["br", "gzip"]
+    assert middleware.select_encoding("gzip, br") == "br"
+    assert middleware.select_encoding("br;q=0.5, gzip") == "gzip"
+    assert middleware.select_encoding("gzip;q=0, br;q=0") is None
+    assert middleware.select_encoding("*") == "br"
+    assert middleware.select_encoding("") is None
+
+
+def test_news_list_is_compressed(client, create_news):
+    for i in range(10):
+        create_news(f"压缩 {i}", "描述" * 50)
+    response = client.get(f"{API}/news/", params={"limit": 10}, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"].startswith('W/"')
+    assert len(response.json()["items"]) == 10
@@ -0,0 +1,107 @@
+import time
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.db.counts import news_counter
+from app.db.session import engine
+from tests.conftest import API
+
+
+def test_item_if_none_match_returns_304(client, admin_headers, create_news):
+    id = create_news("条件请求详情")
+    response = client.get(f"{API}/news/{id}")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "no-cache"
+
+    response = client.get(f"{API}/news/{id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    # 压缩后的弱 ETag 同样匹配
+    assert client.get(f"{API}/news/{id}", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+
+    # SQLite 的时间戳精确到秒，等待 updated_at 变化
+    time.sleep(1.1)
+    client.put(f"{API}/news/{id}", json={"description": "已修改"}, headers=admin_headers)
+    response = client.get(f"{API}/news/{id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_item_if_modified_since(client, create_news):
+    id = create_news("条件请求时间")
+    last_modified = client.get(f"{API}/news/{id}").headers["last-modified"]
+    response = client.get(f"{API}/news/{id}", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+    response = client.get(f"{API}/news/{id}", headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+    assert response.status_code == 200
+    # If-None-Match 优先于 If-Modified-Since
+    response = client.get(
+        f"{API}/news/{id}", headers={"If-None-Match": '"other"', "If-Modified-Since": last_modified}
+    )
+    assert response.status_code == 200
+
+
+def test_list_etag_changes_after_create(client, create_news):
+    params = {"limit": 5}
+    etag = client.get(f"{API}/news/", params=params).headers["etag"]
+    assert client.get(f"{API}/news/", params=params, headers={"If-None-Match": etag}).status_code == 304
+    # 不同的分页参数使用不同的 ETag
+    assert client.get(f"{API}/news/", params={"limit": 6}).headers["etag"] != etag
+
+    create_news("条件请求列表")
+    response = client.get(f"{API}/news/", params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["items"][0]["title"] == "条件请求列表"
+
+
+def test_list_etag_changes_when_count_is_not_exact(client, admin_headers, create_news, monkeypatch):
+    async def fixed_count(*args, **kwargs):
+        return 1000
+
+    # 估算的总数在删除后不变，校验值仍需变化
+    monkeypatch.setattr(settings, "NEWS_COUNT_STRATEGY", "estimated")
+    monkeypatch.setattr(news_counter, "count", fixed_count)
+    older = create_news("条件请求较早")
+    create_news("条件请求较新")
+    etag = client.get(f"{API}/news/").headers["etag"]
+    assert client.get(f"{API}/news/", headers={"If-None-Match": etag}).status_code == 304
+
+    client.delete(f"{API}/news/{older}", headers=admin_headers)
+    assert client.get(f"{API}/news/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_list_without_total_skips_count(client):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lower())
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = client.get(f"{API}/news/", params={"limit": 7, "with_total": "false"})
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    assert response.json()["total"] is None
+    assert "etag" in response.headers
+    assert statements and not any("count(" in statement for statement in statements)
+
+
+def test_list_etag_changes_after_force_delete(client, admin_headers, create_news):
+    params = {"limit": 8, "with_total": "false"}
+    id = create_news("条件请求物理删除")
+    response = client.get(f"{API}/news/", params=params)
+    etag = response.headers["etag"]
+    # 物理删除不留下时间戳，列表不返回 Last-Modified，If-Modified-Since 不会得到 304
+    assert "last-modified" not in response.headers
+    assert client.get(
+        f"{API}/news/", params=params, headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+    ).status_code == 200
+    assert client.get(f"{API}/news/", params=params, headers={"If-None-Match": etag}).status_code == 304
+
+    assert client.delete(f"{API}/admin/news/{id}/force", headers=admin_headers).status_code == 204
+    response = client.get(f"{API}/news/", params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert all(item["id"] != id for item in response.json()["items"])
@@ -0,0 +1,41 @@
+from sqlalchemy import select
+
+from app.api.news_cache import news_cache
+from app.core.config import settings
+from app.db.counts import NewsCounter
+from app.db.session import AsyncSessionLocal
+from app.models.news import News
+from tests.conftest import API
+
+
+def _count(client, counter: NewsCounter) -> int:
+    async def count():
+        async with AsyncSessionLocal() as db:
+            return await counter.count(db, select(News).where(News.deleted_at.is_(None)))
+    return client.portal.call(count)
+
+
+def test_cached_count_follows_writes_from_other_workers(client, admin_headers, create_news, monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_COUNT_STRATEGY", "cached")
+    # 另一个 worker 上的统计实例，与本进程共享缓存后端
+    other_worker = NewsCounter(news_cache)
+    before = _count(client, other_worker)
+    assert client.get(f"{API}/news/", params={"limit": 9}).json()["total"] == before
+
+    id = create_news("总数缓存")
+    assert _count(client, other_worker) == before + 1
+    assert client.get(f"{API}/news/", params={"limit": 9}).json()["total"] == before + 1
+
+    client.delete(f"{API}/news/{id}", headers=admin_headers)
+    assert _count(client, other_worker) == before
+
+
+def test_cached_count_without_response_cache(client, create_news, monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_COUNT_STRATEGY", "cached")
+    counter = NewsCounter(type(news_cache)(None, ttl=60))
+    before = _count(client, counter)
+    create_news("总数进程内缓存")
+    # 进程内缓存只由本实例的 invalidate 清空
+    assert _count(client, counter) == before
+    counter.invalidate()
+    assert _count(client, counter) == before + 1
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from app.core.events import EventBroker, SubscriberLimitReached
+
+
+def test_slow_consumer_is_dropped_without_blocking_others():
+    broker = EventBroker(queue_size=2, max_subscribers=10)
+
+    async def scenario():
+        async with broker.subscribe() as slow, broker.subscribe() as fast:
+            for i in range(3):
+                broker.dispatch([{"type": "created", "id": i}])
+                # 快的订阅者及时取走事件
+                assert await fast.get() == [{"type": "created", "id": i}]
+            assert slow.closed_reason == "slow_consumer"
+            # 被断开的订阅者只会收到结束标记
+            assert await slow.get() is None
+            assert fast.closed_reason is None
+            assert broker.stats()["subscribers"] == 1
+
+    asyncio.run(scenario())
+    assert broker.dropped == 1
+    assert broker.stats()["subscribers"] == 0
+
+
+def test_subscriber_limit():
+    broker = EventBroker(queue_size=1, max_subscribers=1)
+
+    async def scenario():
+        async with broker.subscribe():
+            assert broker.is_full()
+            with pytest.raises(SubscriberLimitReached):
+                async with broker.subscribe():
+                    pass
+
+    asyncio.run(scenario())
+
+
+def test_close_all_ends_every_subscription():
+    broker = EventBroker(queue_size=5, max_subscribers=10)
+
+    async def scenario():
+        async with broker.subscribe() as first, broker.subscribe() as second:
+            broker.dispatch([{"type": "deleted", "id": 1}])
+            broker.close_all("shutdown")
+            assert await first.get() is None and await second.get() is None
+            assert first.closed_reason == second.closed_reason == "shutdown"
+
+    asyncio.run(scenario())
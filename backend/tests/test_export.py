@@ -0,0 +1,39 @@
+import csv
+import io
+import json
+
+from tests.conftest import API
+
+
+def test_export_ndjson(client, admin_headers, create_news):
+    kept, deleted = create_news("导出保留"), create_news("导出删除")
+    client.delete(f"{API}/news/{deleted}", headers=admin_headers)
+
+    response = client.get(f"{API}/admin/news/export", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"].startswith('attachment; filename="news-')
+    records = {record["id"]: record for record in map(json.loads, response.text.splitlines())}
+    assert records[kept]["title"] == "导出保留"
+    assert records[kept]["creator_username"] == "admin"
+    assert deleted not in records
+
+    response = client.get(
+        f"{API}/admin/news/export", params={"include_deleted": True}, headers=admin_headers
+    )
+    records = {record["id"]: record for record in map(json.loads, response.text.splitlines())}
+    assert records[deleted]["deleted_at"] is not None
+
+
+def test_export_csv(client, admin_headers, create_news):
+    id = create_news("导出,CSV", "多行\n描述")
+    response = client.get(f"{API}/admin/news/export", params={"format": "csv"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    row = next(row for row in rows if row["id"] == str(id))
+    assert (row["title"], row["description"], row["deleted_at"]) == ("导出,CSV", "多行\n描述", "")
+
+
+def test_export_requires_admin(client):
+    assert client.get(f"{API}/admin/news/export").status_code in (401, 403)
@@ -0,0 +1,33 @@
+import logging
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import health
+
+
+def test_ready_returns_only_check_status(client):
+    health.readiness_checker._result = None
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert all(check == {"status": "ok"} for check in response.json()["checks"].values())
+
+
+def test_ready_hides_check_errors(client, monkeypatch, tmp_path, caplog):
+    secret_path = tmp_path / "missing-dir" / "secret.db"
+    broken = create_async_engine(f"sqlite+aiosqlite:///{secret_path}")
+    monkeypatch.setattr(health, "engine", broken)
+    monkeypatch.setattr(health.readiness_checker, "_result", None)
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.core.health"):
+            response = client.get("/health/ready")
+        assert response.status_code == 503
+        body = response.json()
+        assert body["status"] == "fail"
+        # 只返回检查名称与状态，错误细节只写入日志
+        assert body["checks"]["database"] == {"status": "fail"}
+        assert body["checks"]["uploads"] == {"status": "ok"}
+        assert "secret" not in response.text
+        assert any(record.exc_info for record in caplog.records)
+    finally:
+        client.portal.call(broken.dispose)
+        health.readiness_checker._result = None
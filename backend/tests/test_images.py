@@ -0,0 +1,68 @@
+import asyncio
+import json
+import os
+import threading
+
+from app.core.config import settings
+from app.core.images import ImageProcessor, image_processor, manifest_path
+from tests.conftest import API
+
+
+def _write_manifest(directory: str, filename: str, width: int = 320) -> None:
+    manifest = {
+        "source": filename, "width": 640, "height": 480,
+        "variants": [{"filename": f"{filename}-{width}.webp", "width": width, "height": 240,
+                      "format": "webp", "size": 1}],
+    }
+    with open(manifest_path(directory, filename), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+
+def test_manifests_are_read_in_one_threadpool_call(tmp_path, monkeypatch):
+    processor = ImageProcessor(max_workers=1, directory=str(tmp_path))
+    _write_manifest(str(tmp_path), "a.png")
+    _write_manifest(str(tmp_path), "b.png")
+    calls = []
+    read = processor._read_manifests
+
+    def record(filenames):
+        calls.append((threading.get_ident(), list(filenames)))
+        return read(filenames)
+
+    monkeypatch.setattr(processor, "_read_manifests", record)
+
+    async def scenario():
+        loop_thread = threading.get_ident()
+        manifests = await processor.manifests(["a.png", "b.png", "missing.png", "a.png"])
+        assert manifests["a.png"]["width"] == 640
+        assert manifests["b.png"] is not None
+        assert manifests["missing.png"] is None
+        # 第二次全部命中缓存（包括短暂缓存的缺失结果），不再读取文件
+        assert (await processor.manifests(["a.png", "missing.png"]))["missing.png"] is None
+        return loop_thread
+
+    loop_thread = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert calls[0][0] != loop_thread
+    assert calls[0][1] == ["a.png", "b.png", "missing.png"]
+
+
+def test_list_returns_image_variants(client, admin_headers):
+    filename = "variants-list.png"
+    _write_manifest(settings.upload_path, filename)
+    image_processor._manifests.pop(filename)
+    try:
+        response = client.post(
+            f"{API}/news/",
+            json={"title": "缩放版本", "description": "列表", "image_url": filename},
+            headers=admin_headers,
+        )
+        assert response.status_code == 201, response.text
+        id = response.json()["id"]
+        assert response.json()["image_variants"]["variants"][0]["width"] == 320
+
+        items = client.get(f"{API}/news/", params={"limit": 50, "with_total": "false"}).json()["items"]
+        item = next(item for item in items if item["id"] == id)
+        assert item["image_variants"]["srcset"].endswith(f"{filename}-320.webp 320w")
+    finally:
+        os.unlink(manifest_path(settings.upload_path, filename))
@@ -0,0 +1,34 @@
+from app.core.config import settings
+from app.core.metrics import metrics_access_allowed
+
+
+def test_metrics_access_rules():
+    allow = "127.0.0.1, 10.0.0.0/8, ::1, not-an-ip"
+    assert metrics_access_allowed("127.0.0.1", None, allow, None)
+    assert metrics_access_allowed("10.1.2.3", None, allow, None)
+    assert metrics_access_allowed("::1", None, allow, None)
+    assert not metrics_access_allowed("192.168.1.5", None, allow, None)
+    assert not metrics_access_allowed(None, None, allow, None)
+    assert metrics_access_allowed("192.168.1.5", None, "*", None)
+    # 令牌与地址任一满足即可
+    assert metrics_access_allowed("192.168.1.5", "Bearer s3cret", allow, "s3cret")
+    assert not metrics_access_allowed("192.168.1.5", "Bearer wrong", allow, "s3cret")
+    assert not metrics_access_allowed("192.168.1.5", "Basic s3cret", allow, "s3cret")
+    # 未配置令牌时任何 Authorization 都不生效
+    assert not metrics_access_allowed("192.168.1.5", "Bearer ", allow, None)
+
+
+def test_metrics_endpoint_requires_allowed_client(client, monkeypatch):
+    # TestClient 的客户端地址为 testclient，不在默认的回环地址列表中
+    response = client.get("/metrics")
+    assert response.status_code == 403
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 403
+    response = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert "http_requests_total" in response.text
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    monkeypatch.setattr(settings, "METRICS_ALLOW_IPS", "*")
+    assert client.get("/metrics").status_code == 200
@@ -0,0 +1,48 @@
+import os
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect, text
+
+from app.db.base import Base
+from app.db.init_db import ALEMBIC_INI, _run_migrations
+
+
+def _head() -> str:
+    return ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_current_head()
+
+
+def test_fresh_database_matches_models(tmp_path):
+    engine = create_engine(f"sqlite:///{os.path.join(tmp_path, 'fresh.db')}")
+    with engine.connect() as conn:
+        _run_migrations(conn)
+        assert conn.execute(text("SELECT version_num FROM alembic_version")).scalar() == _head()
+        # 迁移建出的结构与模型定义一致
+        assert compare_metadata(MigrationContext.configure(conn), Base.metadata) == []
+        # 再次执行不做任何修改
+        _run_migrations(conn)
+    engine.dispose()
+
+
+def test_original_create_all_schema_upgrades_to_head(tmp_path):
+    """最初版本 create_all 建好的数据库（只有 users、news）被标记为基线并升级"""
+    engine = create_engine(f"sqlite:///{os.path.join(tmp_path, 'legacy.db')}")
+    with engine.connect() as conn:
+        cfg = Config(ALEMBIC_INI)
+        cfg.attributes["connection"] = conn
+        command.upgrade(cfg, "0001")
+        assert set(inspect(conn).get_table_names()) == {"alembic_version", "users", "news"}
+        conn.execute(text("DROP TABLE alembic_version"))
+        conn.commit()
+
+        _run_migrations(conn)
+
+        inspector = inspect(conn)
+        assert "image_assets" in inspector.get_table_names()
+        indexes = {index["name"] for index in inspector.get_indexes("news")}
+        assert {"ix_news_created_at_id", "ix_news_updated_at_id", "ix_news_live_created_at_id"} <= indexes
+        assert conn.execute(text("SELECT version_num FROM alembic_version")).scalar() == _head()
+    engine.dispose()
@@ -0,0 +1,108 @@
+import asyncio
+
+from app.api.news_cache import NewsResponseCache
+from app.core.cache import MemoryCacheBackend
+from tests.conftest import API
+
+
+def test_list_key_distinguishes_none_from_string():
+    cache = NewsResponseCache(MemoryCacheBackend(maxsize=10), ttl=60)
+
+    async def keys():
+        return (
+            await cache.list_key(q=None, cursor=None),
+            await cache.list_key(q="None", cursor=None),
+            await cache.list_key(q=None, cursor="None"),
+        )
+
+    assert len(set(asyncio.run(keys()))) == 3
+
+
+def test_list_key_changes_with_generation():
+    cache = NewsResponseCache(MemoryCacheBackend(maxsize=10), ttl=60)
+
+    async def keys():
+        before = await cache.list_key(q="x")
+        await cache.invalidate(shift=True)
+        return before, await cache.list_key(q="x")
+
+    before, after = asyncio.run(keys())
+    assert before != after
+
+
+def test_edit_refreshes_cached_item_and_lists(client, admin_headers, create_news):
+    id = create_news("缓存原标题")
+    assert client.get(f"{API}/news/{id}").json()["title"] == "缓存原标题"
+    assert id in [item["id"] for item in client.get(f"{API}/news/", params={"limit": 100}).json()["items"]]
+
+    response = client.put(f"{API}/news/{id}", json={"title": "缓存新标题"}, headers=admin_headers)
+    assert response.status_code == 200
+
+    assert client.get(f"{API}/news/{id}").json()["title"] == "缓存新标题"
+    items = client.get(f"{API}/news/", params={"limit": 100}).json()["items"]
+    assert next(item for item in items if item["id"] == id)["title"] == "缓存新标题"
+
+
+def test_title_edit_invalidates_search_results(client, admin_headers, create_news):
+    id = create_news("缓存检索原标题")
+    assert client.get(f"{API}/news/", params={"q": "cachezq"}).json()["total"] == 0
+
+    client.put(f"{API}/news/{id}", json={"title": "cachezq 新标题"}, headers=admin_headers)
+    # 此前缓存的检索结果不包含该新闻，标题修改后同样需要失效
+    assert client.get(f"{API}/news/", params={"q": "cachezq"}).json()["total"] == 1
+
+
+def test_delete_invalidates_cached_list(client, admin_headers, create_news):
+    id = create_news("缓存删除")
+    assert id in [item["id"] for item in client.get(f"{API}/news/", params={"limit": 100}).json()["items"]]
+    assert client.delete(f"{API}/news/{id}", headers=admin_headers).status_code == 204
+    assert id not in [item["id"] for item in client.get(f"{API}/news/", params={"limit": 100}).json()["items"]]
+    assert client.get(f"{API}/news/{id}").status_code == 404
+
+
+def test_read_overlapping_a_write_is_not_cached():
+    cache = NewsResponseCache(MemoryCacheBackend(maxsize=10), ttl=60)
+
+    async def scenario():
+        version = await cache.version()
+        # 读取数据库期间，另一个请求修改了这条新闻并完成了失效
+        await cache.invalidate(1)
+        key = await cache.list_key(q=None)
+        await cache.set_list(key, b"stale", {}, [1], version=version)
+        await cache.set_item(1, b"stale", {}, version=version)
+        assert await cache.get(key) is None
+        assert await cache.get(cache.item_key(1)) is None
+
+        version = await cache.version()
+        await cache.set_item(1, b"fresh", {}, version=version)
+        assert await cache.get(cache.item_key(1)) == (b"fresh", {})
+
+    asyncio.run(scenario())
+
+
+def test_invalidation_racing_the_cache_write_removes_it():
+    class RacingBackend(MemoryCacheBackend):
+        async def set(self, key, value, ttl):
+            # 版本检查通过之后、写入之前，另一个请求的失效已经执行完毕
+            await cache.invalidate(1)
+            await super().set(key, value, ttl)
+
+    cache = NewsResponseCache(RacingBackend(maxsize=10), ttl=60)
+
+    async def scenario():
+        await cache.set_item(1, b"stale", {}, version=await cache.version())
+        return await cache.get(cache.item_key(1))
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_cache_disabled_is_a_no_op():
+    cache = NewsResponseCache(None, ttl=60)
+
+    async def run():
+        assert await cache.list_key(q="x") is None
+        await cache.set_item(1, b"{}", {}, version=None)
+        await cache.invalidate(1, shift=True)
+        return await cache.get(cache.item_key(1))
+
+    assert asyncio.run(run()) is None
@@ -0,0 +1,78 @@
+import asyncio
+import gzip
+from typing import AsyncIterator, List
+
+from app.api.news_io import gunzip_chunks, parse_csv, parse_ndjson
+from tests.conftest import API
+
+
+async def _chunks(data: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def _parse(parser, data: bytes, size: int = 7) -> List:
+    async def collect():
+        return [record async for batch in parser(_chunks(data, size)) for record in batch]
+    return asyncio.run(collect())
+
+
+def test_csv_quoted_newlines_and_bom():
+    data = (
+        "\ufefftitle,description\r\n"
+        '第一条,"跨行\r\n的描述"\r\n'
+        '"带,逗号",普通描述\r\n'
+        '"引号""内""",\r\n'
+    ).encode("utf-8")
+    # 分块大小不同时结果一致，BOM 与换行可能落在分块边界上
+    for size in (1, 2, 7, len(data)):
+        assert _parse(parse_csv, data, size) == [
+            # 引号内的换行原样保留
+            (2, {"title": "第一条", "description": "跨行\r\n的描述"}),
+            (4, {"title": "带,逗号", "description": "普通描述"}),
+            (5, {"title": '引号"内"'}),
+        ]
+
+
+def test_csv_reports_bad_rows():
+    data = "title,description\na,b,c\n\"未闭合,x\n".encode("utf-8")
+    records = _parse(parse_csv, data)
+    assert records[0][0] == 2 and isinstance(records[0][1], str)
+    assert records[-1] == (3, "CSV 引号未闭合")
+
+
+def test_ndjson_line_numbers_and_errors():
+    data = b'{"title": "a"}\n\nnot json\n[1]\n{"title": "b"}'
+    records = _parse(parse_ndjson, data, size=5)
+    assert [line for line, _ in records] == [1, 3, 4, 5]
+    assert records[0][1] == {"title": "a"}
+    assert isinstance(records[1][1], str) and isinstance(records[2][1], str)
+    assert records[3][1] == {"title": "b"}
+
+
+def test_gunzip_chunks():
+    data = "".join(f'{{"title": "{i}"}}\n' for i in range(500)).encode("utf-8")
+
+    async def collect():
+        return b"".join([chunk async for chunk in gunzip_chunks(_chunks(gzip.compress(data), 64))])
+
+    assert asyncio.run(collect()) == data
+
+
+def test_import_endpoint_reports_rejected_rows(client, admin_headers):
+    body = "\n".join([
+        '{"title": "导入 1", "description": "d"}',
+        '{"title": "缺少描述"}',
+        "not json",
+        '{"title": "导入 2", "description": "d"}',
+    ]).encode("utf-8")
+    response = client.post(
+        f"{API}/admin/news/import", params={"chunk_size": 1}, content=gzip.compress(body),
+        headers={**admin_headers, "Content-Encoding": "gzip"}
+    )
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert (report["received"], report["imported"], report["rejected"]) == (4, 2, 2)
+    assert [error["line"] for error in report["errors"]] == [2, 3]
+    titles = [item["title"] for item in client.get(f"{API}/news/", params={"limit": 100}).json()["items"]]
+    assert {"导入 1", "导入 2"} <= set(titles)
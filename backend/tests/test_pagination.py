@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.pagination import decode_cursor, encode_cursor
+from tests.conftest import API
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, 45, 123456, tzinfo=timezone.utc)
+    cursor = encode_cursor(created_at, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["zzz", "", "bm90IGpzb24", encode_cursor(datetime(2024, 1, 1), 1)[:-3]])
+def test_invalid_cursor_rejected(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
+
+
+def test_cursor_walk_visits_every_item_once(client, create_news):
+    created = {create_news(f"游标 {i}") for i in range(7)}
+    seen = []
+    response = client.get(f"{API}/news/", params={"limit": 3})
+    while True:
+        data = response.json()
+        seen.extend(item["id"] for item in data["items"])
+        if not data["next_cursor"]:
+            break
+        response = client.get(f"{API}/news/", params={"limit": 3, "cursor": data["next_cursor"]})
+    assert len(seen) == len(set(seen))
+    assert created <= set(seen)
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.security import PasswordHasherBusy, PasswordWorkerPool, password_pool
+from tests.conftest import API
+
+
+def test_pool_rejects_when_pending_limit_reached():
+    pool = PasswordWorkerPool(max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0)
+        with pytest.raises(PasswordHasherBusy):
+            await pool.run(str, "second")
+        release.set()
+        assert await first is True
+        # 排队释放后可以继续提交
+        assert await pool.run(str, 1) == "1"
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        pool.shutdown()
+    stats = pool.stats()
+    assert (stats["rejected"], stats["completed"], stats["pending"]) == (1, 2, 0)
+
+
+def test_cancelled_caller_keeps_slot_until_job_finishes():
+    pool = PasswordWorkerPool(max_workers=1, max_pending=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def job():
+        started.set()
+        release.wait()
+
+    async def scenario():
+        first = asyncio.ensure_future(pool.run(job))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        # 计算仍在进行，名额没有释放
+        assert pool.pending == 1
+        with pytest.raises(PasswordHasherBusy):
+            await pool.run(str, "second")
+        release.set()
+        for _ in range(100):
+            if pool.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert await pool.run(str, 1) == "1"
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        pool.shutdown()
+    assert pool.stats()["pending"] == 0
+
+
+def test_login_returns_503_when_pool_busy(client, monkeypatch):
+    monkeypatch.setattr(password_pool, "max_pending", 0)
+    response = client.post(f"{API}/auth/token", data={"username": "admin", "password": "admin123"})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
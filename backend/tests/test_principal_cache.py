@@ -0,0 +1,48 @@
+from sqlalchemy import select
+
+from app.api.deps import principal_cache
+from app.db.session import AsyncSessionLocal
+from app.models.user import User
+from tests.conftest import API
+
+
+def _login(client, username: str) -> dict:
+    client.post(f"{API}/auth/register", json={
+        "username": username, "email": f"{username}@example.com", "password": "secret123"
+    })
+    response = client.post(f"{API}/auth/token", data={"username": username, "password": "secret123"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _modify_user(client, username: str, *, is_admin: bool = None, delete: bool = False) -> None:
+    async def modify():
+        async with AsyncSessionLocal() as db:
+            user = (await db.execute(select(User).where(User.username == username))).scalar_one()
+            if delete:
+                await db.delete(user)
+            else:
+                user.is_admin = is_admin
+            await db.commit()
+    # 在应用的事件循环中执行，复用同一个连接池
+    client.portal.call(modify)
+
+
+def test_user_update_invalidates_cached_principal(client):
+    headers = _login(client, "principal_update")
+    assert client.get(f"{API}/admin/users", headers=headers).status_code == 403
+    assert len(principal_cache) > 0
+
+    _modify_user(client, "principal_update", is_admin=True)
+    assert client.get(f"{API}/admin/users", headers=headers).status_code == 200
+
+    _modify_user(client, "principal_update", is_admin=False)
+    assert client.get(f"{API}/admin/users", headers=headers).status_code == 403
+
+
+def test_user_delete_invalidates_cached_principal(client):
+    headers = _login(client, "principal_delete")
+    assert client.get(f"{API}/admin/users", headers=headers).status_code == 403
+
+    _modify_user(client, "principal_delete", delete=True)
+    response = client.get(f"{API}/admin/users", headers=headers)
+    assert response.status_code == 404
@@ -0,0 +1,60 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse
+
+from app.api.news_cache import NewsResponseCache
+from app.core.cache import MemoryCacheBackend
+from app.core.config import settings
+from app.db import session as db_session
+from app.db.session import ReplicaStickyMiddleware, _record_primary_commit, replica_router
+
+
+async def _endpoint(scope, receive, send):
+    if scope["path"] == "/write":
+        # 相当于本请求在主库提交了一个事务
+        _record_primary_commit(None)
+    await JSONResponse({"replica": replica_router.use_replica()})(scope, receive, send)
+
+
+def test_primary_window_follows_the_writing_client(monkeypatch):
+    monkeypatch.setattr(db_session, "read_engine", object())
+    monkeypatch.setattr(settings, "DB_REPLICA_STICKY_SCOPE", "client")
+    app = ReplicaStickyMiddleware(_endpoint, cookie_name="db_primary_until", sticky_seconds=60)
+    writer, other = TestClient(app), TestClient(app)
+
+    response = writer.get("/read")
+    assert response.json() == {"replica": True}
+    assert "set-cookie" not in response.headers
+
+    response = writer.get("/write")
+    assert "db_primary_until=" in response.headers["set-cookie"]
+    # 写入之后，同一客户端（携带 Cookie）读主库，其他客户端仍读副本
+    assert writer.get("/read").json() == {"replica": False}
+    assert other.get("/read").json() == {"replica": True}
+
+
+def test_expired_or_invalid_cookie_reads_replica(monkeypatch):
+    monkeypatch.setattr(db_session, "read_engine", object())
+    monkeypatch.setattr(settings, "DB_REPLICA_STICKY_SCOPE", "client")
+    app = ReplicaStickyMiddleware(_endpoint, cookie_name="db_primary_until", sticky_seconds=60)
+    client = TestClient(app)
+    for value in ("1.0", "not-a-number"):
+        response = client.get("/read", headers={"Cookie": f"db_primary_until={value}"})
+        assert response.json() == {"replica": True}
+
+
+def test_replica_reads_not_cached_right_after_invalidation(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_READ_URL", "sqlite+aiosqlite:///replica.db")
+    monkeypatch.setattr(settings, "DB_REPLICA_STICKY_SECONDS", 60)
+    cache = NewsResponseCache(MemoryCacheBackend(maxsize=10), ttl=60)
+
+    async def scenario():
+        await cache.invalidate(1)
+        # 副本可能还未复制这次修改，读出的旧数据不写入缓存
+        await cache.set_item(1, b"stale", {}, version=await cache.version(), from_replica=True)
+        assert await cache.get(cache.item_key(1)) is None
+        await cache.set_item(1, b"fresh", {}, version=await cache.version())
+        assert await cache.get(cache.item_key(1)) == (b"fresh", {})
+
+    asyncio.run(scenario())
@@ -0,0 +1,27 @@
+import serve
+from app.core.config import settings
+
+
+def test_local_event_bus_limits_workers(monkeypatch):
+    # 测试使用 SQLite，自动选择进程内总线
+    monkeypatch.setattr(settings, "EVENTS_ENABLED", True)
+    monkeypatch.setattr(settings, "EVENTS_BUS", "auto")
+    monkeypatch.setattr(serve, "available_cpus", lambda: 8)
+    assert serve.resolve_workers(None) == 1
+    assert serve.resolve_workers(1) == 1
+    assert serve.resolve_workers(4) is None
+
+    monkeypatch.setattr(settings, "EVENTS_ENABLED", False)
+    assert serve.resolve_workers(None) == 8
+    assert serve.resolve_workers(4) == 4
+
+
+def test_postgres_event_bus_allows_workers(monkeypatch):
+    monkeypatch.setattr(settings, "EVENTS_ENABLED", True)
+    monkeypatch.setattr(settings, "EVENTS_BUS", "auto")
+    monkeypatch.setattr(settings, "DATABASE_URL", "postgresql+asyncpg://u:p@db/feednews")
+    monkeypatch.setattr(serve, "available_cpus", lambda: 8)
+    assert serve.resolve_workers(None) == 8
+    assert serve.resolve_workers(4) == 4
+    monkeypatch.setattr(settings, "EVENTS_BUS", "local")
+    assert serve.resolve_workers(4) is None
@@ -0,0 +1,113 @@
+import hashlib
+import os
+import stat
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from app.core.config import settings
+from app.core.static import UploadsStaticFiles, parse_range
+from tests.conftest import API
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture(scope="module")
+def hashed_file():
+    name = f"{hashlib.sha256(CONTENT).hexdigest()}.png"
+    with open(os.path.join(settings.upload_path, name), "wb") as f:
+        f.write(CONTENT)
+    return name
+
+
+def test_hashed_upload_is_immutable(client, hashed_file):
+    response = client.get(f"/uploads/{hashed_file}")
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["cache-control"] == f"public, max-age={settings.UPLOADS_CACHE_MAX_AGE}, immutable"
+    assert response.headers["etag"] == f'"{hashed_file[:-4]}"'
+    assert response.headers["accept-ranges"] == "bytes"
+
+    response = client.get(f"/uploads/{hashed_file}", headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+
+
+def test_other_files_revalidate(client):
+    with open(os.path.join(settings.upload_path, "legacy.png"), "wb") as f:
+        f.write(CONTENT)
+    assert client.get("/uploads/legacy.png").headers["cache-control"] == "public, no-cache"
+
+
+def test_range_requests(client, hashed_file):
+    response = client.get(f"/uploads/{hashed_file}", headers={"Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.content == CONTENT[10:20]
+    assert response.headers["content-range"] == f"bytes 10-19/{len(CONTENT)}"
+
+    response = client.get(f"/uploads/{hashed_file}", headers={"Range": "bytes=-5"})
+    assert response.status_code == 206 and response.content == CONTENT[-5:]
+
+    response = client.get(f"/uploads/{hashed_file}", headers={"Range": f"bytes={len(CONTENT)}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+    # If-Range 不匹配时返回完整内容
+    response = client.get(f"/uploads/{hashed_file}", headers={"Range": "bytes=0-1", "If-Range": '"stale"'})
+    assert response.status_code == 200 and response.content == CONTENT
+
+
+def test_parse_range():
+    assert parse_range("bytes=0-", 10) == (0, 9)
+    assert parse_range("bytes=5-100", 10) == (5, 9)
+    assert parse_range("bytes=0-1,3-4", 10) is None
+    assert parse_range("items=0-1", 10) is None
+    with pytest.raises(ValueError):
+        parse_range("bytes=10-", 10)
+
+
+def test_hidden_staging_files_not_served(client):
+    path = os.path.join(settings.upload_path, ".hidden.part")
+    with open(path, "wb") as f:
+        f.write(b"partial")
+    try:
+        assert client.get("/uploads/.hidden.part").status_code == 404
+    finally:
+        os.unlink(path)
+
+
+def test_x_accel_offload(hashed_file):
+    app = Starlette(routes=[Mount("/uploads", UploadsStaticFiles(
+        directory=settings.upload_path, mode="x-accel", accel_prefix="/_uploads/"
+    ))])
+    client = TestClient(app)
+    response = client.get(f"/uploads/{hashed_file}", headers={"X-Sendfile-Type": "X-Accel-Redirect"})
+    assert response.status_code == 200
+    assert response.headers["x-accel-redirect"] == f"/_uploads/{hashed_file}"
+    assert response.content == b""
+    # 未经过 nginx 的请求仍由应用发送文件
+    assert client.get(f"/uploads/{hashed_file}").content == CONTENT
+
+
+def test_uploaded_original_readable_through_x_accel(client, admin_headers):
+    # 与 docker-compose 相同：nginx 以其他用户身份从只读挂载的上传卷读取 X-Accel-Redirect 指向的文件
+    content = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64 + b"x-accel"
+    response = client.post(
+        f"{API}/news/upload", files={"image": ("a.png", content, "image/png")}, headers=admin_headers
+    )
+    assert response.status_code == 201, response.text
+    filename = response.json()["filename"]
+
+    app = Starlette(routes=[Mount("/uploads", UploadsStaticFiles(
+        directory=settings.upload_path, mode="x-accel", accel_prefix="/_uploads/"
+    ))])
+    response = TestClient(app).get(f"/uploads/{filename}", headers={"X-Sendfile-Type": "X-Accel-Redirect"})
+    assert response.status_code == 200
+    redirect = response.headers["x-accel-redirect"]
+    assert redirect.startswith("/_uploads/")
+    # nginx 中 /_uploads/ 是上传目录的 alias
+    path = os.path.join(settings.upload_path, redirect[len("/_uploads/"):])
+    assert os.stat(path).st_mode & stat.S_IROTH
+    with open(path, "rb") as f:
+        assert f.read() == content
@@ -0,0 +1,76 @@
+import hashlib
+import os
+import stat
+
+from app.core.config import settings
+from tests.conftest import API
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 256
+
+
+def _upload(client, headers, content: bytes, filename: str = "image.png"):
+    return client.post(
+        f"{API}/news/upload", files={"image": (filename, content, "image/png")}, headers=headers
+    )
+
+
+def _staged_files():
+    return [name for name in os.listdir(settings.upload_path) if name.startswith(".upload-")]
+
+
+def test_upload_is_stored_in_upload_dir(client, admin_headers):
+    response = _upload(client, admin_headers, PNG + b"stored")
+    assert response.status_code == 201, response.text
+    path = os.path.join(settings.upload_path, response.json()["filename"])
+    with open(path, "rb") as f:
+        assert f.read() == PNG + b"stored"
+    assert _staged_files() == []
+
+
+def test_uploaded_file_uses_umask_mode(client, admin_headers):
+    umask = os.umask(0)
+    os.umask(umask)
+    response = _upload(client, admin_headers, PNG + b"mode")
+    path = os.path.join(settings.upload_path, response.json()["filename"])
+    # 与普通 open() 创建的文件相同，而不是 mkstemp 的 0600
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~umask
+
+
+def test_oversized_request_rejected_before_parsing(client, admin_headers):
+    response = _upload(client, admin_headers, b"\x00" * (settings.UPLOAD_MAX_SIZE + 64 * 1024))
+    assert response.status_code == 413
+    assert _staged_files() == []
+
+
+def test_oversized_file_within_request_limit_rejected(client, admin_headers):
+    # 请求体未超过中间件的上限（含 multipart 开销），由分块读取时的大小检查拒绝
+    response = _upload(client, admin_headers, b"\x00" * (settings.UPLOAD_MAX_SIZE + 1))
+    assert response.status_code == 400
+    assert _staged_files() == []
+
+
+def test_upload_rejects_non_images(client, admin_headers):
+    response = client.post(
+        f"{API}/news/upload", files={"image": ("a.txt", b"text", "text/plain")}, headers=admin_headers
+    )
+    assert response.status_code == 400
+
+
+def test_identical_content_is_stored_once(client, admin_headers):
+    content = PNG + b"dedupe"
+    first = _upload(client, admin_headers, content, "first.png").json()
+    second = _upload(client, admin_headers, content, "second.png").json()
+    assert first["sha256"] == hashlib.sha256(content).hexdigest()
+    assert first["filename"] == second["filename"] == f"{first['sha256']}.png"
+    assert [name for name in os.listdir(settings.upload_path) if name.startswith(first["sha256"])] == [
+        first["filename"]
+    ]
+    assert _staged_files() == []
+
+
+def test_missing_indexed_file_is_written_again(client, admin_headers):
+    content = PNG + b"missing"
+    filename = _upload(client, admin_headers, content).json()["filename"]
+    os.unlink(os.path.join(settings.upload_path, filename))
+    assert _upload(client, admin_headers, content).json()["filename"] == filename
+    assert os.path.isfile(os.path.join(settings.upload_path, filename))